@@ -0,0 +1,144 @@
+import threading
+
+from config import ADMISSION_MAX_FRAMES, ADMISSION_MAX_WAIT_S
+
+
+class _Ticket:
+    def __init__(self, student_id):
+        self.student_id = student_id
+        self.turn = threading.Event()
+        self.state = "waiting"     # waiting | running | superseded | expired | done
+
+
+class _Slot:
+    def __init__(self):
+        self.running = None        # ticket being analysed
+        self.pending = None        # newest frame waiting behind it
+
+
+class AdmissionControl:
+    """
+    Bounded admission in front of the frame pipeline.
+
+    - latest frame wins: a student has at most one frame running and one
+      waiting; a newer upload replaces the waiting one, which is answered
+      right away as superseded instead of being analysed late.
+    - load shedding: when `max_frames` frames (running + waiting, all
+      students) are outstanding, a new one is refused immediately so the
+      client retries later instead of queueing without bound.
+    """
+
+    def __init__(self, max_frames=ADMISSION_MAX_FRAMES, max_wait=ADMISSION_MAX_WAIT_S):
+        self.max_frames = int(max_frames)
+        self.max_wait = max_wait
+
+        self._lock = threading.Lock()
+        self._slots = {}           # student_id -> _Slot
+        self.outstanding = 0
+
+        self.admitted = 0
+        self.shed = 0
+        self.superseded = 0
+        self.expired = 0
+
+    # ================= REQUEST SIDE =================
+    def enter(self, student_id):
+        """
+        Returns:
+            ticket to pass to wait() / leave(), or None when the node is
+            full (answer "busy, retry later")
+        """
+
+        with self._lock:
+            slot = self._slots.get(student_id)
+
+            if slot is not None and slot.pending is not None:
+                # Replace the queued frame: no extra load, always admitted
+                old = slot.pending
+                old.state = "superseded"
+                old.turn.set()
+                self.superseded += 1
+
+                ticket = slot.pending = _Ticket(student_id)
+                self.admitted += 1
+                return ticket
+
+            if 0 < self.max_frames <= self.outstanding:
+                self.shed += 1
+                return None
+
+            if slot is None:
+                slot = self._slots[student_id] = _Slot()
+
+            ticket = _Ticket(student_id)
+            self.outstanding += 1
+            self.admitted += 1
+
+            if slot.running is None:
+                self._grant(slot, ticket)
+            else:
+                slot.pending = ticket
+            return ticket
+
+    def wait(self, ticket):
+        """
+        Block until it is this frame's turn.
+
+        Returns:
+            True to analyse the frame; False if a newer frame replaced it or
+            it waited longer than max_wait (stale)
+        """
+
+        ticket.turn.wait(self.max_wait)
+
+        with self._lock:
+            if ticket.state == "running":
+                return True
+            if ticket.state == "waiting":
+                slot = self._slots[ticket.student_id]
+                slot.pending = None
+                ticket.state = "expired"
+                self.outstanding -= 1
+                self.expired += 1
+            return False
+
+    def leave(self, ticket):
+        """
+        Frame finished (or gave up): hand the student's slot to the waiting
+        frame, if any.
+        """
+
+        with self._lock:
+            if ticket.state != "running":
+                return
+
+            ticket.state = "done"
+            self.outstanding -= 1
+
+            slot = self._slots[ticket.student_id]
+            slot.running = None
+            if slot.pending is not None:
+                following, slot.pending = slot.pending, None
+                self._grant(slot, following)
+            else:
+                del self._slots[ticket.student_id]
+
+    def _grant(self, slot, ticket):
+        slot.running = ticket
+        ticket.state = "running"
+        ticket.turn.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_frames": self.max_frames,
+                "outstanding": self.outstanding,
+                "waiting": sum(1 for s in self._slots.values() if s.pending is not None),
+                "admitted": self.admitted,
+                "shed": self.shed,
+                "superseded": self.superseded,
+                "expired": self.expired,
+            }
+
+
+admission = AdmissionControl()
@@ -0,0 +1,165 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class BatchScheduler:
+    """
+    Collects items submitted from many threads and runs them through
+    `run_batch(items) -> results` in groups.
+
+    A batch is dispatched when it reaches `max_batch_size` items or when the
+    oldest item has waited `max_wait_ms`, whichever comes first.
+    """
+
+    def __init__(self, run_batch, max_batch_size=8, max_wait_ms=15.0,
+                 name="batch", window=1024):
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue = queue.Queue()
+
+        # ===== STATS (rolling window) =====
+        self._lock = threading.Lock()
+        self._batch_sizes = deque(maxlen=window)
+        self._wait_ms = deque(maxlen=window)
+        self._infer_ms = deque(maxlen=window)
+        self._done_times = deque(maxlen=window)
+        self._total_batches = 0
+        self._total_items = 0
+        self._errors = 0
+        self._timeouts = 0
+
+        self._thread = threading.Thread(
+            target=self._loop, name=f"{name}-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    # ================= PUBLIC API =================
+    def submit(self, item):
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def run(self, item, timeout=None):
+        """
+        Raises:
+            concurrent.futures.TimeoutError after `timeout` seconds; the item
+            is dropped if its batch has not started yet
+        """
+
+        future = self.submit(item)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            future.cancel()
+            with self._lock:
+                self._timeouts += 1
+            raise
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        with self._lock:
+            sizes = list(self._batch_sizes)
+            waits = list(self._wait_ms)
+            infers = list(self._infer_ms)
+            done = list(self._done_times)
+            total_batches = self._total_batches
+            total_items = self._total_items
+            errors = self._errors
+            timeouts = self._timeouts
+
+        throughput = 0.0
+        if len(done) >= 2 and done[-1] > done[0]:
+            throughput = (len(done) - 1) / (done[-1] - done[0])
+
+        return {
+            "name": self.name,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queue_depth": self.queue_depth(),
+            "total_batches": total_batches,
+            "total_items": total_items,
+            "errors": errors,
+            "timeouts": timeouts,
+            "avg_batch_size": (sum(sizes) / len(sizes)) if sizes else 0.0,
+            "queue_wait_ms": {
+                "p50": _percentile(waits, 50),
+                "p95": _percentile(waits, 95),
+            },
+            "inference_ms": {
+                "p50": _percentile(infers, 50),
+                "p95": _percentile(infers, 95),
+            },
+            "throughput_items_per_s": throughput,
+        }
+
+    # ================= WORKER =================
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = batch[0][2] + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    # Window closed: still take whatever is already queued
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _loop(self):
+        while True:
+            # Callers that timed out cancelled their future: skip those items
+            batch = [b for b in self._collect() if b[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            items = [b[0] for b in batch]
+            futures = [b[1] for b in batch]
+
+            start = time.perf_counter()
+            try:
+                results = list(self.run_batch(items))
+                if len(results) != len(items):
+                    # zip() would leave the extra futures unresolved forever
+                    raise RuntimeError(
+                        f"{self.name}: run_batch returned {len(results)} results "
+                        f"for {len(items)} items"
+                    )
+            except Exception as e:
+                with self._lock:
+                    self._errors += 1
+                for f in futures:
+                    f.set_exception(e)
+                continue
+            end = time.perf_counter()
+
+            for f, r in zip(futures, results):
+                f.set_result(r)
+
+            with self._lock:
+                self._total_batches += 1
+                self._total_items += len(batch)
+                self._batch_sizes.append(len(batch))
+                self._infer_ms.append((end - start) * 1000)
+                for b in batch:
+                    self._wait_ms.append((start - b[2]) * 1000)
+                    self._done_times.append(end)
@@ -0,0 +1,89 @@
+import threading
+
+from config import PHONE_CASCADE_MODE, PHONE_CASCADE_BUDGET, PHONE_ROI_SIZE
+
+
+class CascadePolicy:
+    """
+    Decides whether the (expensive) phone detector runs on a frame, based
+    on the cheaper face / hand signals computed before it.
+    """
+
+    def __init__(self, mode=PHONE_CASCADE_MODE, budget=PHONE_CASCADE_BUDGET,
+                 roi_size=PHONE_ROI_SIZE):
+        self.mode = mode
+        self.budget = max(1, int(budget))
+        self.roi_size = int(roi_size)
+
+    def trigger(self, session, hand_detected, head_dir):
+        """
+        Returns:
+            reason string (hand | head | tracking | budget | always),
+            or None when YOLO can be skipped for this frame
+        """
+
+        if self.mode != "cascade":
+            return "always"
+
+        # A phone streak in progress must see consecutive frames to confirm
+        if session.phone_tracker.detect_count > 0:
+            return "tracking"
+        if hand_detected:
+            return "hand"
+        if head_dir in ["down", "left", "right"]:
+            return "head"
+        if session.frames_since_phone + 1 >= self.budget:
+            return "budget"
+
+        return None
+
+    def region(self, frame, reason, hand_pos):
+        """
+        frame: PreparedFrame or ndarray; the box is in pixels of the frame
+        as received (its .shape), like hand_pos
+
+        Returns:
+            (x1, y1, x2, y2) search box around the hand, or None for full frame
+        """
+
+        if reason != "hand" or self.roi_size <= 0 or hand_pos is None:
+            return None
+
+        h, w = frame.shape[:2]
+        half = self.roi_size // 2
+        cx, cy = hand_pos
+
+        x1 = min(max(cx - half, 0), max(w - self.roi_size, 0))
+        y1 = min(max(cy - half, 0), max(h - self.roi_size, 0))
+        return x1, y1, min(x1 + self.roi_size, w), min(y1 + self.roi_size, h)
+
+
+class CascadeStats:
+    """
+    Process-wide count of YOLO runs per trigger and skipped frames.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = {}
+        self.skipped = 0
+
+    def record(self, reason):
+        with self._lock:
+            if reason is None:
+                self.skipped += 1
+            else:
+                self.runs[reason] = self.runs.get(reason, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            total = self.skipped + sum(self.runs.values())
+            return {
+                "runs": dict(self.runs),
+                "skipped": self.skipped,
+                "skip_rate": self.skipped / total if total else 0.0,
+            }
+
+
+cascade_policy = CascadePolicy()
+cascade_stats = CascadeStats()
@@ -0,0 +1,165 @@
+import cv2
+import numpy as np
+
+PHONE_CLASS_NAME = "cell phone"
+COCO_PHONE_CLASS_ID = 67
+NMS_IOU = 0.45
+
+
+class TorchBackend:
+    """
+    ultralytics YOLO (PyTorch). Class filtering happens inside the model
+    call, so only phone boxes are post-processed.
+    """
+
+    name = "torch"
+
+    def __init__(self, model_path="yolov8n.pt", input_size=640):
+        from ultralytics import YOLO
+
+        self.model = YOLO(model_path)
+        self.input_size = input_size
+        self.phone_ids = [
+            cls for cls, label in self.model.names.items()
+            if label == PHONE_CLASS_NAME
+        ]
+
+    def detect(self, frames, conf_threshold):
+        """
+        Returns:
+            per frame, a list of (conf, (x1, y1, x2, y2)) sorted by conf desc
+        """
+
+        results = self.model(
+            frames,
+            imgsz=self.input_size,
+            classes=self.phone_ids,
+            conf=conf_threshold,
+            verbose=False
+        )
+
+        out = []
+        for r in results:
+            boxes = [
+                (float(box.conf[0]), tuple(map(int, box.xyxy[0])))
+                for box in r.boxes
+            ]
+            boxes.sort(key=lambda b: b[0], reverse=True)
+            out.append(boxes)
+        return out
+
+
+class OnnxBackend:
+    """
+    YOLOv8 exported to ONNX (FP32 or INT8), run with ONNX Runtime.
+
+    Only the phone class score row is decoded; the other 79 classes are
+    never touched.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_path="yolov8n.onnx", input_size=640, threads=0,
+                 providers=("CPUExecutionProvider",),
+                 class_id=COCO_PHONE_CLASS_ID):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+            options.inter_op_num_threads = 1
+
+        available = set(ort.get_available_providers())
+        providers = [p for p in providers if p in available] or ["CPUExecutionProvider"]
+
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=providers
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.input_size = input_size
+        self.class_id = class_id
+
+        # Exported with a fixed batch (1 by default) unless dynamic=True was used
+        batch_dim = self.session.get_inputs()[0].shape[0]
+        self.fixed_batch = batch_dim if isinstance(batch_dim, int) else None
+
+    def _letterbox(self, frame):
+        h, w = frame.shape[:2]
+        size = self.input_size
+        scale = min(size / w, size / h)
+        nw, nh = int(round(w * scale)), int(round(h * scale))
+
+        canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+        top, left = (size - nh) // 2, (size - nw) // 2
+        canvas[top:top + nh, left:left + nw] = cv2.resize(
+            frame, (nw, nh), interpolation=cv2.INTER_LINEAR
+        )
+
+        blob = cv2.dnn.blobFromImage(canvas, 1 / 255.0, swapRB=True)
+        return blob[0], scale, left, top
+
+    def _decode(self, pred, scale, left, top, conf_threshold):
+        # pred: (4 + num_classes, anchors) -> phone row only
+        scores = pred[4 + self.class_id]
+        keep = np.flatnonzero(scores >= conf_threshold)
+        if keep.size == 0:
+            return []
+
+        cx, cy, bw, bh = pred[:4, keep]
+        x1 = (cx - bw / 2 - left) / scale
+        y1 = (cy - bh / 2 - top) / scale
+        bw, bh = bw / scale, bh / scale
+        confs = scores[keep]
+
+        rects = np.stack([x1, y1, bw, bh], axis=1).tolist()
+        picked = cv2.dnn.NMSBoxes(rects, confs.tolist(), conf_threshold, NMS_IOU)
+
+        boxes = []
+        for i in np.array(picked).reshape(-1):
+            x, y, w, h = rects[i]
+            boxes.append((
+                float(confs[i]),
+                (int(x), int(y), int(x + w), int(y + h))
+            ))
+        boxes.sort(key=lambda b: b[0], reverse=True)
+        return boxes
+
+    def detect(self, frames, conf_threshold):
+        """
+        Returns:
+            per frame, a list of (conf, (x1, y1, x2, y2)) sorted by conf desc
+        """
+
+        prepared = [self._letterbox(f) for f in frames]
+        blobs = np.stack([p[0] for p in prepared])
+
+        if self.fixed_batch is None:
+            preds = self.session.run(None, {self.input_name: blobs})[0]
+        else:
+            # Fixed batch: run chunks of exactly that size, padding the last
+            # one with blank inputs whose predictions are dropped
+            n = self.fixed_batch
+            chunks = []
+            for start in range(0, len(blobs), n):
+                chunk = blobs[start:start + n]
+                real = len(chunk)
+                if real < n:
+                    pad = np.zeros((n - real,) + chunk.shape[1:], dtype=chunk.dtype)
+                    chunk = np.concatenate([chunk, pad])
+                chunks.append(self.session.run(None, {self.input_name: chunk})[0][:real])
+            preds = np.concatenate(chunks)
+
+        return [
+            self._decode(pred, scale, left, top, conf_threshold)
+            for pred, (_, scale, left, top) in zip(preds, prepared)
+        ]
+
+
+def create_backend(kind, model_path, input_size=640, threads=0,
+                   providers=("CPUExecutionProvider",)):
+    if kind == "torch":
+        return TorchBackend(model_path, input_size)
+    if kind == "onnx":
+        return OnnxBackend(model_path, input_size, threads, providers)
+    raise ValueError(f"Unknown phone detector backend: {kind}")
@@ -1,52 +1,374 @@
+import atexit
 import cv2
+import numpy as np
 import os
+import queue
+import threading
+import time
 from datetime import datetime
 
+from ai.evidence_store import DedupIndex, dhash, encode_thumbnail
+from ai.frame_buffer import FrameRingBuffer
 from db import db
 from models import Evidence
+from config import (
+    EVIDENCE_QUEUE_SIZE,
+    EVIDENCE_FULL_POLICY,
+    EVIDENCE_BLOCK_TIMEOUT_S,
+    EVIDENCE_BATCH_SIZE,
+    EVIDENCE_FLUSH_INTERVAL_S,
+    EVIDENCE_JPEG_QUALITY,
+    EVIDENCE_DIR,
+)
 
 # ===== BASE PATH (SAFE) =====
-BASE_DIR = os.path.join(os.getcwd(), "evidence")
+BASE_DIR = EVIDENCE_DIR
 IMG_DIR = os.path.join(BASE_DIR, "images")
+CLIP_DIR = os.path.join(BASE_DIR, "clips")
+THUMB_DIR = os.path.join(BASE_DIR, "thumbs")
+ARCHIVE_DIR = os.path.join(BASE_DIR, "archive")
 LOG_DIR = os.path.join(BASE_DIR, "logs")
+LOG_PATH = os.path.join(LOG_DIR, "events.log")
 
 os.makedirs(IMG_DIR, exist_ok=True)
+os.makedirs(CLIP_DIR, exist_ok=True)
+os.makedirs(THUMB_DIR, exist_ok=True)
+os.makedirs(ARCHIVE_DIR, exist_ok=True)
 os.makedirs(LOG_DIR, exist_ok=True)
 
 
-def save_evidence(frame, student_id, score, reason):
+# ================= WRITE HELPERS =================
+def _write_image(frame, image_name):
+    ok, buf = cv2.imencode(
+        ".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, EVIDENCE_JPEG_QUALITY]
+    )
+    if ok:
+        with open(os.path.join(IMG_DIR, image_name), "wb") as f:
+            f.write(buf.tobytes())
+
+
+def write_thumbnail(frame, image_name):
+    thumb = encode_thumbnail(frame)
+    if thumb is not None:
+        with open(os.path.join(THUMB_DIR, image_name), "wb") as f:
+            f.write(thumb)
+
+
+def thumbnail_from_jpeg(jpeg_bytes, image_name):
+    """
+    Thumbnail for an already stored evidence image.
+
+    Returns:
+        True if it was written
+    """
+
+    frame = cv2.imdecode(np.frombuffer(jpeg_bytes, np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        return False
+    write_thumbnail(frame, image_name)
+    return os.path.exists(os.path.join(THUMB_DIR, image_name))
+
+
+# Recent evidence hashes per student (near-duplicate shots share one image)
+dedup_index = DedupIndex()
+
+
+def _store_image(job):
+    """
+    Write the evidence image + its thumbnail, or point the job at an
+    earlier near-identical image of the same student.
+
+    Returns:
+        True if a new image was written, False if one was reused
+    """
+
+    frame = job["frame"]
+    if job.get("jpeg") is not None:
+        # The working frame may be a reduced decode: evidence is stored at
+        # the resolution the client captured
+        full = cv2.imdecode(np.frombuffer(job["jpeg"], np.uint8), cv2.IMREAD_COLOR)
+        if full is not None:
+            frame = full
+    value = dhash(frame)
+    when = job["timestamp"].timestamp()
+
+    reuse = dedup_index.match(job["student_id"], value, when)
+    if reuse is not None:
+        job["image_name"] = reuse
+        return False
+
+    _write_image(frame, job["image_name"])
+    write_thumbnail(frame, job["image_name"])
+    dedup_index.add(job["student_id"], value, job["image_name"], when)
+    return True
+
+
+def _write_clip(frames, clip_name):
+    # Motion JPEG: the client's JPEG frames back to back, no re-encoding
+    with open(os.path.join(CLIP_DIR, clip_name), "wb") as f:
+        f.writelines(frames)
+
+
+def _log_line(job):
+    line = (
+        f"{job['ts_str']} | {job['student_id']} | score={job['score']} "
+        f"| reason={job['reason']} | image={job['image_name']}"
+    )
+    if job.get("clip_name"):
+        line += f" | clip={job['clip_name']}"
+    return line + "\n"
+
+
+def _evidence_row(job):
+    return Evidence(
+        student_id=job["student_id"],
+        image_name=job["image_name"],
+        timestamp=job["timestamp"],
+        exam_id=job["exam_id"],
+        score=job["score"],
+        reason=job["reason"],
+        clip_name=job.get("clip_name")
+    )
+
+
+class EvidenceWriter:
+    """
+    Background evidence pipeline (off the /analyze request path).
+
+    - bounded queue with a drop / backpressure policy when full
+    - JPEG encoding + image / clip writes on the worker thread
+    - log lines buffered and appended in one write per flush
+    - DB rows inserted in batches, one commit per flush
+    - everything pending is flushed on shutdown
+    """
+
+    def __init__(self, max_queue=EVIDENCE_QUEUE_SIZE, policy=EVIDENCE_FULL_POLICY,
+                 batch_size=EVIDENCE_BATCH_SIZE, flush_interval=EVIDENCE_FLUSH_INTERVAL_S):
+        self.policy = policy
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+
+        self.app = None
+        self._queue = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._thread = None
+        self._stop = object()
+
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.commits = 0
+        self.clips_written = 0
+        self.deduplicated = 0
+
+    # ================= LIFECYCLE =================
+    def init_app(self, app):
+        self.app = app
+        if self.running:
+            return
+
+        self._thread = threading.Thread(
+            target=self._loop, name="evidence-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def close(self, timeout=10.0):
+        """
+        Flush everything queued and stop the worker.
+        """
+
+        if not self.running:
+            return
+        self._queue.put(self._stop)
+        self._thread.join(timeout)
+
+    # ================= PRODUCER =================
+    def submit(self, job):
+        """
+        Returns:
+            True if queued, False if dropped by the full-queue policy
+        """
+
+        with self._lock:
+            self.submitted += 1
+
+        try:
+            if self.policy == "block":
+                self._queue.put(job, timeout=EVIDENCE_BLOCK_TIMEOUT_S)
+            else:
+                self._queue.put_nowait(job)
+            return True
+        except queue.Full:
+            pass
+
+        if self.policy == "drop_oldest":
+            try:
+                self._queue.get_nowait()
+                with self._lock:
+                    self.dropped += 1
+                self._queue.put_nowait(job)
+                return True
+            except (queue.Empty, queue.Full):
+                pass
+
+        with self._lock:
+            self.dropped += 1
+        return False
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queue_depth": self.queue_depth(),
+                "policy": self.policy,
+                "submitted": self.submitted,
+                "written": self.written,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "commits": self.commits,
+                "clips_written": self.clips_written,
+                "deduplicated": self.deduplicated,
+            }
+
+    # ================= WORKER =================
+    def _loop(self):
+        log_lines = []
+        rows = []
+        last_flush = time.monotonic()
+
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                job = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                job = None
+
+            stopping = job is self._stop
+
+            if job is not None and not stopping and job.get("kind") == "clip":
+                try:
+                    _write_clip(job["frames"], job["clip_name"])
+                    with self._lock:
+                        self.clips_written += 1
+                except Exception:
+                    with self._lock:
+                        self.errors += 1
+            elif job is not None and not stopping:
+                try:
+                    if job["frame"] is not None and not _store_image(job):
+                        with self._lock:
+                            self.deduplicated += 1
+                    log_lines.append(_log_line(job))
+                    rows.append(job)
+                except Exception:
+                    with self._lock:
+                        self.errors += 1
+
+            due = time.monotonic() - last_flush >= self.flush_interval
+            if rows and (stopping or due or len(rows) >= self.batch_size):
+                self._flush(log_lines, rows)
+                log_lines, rows = [], []
+            if due or stopping:
+                last_flush = time.monotonic()
+
+            if stopping:
+                break
+
+    def _flush(self, log_lines, rows):
+        try:
+            with open(LOG_PATH, "a") as f:
+                f.writelines(log_lines)
+
+            with self.app.app_context():
+                db.session.add_all([_evidence_row(job) for job in rows])
+                db.session.commit()
+
+            with self._lock:
+                self.written += len(rows)
+                self.commits += 1
+        except Exception:
+            with self._lock:
+                self.errors += 1
+
+
+evidence_writer = EvidenceWriter()
+
+
+def save_clip(clip_name, frames):
+    """
+    Write a finished clip (list of JPEG bytes) off the request path.
+    """
+
+    if evidence_writer.running:
+        evidence_writer.submit({"kind": "clip", "clip_name": clip_name, "frames": frames})
+    else:
+        _write_clip(frames, clip_name)
+
+
+# Recent frames per student; a clip around each trigger goes to save_clip
+frame_buffer = FrameRingBuffer(on_clip=save_clip)
+
+
+def save_evidence(frame, student_id, score, reason, exam_id=None, clip=False, jpeg_bytes=None):
     """
     Save cheating evidence:
-    - Image to disk
+    - Image + thumbnail to disk (a near-identical recent shot of the same
+      student is reused instead, see DedupIndex); with jpeg_bytes (the
+      frame as received) the image is decoded from them at full size
     - Log to file
     - Entry to database
+    - clip=True: also a clip of the buffered frames before and the next
+      frames after this one (written once the post-event window is full)
+
+    Queued to the background writer when it is running (returns at once),
+    otherwise written synchronously.
+
+    Returns:
+        the image name requested (the row may end up sharing an older one)
     """
 
     timestamp = datetime.now()
     ts_str = timestamp.strftime("%Y-%m-%d_%H-%M-%S")
 
     image_name = f"{student_id}_{ts_str}.jpg"
-    image_path = os.path.join(IMG_DIR, image_name)
 
-    # ===== SAVE IMAGE =====
-    if frame is not None:
-        cv2.imwrite(image_path, frame)
+    clip_name = f"{student_id}_{ts_str}.mjpeg"
+    if not (clip and frame_buffer.capture(student_id, clip_name)):
+        clip_name = None
 
-    # ===== SAVE LOG FILE =====
-    log_path = os.path.join(LOG_DIR, "events.log")
-    with open(log_path, "a") as f:
-        f.write(
-            f"{ts_str} | {student_id} | score={score} | reason={reason} | image={image_name}\n"
-        )
+    job = {
+        "frame": frame,
+        "jpeg": jpeg_bytes,
+        "student_id": student_id,
+        "exam_id": exam_id,
+        "score": score,
+        "reason": reason,
+        "image_name": image_name,
+        "clip_name": clip_name,
+        "timestamp": timestamp,
+        "ts_str": ts_str,
+    }
 
-    # ===== SAVE TO DATABASE =====
-    evidence = Evidence(
-        student_id=student_id,
-        image_name=image_name,
-        timestamp=timestamp
-    )
+    if evidence_writer.running:
+        evidence_writer.submit(job)
+        return image_name
+
+    # ===== SYNCHRONOUS FALLBACK (no app / writer) =====
+    if frame is not None:
+        _store_image(job)
+
+    with open(LOG_PATH, "a") as f:
+        f.write(_log_line(job))
 
-    db.session.add(evidence)
+    db.session.add(_evidence_row(job))
     db.session.commit()
 
     return image_name
@@ -0,0 +1,248 @@
+import atexit
+import os
+import threading
+import time
+import zipfile
+import zlib
+from datetime import datetime, timedelta
+
+import cv2
+import numpy as np
+from sqlalchemy import func
+from werkzeug.utils import secure_filename
+
+from ai.evidence import ARCHIVE_DIR, CLIP_DIR, IMG_DIR
+from config import (
+    EVIDENCE_RETENTION_DAYS,
+    EVIDENCE_RETENTION_INTERVAL_S,
+    EVIDENCE_ARCHIVE_JPEG_QUALITY,
+)
+from db import db
+from models import Evidence
+
+NO_EXAM_BUNDLE = "no_exam.zip"
+
+
+def bundle_name(exam_id):
+    if exam_id is None:
+        return NO_EXAM_BUNDLE
+    name = secure_filename(str(exam_id))
+    if not name:
+        name = f"exam_{zlib.crc32(str(exam_id).encode('utf-8')):08x}"
+    return f"{name}.zip"
+
+
+def _recompress(data, quality):
+    frame = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        return data
+    ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    # Never grow a file that was already smaller
+    return buf.tobytes() if ok and len(buf) < len(data) else data
+
+
+def read_archived(kind, filename):
+    """
+    Image ("images") or clip ("clips") from its retention bundle
+    (needs an app context).
+
+    Returns:
+        bytes, or None if no archived evidence row references it
+    """
+
+    column = Evidence.image_name if kind == "images" else Evidence.clip_name
+    row = (
+        Evidence.query
+        .filter(column == filename, Evidence.archive_name.isnot(None))
+        .first()
+    )
+    if row is None:
+        return None
+
+    try:
+        with zipfile.ZipFile(os.path.join(ARCHIVE_DIR, row.archive_name)) as bundle:
+            return bundle.read(f"{kind}/{filename}")
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None
+
+
+class EvidenceRetention:
+    """
+    Keeps evidence/images and evidence/clips bounded.
+
+    Once the newest evidence of an exam is older than `days`, its images
+    (re-encoded at `quality`) and clips move into one ZIP bundle per exam in
+    evidence/archive/. Evidence without an exam is moved row by row, each
+    row once it is older than `days`, into a single no_exam.zip bundle.
+    Rows keep their image / clip names and get archive_name, so the
+    evidence routes keep serving them from the bundle. Thumbnails stay on
+    disk for list views.
+    """
+
+    def __init__(self, days=EVIDENCE_RETENTION_DAYS, interval=EVIDENCE_RETENTION_INTERVAL_S,
+                 quality=EVIDENCE_ARCHIVE_JPEG_QUALITY):
+        self.days = days
+        self.interval = interval
+        self.quality = quality
+
+        self.app = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+        self.runs = 0
+        self.last_run = None
+        self.bundles_written = 0
+        self.rows_archived = 0
+        self.files_archived = 0
+        self.bytes_freed = 0
+        self.errors = 0
+
+    # ================= LIFECYCLE =================
+    def init_app(self, app):
+        self.app = app
+        if self.days <= 0 or self.running:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="evidence-retention", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def close(self, timeout=10.0):
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                with self.app.app_context():
+                    self.run_once()
+            except Exception:
+                db.session.rollback()
+                with self._lock:
+                    self.errors += 1
+
+    # ================= COMPACTION =================
+    def run_once(self, now=None, days=None):
+        """
+        One retention pass (needs an app context).
+
+        Returns:
+            {"bundles", "rows", "files", "bytes_freed"} for this pass
+        """
+
+        days = self.days if days is None else days
+        now = datetime.now() if now is None else now
+        # Evidence timestamps are local time (see save_evidence)
+        cutoff = now - timedelta(days=days)
+
+        done = {"bundles": 0, "rows": 0, "files": 0, "bytes_freed": 0}
+
+        exams = (
+            db.session.query(Evidence.exam_id)
+            .filter(Evidence.exam_id.isnot(None), Evidence.archive_name.is_(None))
+            .group_by(Evidence.exam_id)
+            .having(func.max(Evidence.timestamp) < cutoff)
+            .all()
+        )
+        for (exam_id,) in exams:
+            rows = Evidence.query.filter(
+                Evidence.exam_id == exam_id, Evidence.archive_name.is_(None)
+            ).all()
+            self._archive(bundle_name(exam_id), rows, done)
+
+        loose = Evidence.query.filter(
+            Evidence.exam_id.is_(None),
+            Evidence.archive_name.is_(None),
+            Evidence.timestamp < cutoff
+        ).all()
+        if loose:
+            self._archive(NO_EXAM_BUNDLE, loose, done)
+
+        with self._lock:
+            self.runs += 1
+            self.last_run = time.time()
+            self.bundles_written += done["bundles"]
+            self.rows_archived += done["rows"]
+            self.files_archived += done["files"]
+            self.bytes_freed += done["bytes_freed"]
+        return done
+
+    def _archive(self, name, rows, done):
+        moved = {}     # source path -> (kind, filename)
+
+        # 1) copy into the bundle (appending: an exam may be archived in steps)
+        with zipfile.ZipFile(os.path.join(ARCHIVE_DIR, name), "a", zipfile.ZIP_STORED) as bundle:
+            members = set(bundle.namelist())
+            for row in rows:
+                for kind, directory, filename in (
+                    ("images", IMG_DIR, row.image_name),
+                    ("clips", CLIP_DIR, row.clip_name),
+                ):
+                    if not filename:
+                        continue
+                    member = f"{kind}/{filename}"
+                    path = os.path.join(directory, filename)
+
+                    if member not in members and os.path.exists(path):
+                        with open(path, "rb") as f:
+                            data = f.read()
+                        if kind == "images" and self.quality > 0:
+                            data = _recompress(data, self.quality)
+                        bundle.writestr(member, data)
+                        members.add(member)
+
+                    if member in members:
+                        moved[path] = (kind, filename)
+
+        # 2) point the rows at the bundle
+        for row in rows:
+            row.archive_name = name
+        db.session.commit()
+
+        # 3) only then delete originals no live row still uses (deduplicated
+        # images can be shared with newer evidence)
+        images = [f for kind, f in moved.values() if kind == "images"]
+        clips = [f for kind, f in moved.values() if kind == "clips"]
+        live = Evidence.query.filter(
+            Evidence.archive_name.is_(None),
+            db.or_(Evidence.image_name.in_(images), Evidence.clip_name.in_(clips))
+        ).with_entities(Evidence.image_name, Evidence.clip_name).all()
+        in_use = {f for pair in live for f in pair if f}
+
+        for path, (_, filename) in moved.items():
+            if filename in in_use or not os.path.exists(path):
+                continue
+            size = os.path.getsize(path)
+            os.remove(path)
+            done["files"] += 1
+            done["bytes_freed"] += size
+
+        done["bundles"] += 1
+        done["rows"] += len(rows)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "days": self.days,
+                "running": self.running,
+                "runs": self.runs,
+                "last_run": self.last_run,
+                "bundles_written": self.bundles_written,
+                "rows_archived": self.rows_archived,
+                "files_archived": self.files_archived,
+                "bytes_freed": self.bytes_freed,
+                "errors": self.errors,
+            }
+
+
+evidence_retention = EvidenceRetention()
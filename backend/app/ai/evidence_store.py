@@ -0,0 +1,120 @@
+import threading
+from collections import deque
+
+import cv2
+import numpy as np
+
+from config import (
+    EVIDENCE_DEDUP_WINDOW_S,
+    EVIDENCE_DEDUP_DISTANCE,
+    EVIDENCE_THUMB_SIZE,
+    EVIDENCE_THUMB_QUALITY,
+)
+
+
+# ================= PERCEPTUAL HASH =================
+def dhash(frame):
+    """
+    64-bit difference hash: 9x8 grayscale thumbnail, one bit per
+    left/right neighbour comparison. Near-identical shots (same student,
+    same pose, sensor noise) differ in a few bits only.
+    """
+
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+# ================= THUMBNAILS =================
+def encode_thumbnail(frame, size=EVIDENCE_THUMB_SIZE, quality=EVIDENCE_THUMB_QUALITY):
+    """
+    Small JPEG for list views (longer side = size).
+
+    Returns:
+        JPEG bytes, or None when thumbnails are off / encoding failed
+    """
+
+    if size <= 0:
+        return None
+
+    h, w = frame.shape[:2]
+    f = min(1.0, size / max(h, w))
+    if f < 1.0:
+        frame = cv2.resize(
+            frame, (max(1, round(w * f)), max(1, round(h * f))),
+            interpolation=cv2.INTER_AREA
+        )
+
+    ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buf.tobytes() if ok else None
+
+
+# ================= DEDUPLICATION =================
+class DedupIndex:
+    """
+    Recent evidence hashes per student.
+
+    match() returns the image of an earlier shot of the same student taken
+    less than `window` seconds before and at most `distance` bits away;
+    the new evidence row then points at that image instead of a new file.
+    """
+
+    def __init__(self, window=EVIDENCE_DEDUP_WINDOW_S, distance=EVIDENCE_DEDUP_DISTANCE,
+                 per_student=8):
+        self.window = window
+        self.distance = distance
+        self.per_student = per_student
+
+        self._lock = threading.Lock()
+        self._recent = {}      # student_id -> deque of (hash, image_name, time)
+
+    @property
+    def enabled(self):
+        return self.window > 0
+
+    def match(self, student_id, value, when):
+        """
+        when: evidence time (seconds)
+
+        Returns:
+            image_name to reuse, or None
+        """
+
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            recent = self._recent.get(student_id)
+            if not recent:
+                return None
+
+            # Drop what fell out of the window (newest is last)
+            while recent and when - recent[0][2] > self.window:
+                recent.popleft()
+            if not recent:
+                del self._recent[student_id]
+                return None
+
+            for other, image_name, _ in reversed(recent):
+                if hamming(value, other) <= self.distance:
+                    return image_name
+            return None
+
+    def add(self, student_id, value, image_name, when):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            recent = self._recent.get(student_id)
+            if recent is None:
+                recent = self._recent[student_id] = deque(maxlen=self.per_student)
+            recent.append((value, image_name, when))
+
+    def forget(self, student_id):
+        with self._lock:
+            self._recent.pop(student_id, None)
@@ -1,14 +1,6 @@
-import cv2
-import mediapipe as mp
 import math
 
-mp_face_mesh = mp.solutions.face_mesh
-face_mesh = mp_face_mesh.FaceMesh(
-    refine_landmarks=True,
-    max_num_faces=1,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
+from ai.landmarks import detect_face_landmarks
 
 # ===== MediaPipe Eye Landmarks =====
 LEFT_EYE = [33, 160, 158, 133, 153, 144]
@@ -30,30 +22,28 @@ def eye_aspect_ratio(eye):
     return (vertical1 + vertical2) / (2.0 * horizontal + 1e-6)
 
 
-def detect_eye_behavior(frame):
+def eye_behavior_from_landmarks(faces, frame_width):
     """
+    Eye direction / closed state from a landmark array (num_faces, N, 2).
+
     Returns:
         eye_direction: left | right | center | no_face
         eyes_closed: True | False
     """
 
-    h, w, _ = frame.shape
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = face_mesh.process(rgb)
-
-    if not result.multi_face_landmarks:
+    if len(faces) == 0:
         return "no_face", False
 
-    lm = result.multi_face_landmarks[0].landmark
+    lm = faces[0]
 
     # ===== Extract eye points =====
-    left_eye = [(int(lm[i].x * w), int(lm[i].y * h)) for i in LEFT_EYE]
-    right_eye = [(int(lm[i].x * w), int(lm[i].y * h)) for i in RIGHT_EYE]
+    left_eye = lm[LEFT_EYE].astype(int).tolist()
+    right_eye = lm[RIGHT_EYE].astype(int).tolist()
 
     # ===== Eye center for direction =====
     left_center_x = sum(p[0] for p in left_eye) / len(left_eye)
     right_center_x = sum(p[0] for p in right_eye) / len(right_eye)
-    face_center_x = w / 2
+    face_center_x = frame_width / 2
 
     if left_center_x < face_center_x - 45:
         eye_direction = "left"
@@ -70,3 +60,19 @@ def detect_eye_behavior(frame):
     eyes_closed = avg_ear < 0.20   # 🔥 stable threshold
 
     return eye_direction, eyes_closed
+
+
+def detect_eye_behavior(frame, faces=None):
+    """
+    frame: PreparedFrame or BGR ndarray (.shape is the size as received,
+    which the 45 px thresholds assume)
+
+    Returns:
+        eye_direction: left | right | center | no_face
+        eyes_closed: True | False
+    """
+
+    if faces is None:
+        faces = detect_face_landmarks(frame)
+
+    return eye_behavior_from_landmarks(faces, frame.shape[1])
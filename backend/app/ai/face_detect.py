@@ -1,44 +1,35 @@
-import cv2
-import mediapipe as mp
+import numpy as np
 
-mp_face_mesh = mp.solutions.face_mesh
+from ai.landmarks import detect_face_landmarks
 
-face_mesh = mp_face_mesh.FaceMesh(
-    max_num_faces=2,
-    refine_landmarks=False,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
 
-
-def detect_face(frame):
+def count_faces(faces):
     """
+    Count valid faces from a landmark array (num_faces, N, 2).
+
     Returns:
         face_present (bool)
         face_count (int)
     """
 
-    h, w, _ = frame.shape
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = face_mesh.process(rgb)
-
-    if not result.multi_face_landmarks:
+    if len(faces) == 0:
         return False, 0
 
-    valid_faces = 0
+    # Bounding box size check (filter noise / tiny faces)
+    extent = faces.max(axis=1) - faces.min(axis=1)
+    valid_faces = int(np.count_nonzero((extent > 60).all(axis=1)))
 
-    for face in result.multi_face_landmarks:
-        xs = [lm.x for lm in face.landmark]
-        ys = [lm.y for lm in face.landmark]
+    return valid_faces > 0, valid_faces
 
-        # Bounding box size check (filter noise / tiny faces)
-        min_x, max_x = min(xs), max(xs)
-        min_y, max_y = min(ys), max(ys)
 
-        face_width = (max_x - min_x) * w
-        face_height = (max_y - min_y) * h
+def detect_face(frame, faces=None):
+    """
+    Returns:
+        face_present (bool)
+        face_count (int)
+    """
 
-        if face_width > 60 and face_height > 60:
-            valid_faces += 1
+    if faces is None:
+        faces = detect_face_landmarks(frame)
 
-    return valid_faces > 0, valid_faces
+    return count_faces(faces)
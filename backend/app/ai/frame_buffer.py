@@ -0,0 +1,243 @@
+import threading
+import time
+from collections import deque
+
+from config import (
+    FRAME_BUFFER_MAX_BYTES,
+    CLIP_PRE_FRAMES,
+    CLIP_POST_FRAMES,
+    CLIP_POST_TIMEOUT_S,
+    CLIP_MAX_PENDING,
+)
+
+
+class _PendingClip:
+    def __init__(self, clip_name, frames, deadline):
+        self.clip_name = clip_name
+        self.frames = frames          # JPEG bytes, oldest first
+        self.bytes = sum(len(f) for f in frames)
+        self.post_frames = 0
+        self.deadline = deadline
+
+
+class FrameRingBuffer:
+    """
+    Recent frames per student as the JPEG bytes the client sent (never
+    decoded ndarrays), for evidence clips.
+
+    Each student keeps at most `pre_frames` frames. capture() starts a clip
+    from the buffered frames; the next `post_frames` frames of that student
+    complete it, and finished clips are handed to on_clip(clip_name, frames)
+    (the evidence writer).
+
+    Ring and pending clips share one `max_bytes` budget (a frame held by
+    both counts twice): the oldest ring frames anywhere are evicted first,
+    and if pending clips alone exceed it the oldest clip is finished early
+    with the frames it has.
+    """
+
+    def __init__(self, max_bytes=FRAME_BUFFER_MAX_BYTES, pre_frames=CLIP_PRE_FRAMES,
+                 post_frames=CLIP_POST_FRAMES, post_timeout=CLIP_POST_TIMEOUT_S,
+                 max_pending=CLIP_MAX_PENDING, on_clip=None):
+        self.max_bytes = int(max_bytes)
+        self.pre_frames = max(1, int(pre_frames))
+        self.post_frames = max(0, int(post_frames))
+        self.post_timeout = post_timeout
+        self.max_pending = max(1, int(max_pending))
+        self.on_clip = on_clip
+
+        self._lock = threading.Lock()
+        self._frames = {}        # student_id -> deque of [student_id, jpeg]
+        self._order = deque()    # same entries, oldest first (global eviction)
+        self._pending = {}       # student_id -> [_PendingClip]
+        self._live = 0
+        self.bytes = 0
+        self.pending_bytes = 0
+
+        self.evicted = 0
+        self.clips_started = 0
+        self.clips_finished = 0
+        self.clips_dropped = 0
+        self.clips_truncated = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    # ================= RING =================
+    def push(self, student_id, jpeg_bytes):
+        """
+        Remember one frame; completes this student's pending clips when
+        their post-event window is full.
+        """
+
+        if not self.enabled or not jpeg_bytes:
+            return
+
+        entry = [student_id, jpeg_bytes]
+        done = []
+
+        with self._lock:
+            frames = self._frames.get(student_id)
+            if frames is None:
+                frames = self._frames[student_id] = deque()
+
+            frames.append(entry)
+            self._order.append(entry)
+            self._live += 1
+            self.bytes += len(jpeg_bytes)
+
+            if len(frames) > self.pre_frames:
+                self._release(frames.popleft())
+
+            for clip in self._pending.get(student_id, ()):
+                clip.frames.append(jpeg_bytes)
+                clip.bytes += len(jpeg_bytes)
+                self.pending_bytes += len(jpeg_bytes)
+                clip.post_frames += 1
+            done = self._take_pending(
+                student_id, lambda clip: clip.post_frames >= self.post_frames
+            )
+            done += self._enforce_budget()
+
+        self._emit(done)
+
+    def _release(self, entry):
+        # Entry leaves the ring; its slot in _order is skipped later
+        self._live -= 1
+        self.bytes -= len(entry[1])
+        entry[1] = None
+
+    def _compact(self):
+        while self._order and self._order[0][1] is None:
+            self._order.popleft()
+        # Released entries behind a quiet student's old frames pile up
+        if len(self._order) > 2 * self._live + 64:
+            self._order = deque(e for e in self._order if e[1] is not None)
+
+    def _enforce_budget(self):
+        """
+        Returns:
+            pending clips finished early to get back under max_bytes
+        """
+
+        while self.bytes + self.pending_bytes > self.max_bytes and self._order:
+            self._evict_oldest()
+        self._compact()
+
+        done = []
+        while self.pending_bytes > self.max_bytes and self._pending:
+            student_id, oldest = min(
+                ((sid, c) for sid, clips in self._pending.items() for c in clips),
+                key=lambda item: item[1].deadline
+            )
+            done += self._take_pending(student_id, lambda c: c is oldest)
+            self.clips_truncated += 1
+        return done
+
+    def _evict_oldest(self):
+        entry = self._order.popleft()
+        if entry[1] is None:
+            return
+
+        frames = self._frames[entry[0]]
+        frames.popleft()      # per-student order matches global order
+        self._release(entry)
+        self.evicted += 1
+        if not frames:
+            del self._frames[entry[0]]
+
+    # ================= CLIPS =================
+    def capture(self, student_id, clip_name, now=None):
+        """
+        Start a clip: buffered pre-event frames now, post-event frames as
+        they arrive.
+
+        Returns:
+            True if the clip was started (False: disabled / too many pending)
+        """
+
+        if not self.enabled:
+            return False
+
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            if sum(len(c) for c in self._pending.values()) >= self.max_pending:
+                self.clips_dropped += 1
+                return False
+
+            frames = [e[1] for e in self._frames.get(student_id, ())]
+            clip = _PendingClip(clip_name, frames, now + self.post_timeout)
+            self._pending.setdefault(student_id, []).append(clip)
+            self.pending_bytes += clip.bytes
+            self.clips_started += 1
+
+            done = []
+            if self.post_frames == 0:
+                done = self._take_pending(student_id, lambda c: c is clip)
+            done += self._enforce_budget()
+
+        self._emit(done)
+        return True
+
+    def expire(self, now=None):
+        """
+        Finish clips whose post-event window timed out (student went quiet).
+        """
+
+        now = time.monotonic() if now is None else now
+        done = []
+        with self._lock:
+            for student_id in list(self._pending):
+                done += self._take_pending(student_id, lambda c: c.deadline <= now)
+        self._emit(done)
+
+    def drop(self, student_id):
+        """
+        Session closed: finish its pending clips early and free its frames.
+        """
+
+        with self._lock:
+            done = self._take_pending(student_id, lambda c: True)
+            for entry in self._frames.pop(student_id, ()):
+                self._release(entry)
+            self._compact()
+        self._emit(done)
+
+    def _take_pending(self, student_id, finished):
+        clips = self._pending.get(student_id)
+        if not clips:
+            return []
+
+        done = [c for c in clips if finished(c)]
+        if done:
+            self.pending_bytes -= sum(c.bytes for c in done)
+            remaining = [c for c in clips if c not in done]
+            if remaining:
+                self._pending[student_id] = remaining
+            else:
+                del self._pending[student_id]
+        return done
+
+    def _emit(self, clips):
+        for clip in clips:
+            with self._lock:
+                self.clips_finished += 1
+            if self.on_clip is not None and clip.frames:
+                self.on_clip(clip.clip_name, clip.frames)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "students": len(self._frames),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "evicted": self.evicted,
+                "pending_clips": sum(len(c) for c in self._pending.values()),
+                "pending_bytes": self.pending_bytes,
+                "clips_started": self.clips_started,
+                "clips_finished": self.clips_finished,
+                "clips_dropped": self.clips_dropped,
+                "clips_truncated": self.clips_truncated,
+            }
@@ -0,0 +1,175 @@
+import cv2
+import numpy as np
+
+from config import FRAME_WORK_MAX_SIDE, FACE_INPUT_MAX_SIDE, HANDS_INPUT_MAX_SIDE
+
+GATE_SIZE = (64, 48)
+
+# libjpeg can decode straight at 1/2, 1/4, 1/8 scale (DCT scaling)
+_REDUCED_FLAGS = [
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+]
+
+# Start-of-frame markers (baseline, progressive, ...) carry the image size
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def jpeg_size(jpeg_bytes):
+    """
+    Image size from the JPEG header, without decoding.
+
+    Returns:
+        (width, height) or None if no SOF marker is found
+    """
+
+    data = memoryview(jpeg_bytes)
+    i = 2
+    while i + 9 < len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:
+            i += 1
+            continue
+        length = (data[i + 2] << 8) | data[i + 3]
+        if marker in _SOF_MARKERS:
+            height = (data[i + 5] << 8) | data[i + 6]
+            width = (data[i + 7] << 8) | data[i + 8]
+            return width, height
+        i += 2 + length
+    return None
+
+
+class PreparedFrame:
+    """
+    One decoded frame and every view the detectors need, built once.
+
+    - bgr: working image (possibly decoded at reduced size)
+    - width / height: reference size = the frame as the client sent it.
+      All detector outputs (landmarks, hand / phone centers, ROIs) are in
+      reference pixels, so pixel thresholds (60 px faces, 40 px hands)
+      mean the same thing whatever the working resolution.
+    - rgb(max_side): cached RGB tiers for the MediaPipe graphs
+    - gray_small: cached motion-gate thumbnail
+    - faces: FaceMesh landmarks, computed once and shared
+
+    Built per request and used by one thread, so nothing here is locked.
+    """
+
+    def __init__(self, bgr, width=None, height=None):
+        self.bgr = bgr
+        self.width = int(width or bgr.shape[1])
+        self.height = int(height or bgr.shape[0])
+
+        self._rgb = {}
+        self._gray_small = None
+        self.faces = None
+
+    @property
+    def shape(self):
+        # Reference shape: code written for raw frames keeps working
+        return (self.height, self.width, 3)
+
+    @property
+    def scale(self):
+        """
+        (sx, sy): reference pixels per working pixel.
+        """
+
+        return self.width / self.bgr.shape[1], self.height / self.bgr.shape[0]
+
+    def rgb(self, max_side=None):
+        """
+        RGB view, downscaled so the longer side is at most max_side.
+        """
+
+        h, w = self.bgr.shape[:2]
+        target = 0 if not max_side or max(h, w) <= max_side else int(max_side)
+
+        view = self._rgb.get(target)
+        if view is None:
+            if target:
+                # Resize first, then convert the (smaller) result
+                f = target / max(h, w)
+                small = cv2.resize(
+                    self.bgr, (max(1, round(w * f)), max(1, round(h * f))),
+                    interpolation=cv2.INTER_AREA
+                )
+                view = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+            else:
+                view = cv2.cvtColor(self.bgr, cv2.COLOR_BGR2RGB)
+            self._rgb[target] = view
+        return view
+
+    def face_rgb(self):
+        return self.rgb(FACE_INPUT_MAX_SIDE)
+
+    def hands_rgb(self):
+        return self.rgb(HANDS_INPUT_MAX_SIDE)
+
+    @property
+    def gray_small(self):
+        if self._gray_small is None:
+            self._gray_small = cv2.resize(
+                cv2.cvtColor(self.bgr, cv2.COLOR_BGR2GRAY),
+                GATE_SIZE,
+                interpolation=cv2.INTER_AREA
+            )
+        return self._gray_small
+
+    def to_working(self, box):
+        """
+        Reference-pixel box (x1, y1, x2, y2) -> working-image box.
+        """
+
+        sx, sy = self.scale
+        x1, y1, x2, y2 = box
+        return (
+            int(x1 / sx), int(y1 / sy),
+            max(int(x1 / sx) + 1, int(round(x2 / sx))),
+            max(int(y1 / sy) + 1, int(round(y2 / sy)))
+        )
+
+    def to_reference(self, point):
+        sx, sy = self.scale
+        return int(point[0] * sx), int(point[1] * sy)
+
+
+def as_prepared(frame):
+    """
+    Accept a PreparedFrame or a raw BGR ndarray (tools, tests, workers).
+    """
+
+    if isinstance(frame, PreparedFrame):
+        return frame
+    return PreparedFrame(frame)
+
+
+def decode_prepared(jpeg_bytes, max_side=FRAME_WORK_MAX_SIDE):
+    """
+    Decode once, at reduced size when the JPEG is much larger than any
+    model needs (libjpeg scaling is cheaper than a full decode + resize).
+
+    Returns:
+        PreparedFrame, or None if OpenCV cannot decode it
+    """
+
+    buf = np.frombuffer(jpeg_bytes, np.uint8)
+    size = jpeg_size(jpeg_bytes) if max_side else None
+
+    flag = cv2.IMREAD_COLOR
+    if size is not None:
+        for factor, reduced in _REDUCED_FLAGS:
+            if max(size) / factor >= max_side:
+                flag = reduced
+                break
+
+    bgr = cv2.imdecode(buf, flag)
+    if bgr is None:
+        return None
+
+    if size is None or flag == cv2.IMREAD_COLOR:
+        return PreparedFrame(bgr)
+    return PreparedFrame(bgr, *size)
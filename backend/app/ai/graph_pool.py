@@ -0,0 +1,77 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+
+class GraphPool:
+    """
+    Thread-safe pool of inference graphs (MediaPipe FaceMesh / Hands).
+
+    A graph is never used by two threads at once. Graphs are created lazily
+    up to `size`; after that callers wait for a free one.
+    """
+
+    def __init__(self, factory, size, name="graph"):
+        self.factory = factory
+        self.size = max(1, int(size))
+        self.name = name
+
+        self._free = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+
+    def _acquire(self):
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+
+        if create:
+            try:
+                return self.factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        return self._free.get()
+
+    @contextmanager
+    def lease(self):
+        graph = self._acquire()
+        try:
+            yield graph
+        finally:
+            self._free.put(graph)
+
+    def prefill(self, count, warmup=None):
+        """
+        Create up to `count` graphs ahead of traffic, optionally running
+        warmup(graph) on each (e.g. one dummy frame).
+        """
+
+        graphs = []
+        try:
+            for _ in range(min(int(count), self.size)):
+                graph = self._acquire()
+                graphs.append(graph)
+                if warmup is not None:
+                    warmup(graph)
+        finally:
+            for graph in graphs:
+                self._free.put(graph)
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "size": self.size,
+            "created": self._created,
+            "idle": self._free.qsize(),
+        }
@@ -1,34 +1,58 @@
-import cv2
 import mediapipe as mp
+import numpy as np
+
+from ai.frame_prep import as_prepared
+from ai.graph_pool import GraphPool
+from ai.model_registry import model_registry
+from config import GRAPH_POOL_SIZE, MODEL_WARMUP_GRAPHS
 
 mp_hands = mp.solutions.hands
 
-hands = mp_hands.Hands(
-    max_num_hands=2,
-    min_detection_confidence=0.6,
-    min_tracking_confidence=0.6
-)
 
+def _create_hands():
+    # Static mode: pooled graphs must not track across students (and with
+    # max_num_hands=2 tracking re-detects most frames anyway, see landmarks.py)
+    return mp_hands.Hands(
+        static_image_mode=True,
+        max_num_hands=2,
+        min_detection_confidence=0.6,
+        min_tracking_confidence=0.6
+    )
 
-def detect_hand_and_position(frame):
+
+hands_pool = GraphPool(_create_hands, GRAPH_POOL_SIZE, name="hands")
+
+
+def _warm_hands(pool):
+    dummy = np.zeros((480, 640, 3), dtype=np.uint8)
+    pool.prefill(MODEL_WARMUP_GRAPHS, lambda graph: graph.process(dummy))
+
+
+model_registry.register("hands", lambda: hands_pool, _warm_hands)
+
+NUM_HAND_LANDMARKS = 21
+
+
+def hand_position_from_landmarks(hands, frame_width, frame_height):
     """
+    Hand presence / position from normalized landmarks (num_hands, 21, 2),
+    as produced by MediaPipe Hands (server graph or in the browser).
+
     Returns:
         hand_detected (bool)
         hand_center (x, y) or None
     """
 
-    h, w, _ = frame.shape
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = hands.process(rgb)
+    w, h = frame_width, frame_height
 
-    if not result.multi_hand_landmarks:
+    if len(hands) == 0:
         return False, None
 
     centers = []
 
-    for hand_landmarks in result.multi_hand_landmarks:
-        xs = [int(lm.x * w) for lm in hand_landmarks.landmark]
-        ys = [int(lm.y * h) for lm in hand_landmarks.landmark]
+    for hand in hands:
+        xs = [int(x * w) for x in hand[:, 0].tolist()]
+        ys = [int(y * h) for y in hand[:, 1].tolist()]
 
         # Bounding box size (filter noise)
         min_x, max_x = min(xs), max(xs)
@@ -49,3 +73,31 @@ def detect_hand_and_position(frame):
     avg_y = sum(c[1] for c in centers) // len(centers)
 
     return True, (avg_x, avg_y)
+
+
+def detect_hand_and_position(frame):
+    """
+    frame: PreparedFrame or BGR ndarray
+
+    Returns:
+        hand_detected (bool)
+        hand_center (x, y) or None, in pixels of the frame as received
+    """
+
+    prepared = as_prepared(frame)
+
+    with hands_pool.lease() as hands:
+        result = hands.process(prepared.hands_rgb())
+
+    if not result.multi_hand_landmarks:
+        return False, None
+
+    landmarks = np.array(
+        [
+            [(lm.x, lm.y) for lm in hand.landmark]
+            for hand in result.multi_hand_landmarks
+        ],
+        dtype=np.float32
+    )
+
+    return hand_position_from_landmarks(landmarks, prepared.width, prepared.height)
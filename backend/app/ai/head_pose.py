@@ -1,49 +1,55 @@
-import cv2
-import mediapipe as mp
+from ai.landmarks import detect_face_landmarks
 
-mp_face_mesh = mp.solutions.face_mesh
 
-face_mesh = mp_face_mesh.FaceMesh(
-    refine_landmarks=True,
-    max_num_faces=1,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
+class HeadDirectionSmoother:
+    """
+    Per-student direction memory (simple smoothing).
+    """
+
+    def __init__(self):
+        self.last_direction = "center"
+
+    def update(self, direction):
+        # Simple smoothing (avoid jitter)
+        if direction != self.last_direction:
+            self.last_direction = direction
+        else:
+            direction = self.last_direction
 
-# Smooth direction (simple memory)
-_last_direction = "center"
+        return direction
 
 
-def get_head_direction(frame):
+# Fallback when the caller has no per-student session
+_default_smoother = HeadDirectionSmoother()
+
+
+def head_direction_from_landmarks(faces, smoother=None):
     """
+    Head direction from a landmark array (num_faces, N, 2).
+
     Returns:
         left | right | down | center | no_face
     """
 
-    global _last_direction
-
-    h, w, _ = frame.shape
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = face_mesh.process(rgb)
+    if smoother is None:
+        smoother = _default_smoother
 
-    if not result.multi_face_landmarks:
-        _last_direction = "no_face"
+    if len(faces) == 0:
+        smoother.last_direction = "no_face"
         return "no_face"
 
-    lm = result.multi_face_landmarks[0].landmark
+    lm = faces[0]
 
     # Key landmarks
-    nose = lm[1]
+    nose_x, nose_y = lm[1]
     left_eye = lm[33]
     right_eye = lm[263]
-    chin = lm[152]
+    chin_y = lm[152][1]
 
-    nose_x, nose_y = nose.x * w, nose.y * h
-    eye_center_x = ((left_eye.x + right_eye.x) / 2) * w
-    eye_center_y = ((left_eye.y + right_eye.y) / 2) * h
-    chin_y = chin.y * h
+    eye_center_x = (left_eye[0] + right_eye[0]) / 2
+    eye_center_y = (left_eye[1] + right_eye[1]) / 2
 
-    face_width = abs(right_eye.x - left_eye.x) * w
+    face_width = abs(right_eye[0] - left_eye[0])
     face_height = abs(chin_y - eye_center_y)
 
     # Dynamic thresholds
@@ -59,10 +65,16 @@ def get_head_direction(frame):
     elif nose_y > eye_center_y + y_thresh:
         direction = "down"
 
-    # Simple smoothing (avoid jitter)
-    if direction != _last_direction:
-        _last_direction = direction
-    else:
-        direction = _last_direction
+    return smoother.update(direction)
+
+
+def get_head_direction(frame, faces=None, smoother=None):
+    """
+    Returns:
+        left | right | down | center | no_face
+    """
+
+    if faces is None:
+        faces = detect_face_landmarks(frame)
 
-    return direction
+    return head_direction_from_landmarks(faces, smoother)
@@ -0,0 +1,77 @@
+import mediapipe as mp
+import numpy as np
+
+from ai.frame_prep import as_prepared
+from ai.graph_pool import GraphPool
+from ai.model_registry import model_registry
+from config import GRAPH_POOL_SIZE, MODEL_WARMUP_GRAPHS
+
+mp_face_mesh = mp.solutions.face_mesh
+
+
+def _create_face_mesh():
+    # 🔥 One refined mesh per frame, shared by face / eye / head detectors.
+    # Static mode: pooled graphs serve many students, so they must not carry
+    # tracking state from one student's frame into another's. Tracking would
+    # not pay anyway: with max_num_faces=2 MediaPipe re-runs detection while
+    # fewer than two faces are tracked (the usual single-student frame), and
+    # CameraBox frames are seconds apart (bench_pipeline.py: tracking was no
+    # faster and had a worse tail).
+    return mp_face_mesh.FaceMesh(
+        static_image_mode=True,
+        max_num_faces=2,
+        refine_landmarks=True,
+        min_detection_confidence=0.5,
+        min_tracking_confidence=0.5
+    )
+
+
+face_mesh_pool = GraphPool(_create_face_mesh, GRAPH_POOL_SIZE, name="face_mesh")
+
+
+def _warm_face_mesh(pool):
+    dummy = np.zeros((480, 640, 3), dtype=np.uint8)
+    pool.prefill(MODEL_WARMUP_GRAPHS, lambda graph: graph.process(dummy))
+
+
+model_registry.register("face_mesh", lambda: face_mesh_pool, _warm_face_mesh)
+
+NUM_LANDMARKS = 478   # 468 mesh points + 10 iris points (refined)
+
+
+def no_faces():
+    return np.empty((0, NUM_LANDMARKS, 2), dtype=np.float32)
+
+
+def detect_face_landmarks(frame):
+    """
+    Run FaceMesh once on a frame (PreparedFrame or BGR ndarray). The result
+    is cached on the PreparedFrame, so later callers share it.
+
+    Returns:
+        faces: float32 array (num_faces, 478, 2) in pixel coordinates of
+               the frame as received (empty when no face is found)
+    """
+
+    prepared = as_prepared(frame)
+    if prepared.faces is not None:
+        return prepared.faces
+
+    with face_mesh_pool.lease() as face_mesh:
+        result = face_mesh.process(prepared.face_rgb())
+
+    if not result.multi_face_landmarks:
+        faces = no_faces()
+    else:
+        faces = np.array(
+            [
+                [(lm.x, lm.y) for lm in face.landmark]
+                for face in result.multi_face_landmarks
+            ],
+            dtype=np.float32
+        )
+        # Normalized -> reference pixels, whatever size the mesh ran at
+        faces *= (prepared.width, prepared.height)
+
+    prepared.faces = faces
+    return faces
@@ -0,0 +1,149 @@
+import threading
+import time
+
+from config import MODEL_WARMUP
+
+
+class _Entry:
+    def __init__(self, name, loader, warmup):
+        self.name = name
+        self.loader = loader
+        self.warmup = warmup
+        self.lock = threading.Lock()
+        self.model = None
+        self.loaded = False
+        self.warm = False
+        self.load_ms = None
+        self.warmup_ms = None
+        self.error = None
+
+
+class ModelRegistry:
+    """
+    Named models built on first use instead of at import time.
+
+    warm_all() (run in a background thread by start_warmup) loads every
+    model and pushes one dummy input through it, so the first real request
+    does not pay the cold-inference cost. ready() turns true once that is
+    done; /ready reports it to load balancers.
+    """
+
+    def __init__(self, mode=MODEL_WARMUP):
+        self.mode = mode
+        self._entries = {}
+        self._thread = None
+        self._targets = None      # names warmed at startup (None = all)
+        self._finished = threading.Event()
+        self.warmup_started = None
+        self.warmup_ms = None
+
+    def register(self, name, loader, warmup=None):
+        """
+        loader(): builds the model
+        warmup(model): optional dummy inference to prime it
+        """
+
+        self._entries[name] = _Entry(name, loader, warmup)
+
+    def names(self):
+        return list(self._entries)
+
+    def get(self, name):
+        entry = self._entries[name]
+        if entry.loaded:
+            return entry.model
+
+        with entry.lock:
+            if not entry.loaded:
+                started = time.perf_counter()
+                try:
+                    entry.model = entry.loader()
+                except Exception as e:
+                    entry.error = repr(e)
+                    raise
+                entry.load_ms = (time.perf_counter() - started) * 1000
+                entry.error = None
+                entry.loaded = True
+        return entry.model
+
+    def warm(self, name):
+        entry = self._entries[name]
+        model = self.get(name)
+
+        with entry.lock:
+            if entry.warm:
+                return
+            started = time.perf_counter()
+            if entry.warmup is not None:
+                entry.warmup(model)
+            entry.warmup_ms = (time.perf_counter() - started) * 1000
+            entry.warm = True
+
+    # ================= STARTUP =================
+    def _target_entries(self):
+        names = self._targets if self._targets is not None else list(self._entries)
+        return [self._entries[name] for name in names]
+
+    def warm_all(self, names=None):
+        """
+        Load + prime the given models (default: all); errors are recorded,
+        not raised.
+        """
+
+        if names is not None:
+            self._targets = list(names)
+
+        self.warmup_started = time.time()
+        started = time.perf_counter()
+        for entry in self._target_entries():
+            try:
+                self.warm(entry.name)
+            except Exception as e:
+                entry.error = repr(e)
+        self.warmup_ms = (time.perf_counter() - started) * 1000
+        self._finished.set()
+
+    def start_warmup(self, names=None):
+        """
+        Apply the configured mode: "background" (default) warms in a daemon
+        thread, "eager" blocks until warm, "lazy" loads on first use only.
+        """
+
+        if names is not None:
+            self._targets = list(names)
+
+        if self.mode == "eager":
+            self.warm_all()
+        elif self.mode == "background":
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self.warm_all, name="model-warmup", daemon=True
+                )
+                self._thread.start()
+
+    def ready(self):
+        if self.mode == "lazy":
+            return True
+        return self._finished.is_set() and all(
+            e.warm and e.error is None for e in self._target_entries()
+        )
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "ready": self.ready(),
+            "warmup_ms": self.warmup_ms,
+            "models": {
+                e.name: {
+                    "loaded": e.loaded,
+                    "warm": e.warm,
+                    "load_ms": e.load_ms,
+                    "warmup_ms": e.warmup_ms,
+                    "error": e.error,
+                }
+                for e in self._entries.values()
+            },
+        }
+
+
+model_registry = ModelRegistry()
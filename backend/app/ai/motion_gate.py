@@ -0,0 +1,84 @@
+import threading
+
+import cv2
+
+from ai.frame_prep import as_prepared
+from config import MOTION_THRESHOLD, MOTION_FORCE_EVERY
+
+
+class MotionGate:
+    """
+    Cheap per-student change detector run before the heavy models.
+
+    Compares a downscaled grayscale copy of the frame with the one from the
+    last full detector run. Small change = reuse the previous outputs.
+    """
+
+    def __init__(self, threshold=MOTION_THRESHOLD, force_every=MOTION_FORCE_EVERY):
+        self.threshold = threshold
+        self.force_every = max(1, int(force_every))
+
+        self.reference = None
+        self.reused_in_a_row = 0
+        self.last_change = None
+
+    def should_reuse(self, frame, force=False):
+        """
+        force: a full run is required for this frame (it still becomes the
+        new reference).
+        """
+
+        # Thumbnail comes from the prepared frame (built once per frame)
+        small = as_prepared(frame).gray_small
+
+        reuse = False
+        if (not force and self.reference is not None
+                and self.reused_in_a_row + 1 < self.force_every):
+            self.last_change = float(cv2.absdiff(small, self.reference).mean())
+            reuse = self.last_change < self.threshold
+
+        if reuse:
+            self.reused_in_a_row += 1
+        else:
+            # Full run: this frame becomes the new reference
+            self.reference = small
+            self.reused_in_a_row = 0
+
+        return reuse
+
+
+class FrameSkipStats:
+    """
+    Process-wide skip rate and estimated compute saved by the gate.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.reused = 0
+        self.full_runs = 0
+        self.full_run_ms = 0.0
+
+    def record(self, reused, elapsed_ms):
+        with self._lock:
+            self.frames += 1
+            if reused:
+                self.reused += 1
+            else:
+                self.full_runs += 1
+                self.full_run_ms += elapsed_ms
+
+    def snapshot(self):
+        with self._lock:
+            avg_full_ms = self.full_run_ms / self.full_runs if self.full_runs else 0.0
+            return {
+                "frames": self.frames,
+                "reused": self.reused,
+                "full_runs": self.full_runs,
+                "skip_rate": self.reused / self.frames if self.frames else 0.0,
+                "avg_full_run_ms": avg_full_ms,
+                "estimated_saved_ms": self.reused * avg_full_ms,
+            }
+
+
+skip_stats = FrameSkipStats()
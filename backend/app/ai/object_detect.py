@@ -1,49 +1,154 @@
-from ultralytics import YOLO
+from concurrent.futures import TimeoutError as FutureTimeout
 
-# 🔥 Lightweight & fast
-model = YOLO("yolov8n.pt")
+import numpy as np
 
-# ===== Temporal stability =====
-_detect_count = 0
-_last_position = None
+from ai.batching import BatchScheduler
+from ai.detector_backends import create_backend
+from ai.frame_prep import as_prepared
+from ai.model_registry import model_registry
+from config import (
+    YOLO_BATCH_SIZE,
+    YOLO_BATCH_WAIT_MS,
+    YOLO_BATCH_TIMEOUT_S,
+    PHONE_BACKEND,
+    PHONE_MODEL_PATH,
+    PHONE_INPUT_SIZE,
+    ONNX_THREADS,
+    ONNX_PROVIDERS,
+)
 
 REQUIRED_FRAMES = 3        # phone must appear in 3 frames
 CONF_THRESHOLD = 0.5
 
 
-def detect_mobile_with_position(frame):
+# 🔥 Lightweight & fast (PyTorch YOLOv8n by default, ONNX Runtime optional).
+# Built on first use / during warmup, not at import.
+def _load_backend():
+    return create_backend(
+        PHONE_BACKEND,
+        PHONE_MODEL_PATH,
+        input_size=PHONE_INPUT_SIZE,
+        threads=ONNX_THREADS,
+        providers=ONNX_PROVIDERS
+    )
+
+
+def _warm_backend(backend):
+    dummy = np.zeros((PHONE_INPUT_SIZE, PHONE_INPUT_SIZE, 3), dtype=np.uint8)
+    backend.detect([dummy], CONF_THRESHOLD)
+
+
+model_registry.register("phone_detector", _load_backend, _warm_backend)
+
+
+class PhoneTracker:
+    """
+    Per-student temporal stability: phone must be seen in
+    REQUIRED_FRAMES consecutive frames.
     """
+
+    def __init__(self):
+        self.detect_count = 0
+        self.last_position = None
+
+    def update(self, detected, center):
+        if detected:
+            self.detect_count += 1
+            self.last_position = center
+        else:
+            self.detect_count = 0
+            self.last_position = None
+
+        return self.current()
+
+    def current(self):
+        # Stable output without a new observation (detector was skipped)
+        if self.detect_count >= REQUIRED_FRAMES:
+            return True, self.last_position
+
+        return False, None
+
+
+# Fallback when the caller has no per-student session
+_default_tracker = PhoneTracker()
+
+
+def detect_phones_batch(frames):
+    """
+    Run the phone detector once over a list of frames.
+
     Returns:
-        phone_detected (bool)
-        phone_center (x, y) or None
+        list of (phone_detected, phone_center) per frame (no smoothing)
     """
 
-    global _detect_count, _last_position
+    backend = model_registry.get("phone_detector")
 
-    results = model(frame, verbose=False)
+    out = []
+    for boxes in backend.detect(frames, CONF_THRESHOLD):
+        if not boxes:
+            out.append((False, None))
+            continue
 
-    detected = False
-    center = None
+        x1, y1, x2, y2 = boxes[0][1]
+        out.append((True, ((x1 + x2) // 2, (y1 + y2) // 2)))
 
-    for r in results:
-        for box in r.boxes:
-            cls = int(box.cls[0])
-            conf = float(box.conf[0])
+    return out
 
-            if model.names[cls] == "cell phone" and conf >= CONF_THRESHOLD:
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                center = ((x1 + x2) // 2, (y1 + y2) // 2)
-                detected = True
-                break
 
-    if detected:
-        _detect_count += 1
-        _last_position = center
+# ===== Cross-request micro-batching =====
+scheduler = None
+if YOLO_BATCH_SIZE > 1:
+    scheduler = BatchScheduler(
+        detect_phones_batch,
+        max_batch_size=YOLO_BATCH_SIZE,
+        max_wait_ms=YOLO_BATCH_WAIT_MS,
+        name="yolo"
+    )
+
+
+def disable_batching():
+    """
+    Bypass the scheduler (e.g. inside a worker process that serves one
+    frame at a time, where the batch window would only add latency).
+    """
+
+    global scheduler
+    scheduler = None
+
+
+def detect_mobile_with_position(frame, tracker=None, roi=None):
+    """
+    frame: PreparedFrame or BGR ndarray (YOLO runs on the working image)
+    roi: optional (x1, y1, x2, y2) region to search instead of the full
+         frame; roi and the returned center are in pixels of the frame as
+         received.
+
+    Returns:
+        phone_detected (bool)
+        phone_center (x, y) or None
+    """
+
+    if tracker is None:
+        tracker = _default_tracker
+
+    prepared = as_prepared(frame)
+    image = prepared.bgr
+    offset = (0, 0)
+    if roi is not None:
+        x1, y1, x2, y2 = prepared.to_working(roi)
+        image = image[y1:y2, x1:x2]
+        offset = (x1, y1)
+
+    if scheduler is not None:
+        try:
+            detected, center = scheduler.run(image, timeout=YOLO_BATCH_TIMEOUT_S)
+        except FutureTimeout:
+            # Stuck batch: keep the last stable result instead of hanging
+            return tracker.current()
     else:
-        _detect_count = 0
-        _last_position = None
+        detected, center = detect_phones_batch([image])[0]
 
-    if _detect_count >= REQUIRED_FRAMES:
-        return True, _last_position
+    if detected:
+        center = prepared.to_reference((center[0] + offset[0], center[1] + offset[1]))
 
-    return False, None
+    return tracker.update(detected, center)
@@ -0,0 +1,174 @@
+import time
+from contextlib import contextmanager
+
+from ai.cascade import cascade_policy
+from ai.frame_prep import as_prepared
+from ai.landmarks import detect_face_landmarks
+from ai.face_detect import count_faces, detect_face
+from ai.eye_detect import detect_eye_behavior, eye_behavior_from_landmarks
+from ai.head_pose import get_head_direction, head_direction_from_landmarks
+from ai.object_detect import detect_mobile_with_position
+from ai.hand_detect import detect_hand_and_position, hand_position_from_landmarks
+from config import MOTION_GATE_ENABLED, LANDMARK_VERIFY_EVERY
+
+
+class StageTimer:
+    """
+    Wall time (ms) per pipeline stage for one frame.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+
+    def elapsed(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+
+class _NullTimer:
+    @contextmanager
+    def stage(self, name):
+        yield
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def run_detectors(frame, session, timer=None):
+    """
+    Run the full detector chain on one frame for one student.
+    frame: PreparedFrame (decoded once, views shared by every detector) or
+    a BGR ndarray. Pass a StageTimer to get the per-stage breakdown.
+
+    Returns:
+        dict of detector outputs (no scoring); "reused" is True when the
+        motion gate skipped the models and returned the previous outputs
+    """
+
+    timer = timer or _NULL_TIMER
+    frame = as_prepared(frame)
+
+    # After landmark-only uploads this frame was asked for (phone check /
+    # verification): never answer it from the motion gate
+    requested = session.frames_since_image > 0
+    session.frames_since_image = 0
+
+    # ================= MOTION GATE =================
+    if MOTION_GATE_ENABLED:
+        with timer.stage("motion_gate"):
+            reuse = session.motion_gate.should_reuse(frame, requested)
+        if reuse and session.last_detections is not None:
+            return dict(session.last_detections, reused=True)
+
+    # Single FaceMesh pass shared by face / head / eye detectors
+    with timer.stage("face_mesh"):
+        faces = detect_face_landmarks(frame)
+
+    with timer.stage("face"):
+        face_present, face_count = detect_face(frame, faces)
+    with timer.stage("head_pose"):
+        head_dir = get_head_direction(frame, faces, session.head_smoother)
+    with timer.stage("hands"):
+        hand_detected, hand_pos = detect_hand_and_position(frame)
+    with timer.stage("eyes"):
+        eye_dir, eyes_closed = detect_eye_behavior(frame, faces)
+
+    # ================= PHONE (CASCADED) =================
+    # Cheap signals first; YOLO only when they (or the budget) call for it
+    phone_trigger = cascade_policy.trigger(session, hand_detected, head_dir)
+
+    if phone_trigger is not None:
+        with timer.stage("phone"):
+            phone_detected, phone_pos = detect_mobile_with_position(
+                frame,
+                session.phone_tracker,
+                roi=cascade_policy.region(frame, phone_trigger, hand_pos)
+            )
+        session.frames_since_phone = 0
+    else:
+        # Skipped: keep the cached stable result, streak untouched
+        phone_detected, phone_pos = session.phone_tracker.current()
+        session.frames_since_phone += 1
+
+    session.last_detections = {
+        "face_present": face_present,
+        "face_count": face_count,
+        "head_direction": head_dir,
+        "phone_detected": phone_detected,
+        "phone_position": phone_pos,
+        "hand_detected": hand_detected,
+        "hand_position": hand_pos,
+        "eye_direction": eye_dir,
+        "eyes_closed": eyes_closed,
+        "phone_trigger": phone_trigger,
+        "reused": False,
+    }
+
+    return session.last_detections
+
+
+def run_landmark_detectors(faces, hands, frame_width, frame_height, session, timer=None):
+    """
+    Same outputs as run_detectors(), from landmarks computed by the client
+    (MediaPipe in the browser) instead of a frame: only the geometry runs
+    here, with the same functions as the server-side path.
+
+    faces: float32 (num_faces, N, 2) in pixels; hands: (num_hands, 21, 2)
+    normalized.
+
+    Returns:
+        detections dict plus "frame_request": why the next upload should be
+        a full frame (phone check / periodic verification), or None
+    """
+
+    timer = timer or _NULL_TIMER
+
+    with timer.stage("face"):
+        face_present, face_count = count_faces(faces)
+    with timer.stage("head_pose"):
+        head_dir = head_direction_from_landmarks(faces, session.head_smoother)
+    with timer.stage("hands"):
+        hand_detected, hand_pos = hand_position_from_landmarks(hands, frame_width, frame_height)
+    with timer.stage("eyes"):
+        eye_dir, eyes_closed = eye_behavior_from_landmarks(faces, frame_width)
+
+    # The phone detector needs pixels: when the cascade would run it, keep
+    # the last stable result and ask the client for a frame instead
+    phone_trigger = cascade_policy.trigger(session, hand_detected, head_dir)
+    if phone_trigger == "always":
+        phone_trigger = None    # cascade off: periodic verification only
+    phone_detected, phone_pos = session.phone_tracker.current()
+    if phone_trigger is None:
+        session.frames_since_phone += 1
+
+    session.frames_since_image += 1
+
+    frame_request = None
+    if phone_trigger is not None:
+        frame_request = "phone_check"
+    elif session.frames_since_image >= LANDMARK_VERIFY_EVERY:
+        frame_request = "verify"
+
+    return {
+        "face_present": face_present,
+        "face_count": face_count,
+        "head_direction": head_dir,
+        "phone_detected": phone_detected,
+        "phone_position": phone_pos,
+        "hand_detected": hand_detected,
+        "hand_position": hand_pos,
+        "eye_direction": eye_dir,
+        "eyes_closed": eyes_closed,
+        "phone_trigger": None,
+        "reused": False,
+        "frame_request": frame_request,
+    }
@@ -1,8 +1,20 @@
 import time
 
+# Browser telemetry events scored by add_instant_violation()
+INSTANT_PENALTIES = {
+    "tab_switch": 15,
+    "fullscreen_exit": 25,
+    "copy_paste": 30,
+    "right_click": 10,
+    "multiple_monitors": 35
+}
+
 
 class SuspicionScorer:
-    def __init__(self):
+    def __init__(self, clock=time.time):
+        # Injectable clock (seconds): tests, replays, client timestamps
+        self.clock = clock
+
         self.score = 0
 
         # ===== TIME TRACKERS =====
@@ -17,49 +29,81 @@ class SuspicionScorer:
         self.cooldown = 0.5  # seconds
 
         # ===== SCORE DECAY =====
-        self.last_activity_time = time.time()
+        self.last_activity_time = self.clock()
 
         # ===== LEARNING PHASE =====
         self.learning_phase = True
-        self.learn_start = time.time()
+        self.learn_start = self.clock()
 
         # ===== PATTERN DETECTION =====
         self.suspicious_patterns = 0
-        self.pattern_reset_time = time.time()
+        self.pattern_reset_time = self.clock()
 
     def reset(self):
-        self.__init__()
+        self.__init__(self.clock)
+
+    # ================= SERIALIZATION =================
+    # Compact positional record (shared state stores keep one per student)
+    _RECORD_FIELDS = (
+        "score",
+        "head_start",
+        "eye_start",
+        "phone_combo_start",
+        "no_face_start",
+        "multiple_face_start",
+        "last_penalty_time",
+        "cooldown",
+        "last_activity_time",
+        "learning_phase",
+        "learn_start",
+        "suspicious_patterns",
+        "pattern_reset_time",
+    )
+
+    def to_record(self):
+        return [getattr(self, name) for name in self._RECORD_FIELDS]
+
+    @classmethod
+    def from_record(cls, record, clock=time.time):
+        scorer = cls.__new__(cls)
+        scorer.clock = clock
+        for name, value in zip(cls._RECORD_FIELDS, record):
+            setattr(scorer, name, value)
+        return scorer
 
     # ================= LEARNING =================
     def learn_baseline(self):
         """
         Initial learning period to avoid false positives
         """
-        if time.time() - self.learn_start >= 3:
+        if self.clock() - self.learn_start >= 3:
             self.learning_phase = False
 
     # ================= INTERNAL HELPERS =================
-    def _can_penalize(self):
-        return time.time() - self.last_penalty_time >= self.cooldown
-
-    def _penalize(self, points):
-        if self._can_penalize():
+    def _can_penalize(self, now):
+        # abs(): a timestamped event may be older than the last penalty
+        return abs(now - self.last_penalty_time) >= self.cooldown
+
+    def _penalize(self, points, now=None):
+        if now is None:
+            now = self.clock()
+        if self._can_penalize(now):
             self.score += points
-            self.last_penalty_time = time.time()
-            self.last_activity_time = time.time()
+            self.last_penalty_time = max(self.last_penalty_time, now)
+            self.last_activity_time = max(self.last_activity_time, now)
             self.suspicious_patterns += 1
 
     def _decay_score(self):
         # Gradually reduce score if behavior becomes normal
-        if time.time() - self.last_activity_time >= 10:
+        if self.clock() - self.last_activity_time >= 10:
             self.score = max(self.score - 1, 0)
-            self.last_activity_time = time.time()
+            self.last_activity_time = self.clock()
 
     def _check_pattern_multiplier(self):
         # Reset pattern counter every 30 seconds
-        if time.time() - self.pattern_reset_time >= 30:
+        if self.clock() - self.pattern_reset_time >= 30:
             self.suspicious_patterns = 0
-            self.pattern_reset_time = time.time()
+            self.pattern_reset_time = self.clock()
 
         # Repeated suspicious behavior = higher penalty
         if self.suspicious_patterns >= 3:
@@ -76,16 +120,16 @@ class SuspicionScorer:
         # No face detected
         if not face_present:
             if not self.no_face_start:
-                self.no_face_start = time.time()
-            elif time.time() - self.no_face_start >= 1.5:
+                self.no_face_start = self.clock()
+            elif self.clock() - self.no_face_start >= 1.5:
                 self._penalize(int(25 * multiplier))
                 self.no_face_start = None
 
         # Multiple faces detected
         elif face_count > 1:
             if not self.multiple_face_start:
-                self.multiple_face_start = time.time()
-            elif time.time() - self.multiple_face_start >= 1:
+                self.multiple_face_start = self.clock()
+            elif self.clock() - self.multiple_face_start >= 1:
                 self._penalize(int(30 * multiplier))
                 self.multiple_face_start = None
 
@@ -103,8 +147,8 @@ class SuspicionScorer:
 
         if head_dir in ["left", "right", "down"]:
             if not self.head_start:
-                self.head_start = time.time()
-            elif time.time() - self.head_start >= 1.5:
+                self.head_start = self.clock()
+            elif self.clock() - self.head_start >= 1.5:
                 penalty = 15 if head_dir == "down" else 12
                 self._penalize(int(penalty * multiplier))
                 self.head_start = None
@@ -121,8 +165,8 @@ class SuspicionScorer:
 
         if eye_dir in ["left", "right"] or eyes_closed:
             if not self.eye_start:
-                self.eye_start = time.time()
-            elif time.time() - self.eye_start >= 2:
+                self.eye_start = self.clock()
+            elif self.clock() - self.eye_start >= 2:
                 penalty = 12 if eyes_closed else 8
                 self._penalize(int(penalty * multiplier))
                 self.eye_start = None
@@ -139,8 +183,8 @@ class SuspicionScorer:
 
         if phone_detected and head_dir in ["down", "left", "right"]:
             if not self.phone_combo_start:
-                self.phone_combo_start = time.time()
-            elif time.time() - self.phone_combo_start >= 0.5:
+                self.phone_combo_start = self.clock()
+            elif self.clock() - self.phone_combo_start >= 0.5:
                 self._penalize(int(50 * multiplier))
                 self.phone_combo_start = None
 
@@ -152,17 +196,14 @@ class SuspicionScorer:
             self._decay_score()
 
     # ================= INSTANT VIOLATIONS =================
-    def add_instant_violation(self, violation_type):
-        penalties = {
-            "tab_switch": 15,
-            "fullscreen_exit": 25,
-            "copy_paste": 30,
-            "right_click": 10,
-            "multiple_monitors": 35
-        }
+    def add_instant_violation(self, violation_type, at=None):
+        """
+        at: when it happened, in scorer clock seconds (default: now).
+        Events closer than the cooldown to another penalty are not counted.
+        """
 
-        if violation_type in penalties:
-            self._penalize(penalties[violation_type])
+        if violation_type in INSTANT_PENALTIES:
+            self._penalize(INSTANT_PENALTIES[violation_type], at)
 
     # ================= STATUS =================
     def get_status(self):
@@ -0,0 +1,343 @@
+import threading
+import time
+
+import numpy as np
+
+from ai.scoring import INSTANT_PENALTIES
+
+# Same thresholds as SuspicionScorer
+COOLDOWN = 0.5
+DECAY_AFTER = 10
+PATTERN_WINDOW = 30
+LEARNING_SECONDS = 3
+
+STATUS_NAMES = np.array(["NORMAL", "SUSPICIOUS", "CHEATING"])
+
+
+class ScorerBank:
+    """
+    Columnar SuspicionScorer for many concurrent sessions.
+
+    Every timer, score and pattern counter is one slot in a NumPy array
+    (~90 bytes per student instead of a Python object), the clock is read
+    once per update and injectable, and dashboard aggregation is a single
+    array operation. The per-student rules are the same as
+    SuspicionScorer.update_face_status / update_head_pose /
+    update_eye_behavior / update_hand_phone_head_combo.
+
+    Timers that SuspicionScorer keeps as None are NaN here.
+    """
+
+    _FLOAT_FIELDS = (
+        "head_start",
+        "eye_start",
+        "phone_combo_start",
+        "no_face_start",
+        "multiple_face_start",
+        "last_penalty_time",
+        "last_activity_time",
+        "learn_start",
+        "pattern_reset_time",
+        "touched",            # last update (store bookkeeping, not a rule)
+    )
+
+    def __init__(self, capacity=1024, clock=time.time):
+        self.clock = clock
+        self.lock = threading.Lock()
+
+        self._index = {}     # student_id -> row
+        self._ids = []       # row -> student_id (None = free)
+        self._free = []
+
+        self.capacity = 0
+        self.score = np.zeros(0, dtype=np.int32)
+        self.suspicious_patterns = np.zeros(0, dtype=np.int32)
+        self.learning_phase = np.zeros(0, dtype=bool)
+        self.active = np.zeros(0, dtype=bool)
+        for name in self._FLOAT_FIELDS:
+            setattr(self, name, np.zeros(0, dtype=np.float64))
+
+        self._grow(max(1, int(capacity)))
+
+    # ================= STORAGE =================
+    def _grow(self, capacity):
+        extra = capacity - self.capacity
+
+        self.score = np.concatenate([self.score, np.zeros(extra, np.int32)])
+        self.suspicious_patterns = np.concatenate(
+            [self.suspicious_patterns, np.zeros(extra, np.int32)]
+        )
+        self.learning_phase = np.concatenate([self.learning_phase, np.zeros(extra, bool)])
+        self.active = np.concatenate([self.active, np.zeros(extra, bool)])
+        for name in self._FLOAT_FIELDS:
+            setattr(self, name, np.concatenate(
+                [getattr(self, name), np.full(extra, np.nan)]
+            ))
+
+        self._ids.extend([None] * extra)
+        self._free.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+
+    def _init_row(self, row, now):
+        self.score[row] = 0
+        self.head_start[row] = np.nan
+        self.eye_start[row] = np.nan
+        self.phone_combo_start[row] = np.nan
+        self.no_face_start[row] = np.nan
+        self.multiple_face_start[row] = np.nan
+        self.last_penalty_time[row] = 0.0
+        self.last_activity_time[row] = now
+        self.learning_phase[row] = True
+        self.learn_start[row] = now
+        self.suspicious_patterns[row] = 0
+        self.pattern_reset_time[row] = now
+        self.touched[row] = now
+
+    def row(self, student_id):
+        """
+        Row of a student (allocated on first use).
+        """
+
+        row = self._index.get(student_id)
+        if row is not None:
+            return row
+
+        if not self._free:
+            self._grow(self.capacity * 2)
+
+        row = self._free.pop()
+        self._index[student_id] = row
+        self._ids[row] = student_id
+        self.active[row] = True
+        self._init_row(row, self.clock())
+        return row
+
+    def has(self, student_id):
+        return student_id in self._index
+
+    def remove(self, student_id):
+        row = self._index.pop(student_id, None)
+        if row is None:
+            return False
+        self.active[row] = False
+        self._ids[row] = None
+        self._free.append(row)
+        return True
+
+    def reset(self, student_id):
+        self._init_row(self.row(student_id), self.clock())
+
+    def __len__(self):
+        return len(self._index)
+
+    # ================= INTERNAL HELPERS =================
+    def _penalize(self, row, points, now):
+        if abs(now - self.last_penalty_time[row]) >= COOLDOWN:
+            self.score[row] += points
+            self.last_penalty_time[row] = max(self.last_penalty_time[row], now)
+            self.last_activity_time[row] = max(self.last_activity_time[row], now)
+            self.suspicious_patterns[row] += 1
+
+    def _decay_score(self, row, now):
+        if now - self.last_activity_time[row] >= DECAY_AFTER:
+            self.score[row] = max(self.score[row] - 1, 0)
+            self.last_activity_time[row] = now
+
+    def _pattern_multiplier(self, row, now):
+        if now - self.pattern_reset_time[row] >= PATTERN_WINDOW:
+            self.suspicious_patterns[row] = 0
+            self.pattern_reset_time[row] = now
+        self.touched[row] = now
+
+        return 2.0 if self.suspicious_patterns[row] >= 3 else 1.0
+
+    def _timer(self, timers, row, now, duration):
+        """
+        SuspicionScorer's start-or-expire pattern.
+
+        Returns:
+            True when the timer has run for `duration` (and is cleared)
+        """
+
+        if np.isnan(timers[row]):
+            timers[row] = now
+            return False
+        if now - timers[row] >= duration:
+            timers[row] = np.nan
+            return True
+        return False
+
+    # ================= RULES (per student) =================
+    def learn_baseline(self, row):
+        if self.clock() - self.learn_start[row] >= LEARNING_SECONDS:
+            self.learning_phase[row] = False
+
+    def update_face_status(self, row, face_present, face_count=1):
+        if self.learning_phase[row]:
+            return
+        now = self.clock()
+        multiplier = self._pattern_multiplier(row, now)
+
+        if not face_present:
+            if self._timer(self.no_face_start, row, now, 1.5):
+                self._penalize(row, int(25 * multiplier), now)
+        elif face_count > 1:
+            if self._timer(self.multiple_face_start, row, now, 1):
+                self._penalize(row, int(30 * multiplier), now)
+        else:
+            self.no_face_start[row] = np.nan
+            self.multiple_face_start[row] = np.nan
+            self._decay_score(row, now)
+
+    def update_head_pose(self, row, head_dir):
+        if self.learning_phase[row]:
+            return
+        now = self.clock()
+        multiplier = self._pattern_multiplier(row, now)
+
+        if head_dir in ["left", "right", "down"]:
+            if self._timer(self.head_start, row, now, 1.5):
+                penalty = 15 if head_dir == "down" else 12
+                self._penalize(row, int(penalty * multiplier), now)
+        else:
+            self.head_start[row] = np.nan
+            self._decay_score(row, now)
+
+    def update_eye_behavior(self, row, eye_dir, eyes_closed):
+        if self.learning_phase[row]:
+            return
+        now = self.clock()
+        multiplier = self._pattern_multiplier(row, now)
+
+        if eye_dir in ["left", "right"] or eyes_closed:
+            if self._timer(self.eye_start, row, now, 2):
+                penalty = 12 if eyes_closed else 8
+                self._penalize(row, int(penalty * multiplier), now)
+        else:
+            self.eye_start[row] = np.nan
+            self._decay_score(row, now)
+
+    def update_hand_phone_head_combo(self, row, hand_detected, phone_detected, head_dir):
+        if self.learning_phase[row]:
+            return
+        now = self.clock()
+        multiplier = self._pattern_multiplier(row, now)
+
+        if phone_detected and head_dir in ["down", "left", "right"]:
+            if self._timer(self.phone_combo_start, row, now, 0.5):
+                self._penalize(row, int(50 * multiplier), now)
+        elif phone_detected:
+            self._penalize(row, int(20 * multiplier), now)
+        else:
+            self.phone_combo_start[row] = np.nan
+            self._decay_score(row, now)
+
+    def add_instant_violation(self, row, violation_type, at=None):
+        if violation_type in INSTANT_PENALTIES:
+            self._penalize(
+                row, INSTANT_PENALTIES[violation_type], self.clock() if at is None else at
+            )
+
+    def get_status(self, row):
+        return str(STATUS_NAMES[self._status_codes(self.score[row])])
+
+    def get_detailed_status(self, row):
+        score = int(self.score[row])
+        return {
+            "score": score,
+            "status": self.get_status(row),
+            "learning_phase": bool(self.learning_phase[row]),
+            "suspicious_patterns": int(self.suspicious_patterns[row]),
+            "risk_level": (
+                "HIGH" if score >= 25
+                else "MEDIUM" if score >= 10
+                else "LOW"
+            )
+        }
+
+    # ================= VECTORIZED (all students) =================
+    @staticmethod
+    def _status_codes(scores):
+        # 0 NORMAL (<15), 1 SUSPICIOUS (>=15), 2 CHEATING (>=35)
+        return (scores >= 15).astype(np.int8) + (scores >= 35)
+
+    def learn_baseline_all(self):
+        now = self.clock()
+        done = self.active & (now - self.learn_start >= LEARNING_SECONDS)
+        self.learning_phase[done] = False
+
+    def decay_sweep(self):
+        """
+        One vectorized pass of the idle-decay rule over every student
+        (the same rule the update methods apply per student).
+        """
+
+        now = self.clock()
+        due = self.active & (now - self.last_activity_time >= DECAY_AFTER)
+        self.score[due] = np.maximum(self.score[due] - 1, 0)
+        self.last_activity_time[due] = now
+
+    def snapshot(self):
+        """
+        Returns:
+            list of (student_id, score, status) for every live student
+        """
+
+        rows = np.flatnonzero(self.active)
+        statuses = STATUS_NAMES[self._status_codes(self.score[rows])]
+        return [
+            (self._ids[r], int(score), str(status))
+            for r, score, status in zip(rows, self.score[rows], statuses)
+        ]
+
+    def status_counts(self):
+        codes = self._status_codes(self.score[self.active])
+        counts = np.bincount(codes, minlength=3)
+        return dict(zip(STATUS_NAMES.tolist(), counts.tolist()))
+
+
+class BankScorer:
+    """
+    SuspicionScorer-compatible view of one ScorerBank row, so code written
+    against SuspicionScorer (routes, stores) works unchanged.
+    """
+
+    __slots__ = ("bank", "row")
+
+    def __init__(self, bank, row):
+        self.bank = bank
+        self.row = row
+
+    @property
+    def score(self):
+        return int(self.bank.score[self.row])
+
+    @score.setter
+    def score(self, value):
+        self.bank.score[self.row] = value
+
+    def learn_baseline(self):
+        self.bank.learn_baseline(self.row)
+
+    def update_face_status(self, face_present, face_count=1):
+        self.bank.update_face_status(self.row, face_present, face_count)
+
+    def update_head_pose(self, head_dir):
+        self.bank.update_head_pose(self.row, head_dir)
+
+    def update_eye_behavior(self, eye_dir, eyes_closed):
+        self.bank.update_eye_behavior(self.row, eye_dir, eyes_closed)
+
+    def update_hand_phone_head_combo(self, hand_detected, phone_detected, head_dir):
+        self.bank.update_hand_phone_head_combo(
+            self.row, hand_detected, phone_detected, head_dir
+        )
+
+    def add_instant_violation(self, violation_type, at=None):
+        self.bank.add_instant_violation(self.row, violation_type, at)
+
+    def get_status(self):
+        return self.bank.get_status(self.row)
+
+    def get_detailed_status(self):
+        return self.bank.get_detailed_status(self.row)
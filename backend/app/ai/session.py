@@ -0,0 +1,37 @@
+from ai.head_pose import HeadDirectionSmoother
+from ai.motion_gate import MotionGate
+from ai.object_detect import PhoneTracker
+
+
+class DetectorSession:
+    """
+    Per-student detector state.
+
+    Owns the temporal filters that used to be module globals. Callers
+    serialise access per student (see sessions.StudentSession.lock).
+    """
+
+    def __init__(self, student_id):
+        self.student_id = student_id
+
+        # ===== TEMPORAL FILTERS =====
+        self.phone_tracker = PhoneTracker()
+        self.head_smoother = HeadDirectionSmoother()
+
+        # ===== FRAME SKIPPING =====
+        self.motion_gate = MotionGate()
+        self.last_detections = None
+
+        # ===== PHONE CASCADE =====
+        self.frames_since_phone = 0
+
+        # ===== CLIENT LANDMARK MODE =====
+        self.frames_since_image = 0
+
+    def reset(self):
+        self.phone_tracker = PhoneTracker()
+        self.head_smoother = HeadDirectionSmoother()
+        self.motion_gate = MotionGate()
+        self.last_detections = None
+        self.frames_since_phone = 0
+        self.frames_since_image = 0
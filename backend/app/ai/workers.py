@@ -0,0 +1,303 @@
+import atexit
+import multiprocessing
+import threading
+import zlib
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ai.frame_prep import as_prepared
+from ai.model_registry import model_registry
+from config import (
+    INFERENCE_WORKERS,
+    INFERENCE_SHM_SLOT_BYTES,
+    INFERENCE_TIMEOUT_S,
+    MODEL_WARMUP_TIMEOUT_S,
+)
+
+
+# ================= WORKER PROCESS =================
+def _worker_main(conn, shm_name, slot_bytes):
+    """
+    Loads the models once, then serves frames and landmark uploads for the
+    students pinned to this worker. Detector sessions live here, not in the
+    web process.
+    """
+
+    from ai.frame_prep import PreparedFrame
+    from ai.object_detect import disable_batching
+    from ai.pipeline import StageTimer, run_detectors, run_landmark_detectors
+    from ai.session import DetectorSession
+
+    disable_batching()
+
+    # Models are ready before the first frame is accepted
+    if model_registry.mode != "lazy":
+        model_registry.warm_all(
+            [name for name in model_registry.names() if name != POOL_MODEL]
+        )
+
+    # Attach only: the parent owns (and unlinks) the segment
+    shm = shared_memory.SharedMemory(name=shm_name)
+
+    sessions = {}
+
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            break
+
+        kind = msg[0]
+
+        if kind == "stop":
+            break
+
+        if kind == "reset":
+            sessions.pop(msg[1], None)
+            conn.send(("ok", None))
+            continue
+
+        if kind == "ping":
+            conn.send(("ok", model_registry.stats()))
+            continue
+
+        student_id = msg[1]
+        try:
+            session = sessions.get(student_id)
+            if session is None:
+                session = sessions[student_id] = DetectorSession(student_id)
+
+            # Stage timings travel back with the result for /metrics
+            timer = StageTimer()
+
+            if kind == "landmarks":
+                # ("landmarks", student_id, faces, hands, (width, height)):
+                # same session as the frames, so the phone tracker, head
+                # smoother and cascade counters see both kinds of upload
+                _, _, faces, hands, size = msg
+                det = run_landmark_detectors(faces, hands, *size, session, timer)
+            else:
+                # ("frame", student_id, shape, inline_frame_or_None, (width, height))
+                _, _, shape, inline, size = msg
+                if inline is None:
+                    bgr = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf).copy()
+                else:
+                    bgr = inline
+                # Working image + the size the client sent: outputs stay in
+                # the client's pixels, as in the web process
+                frame = PreparedFrame(bgr, *size)
+                det = run_detectors(frame, session, timer)
+
+            conn.send(("ok", dict(det, stages=timer.stages)))
+        except Exception as e:
+            conn.send(("error", repr(e)))
+
+    shm.close()
+
+
+# ================= PARENT-SIDE HANDLE =================
+class _WorkerHandle:
+    def __init__(self, ctx, index, slot_bytes):
+        self.ctx = ctx
+        self.index = index
+        self.slot_bytes = slot_bytes
+        self.lock = threading.Lock()
+        self.frames = 0
+        self.inline_frames = 0
+        self.landmark_uploads = 0
+        self.restarts = 0
+        self.models = None
+
+        self.shm = shared_memory.SharedMemory(create=True, size=slot_bytes)
+        self._start()
+
+    def _start(self):
+        self.conn, child_conn = self.ctx.Pipe()
+        self.process = self.ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.shm.name, self.slot_bytes),
+            name=f"inference-worker-{self.index}",
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def _restart(self):
+        self.restarts += 1
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+        self._start()
+
+    def _call(self, msg, timeout):
+        try:
+            self.conn.send(msg)
+            if not self.conn.poll(timeout):
+                raise TimeoutError(f"inference worker {self.index} timed out")
+            status, payload = self.conn.recv()
+        except (EOFError, OSError, TimeoutError):
+            # Worker died or hung: replace it (its sessions are lost)
+            self._restart()
+            raise RuntimeError(f"inference worker {self.index} restarted")
+
+        if status == "error":
+            raise RuntimeError(payload)
+        return payload
+
+    def run(self, student_id, frame, timeout):
+        prepared = as_prepared(frame)
+        size = (prepared.width, prepared.height)
+        frame = np.ascontiguousarray(prepared.bgr, dtype=np.uint8)
+
+        with self.lock:
+            self.frames += 1
+            if frame.nbytes <= self.slot_bytes:
+                slot = np.ndarray(frame.shape, dtype=np.uint8, buffer=self.shm.buf)
+                slot[...] = frame
+                msg = ("frame", student_id, frame.shape, None, size)
+            else:
+                self.inline_frames += 1
+                msg = ("frame", student_id, frame.shape, frame, size)
+
+            return self._call(msg, timeout)
+
+    def run_landmarks(self, student_id, faces, hands, size, timeout):
+        # A few hundred floats: small enough to pickle
+        with self.lock:
+            self.landmark_uploads += 1
+            return self._call(("landmarks", student_id, faces, hands, size), timeout)
+
+    def reset(self, student_id, timeout):
+        with self.lock:
+            return self._call(("reset", student_id), timeout)
+
+    def ping(self, timeout):
+        # Answered once the worker has loaded its models
+        with self.lock:
+            self.models = self._call(("ping",), timeout)
+            return self.models
+
+    def close(self):
+        with self.lock:
+            try:
+                self.conn.send(("stop",))
+            except OSError:
+                pass
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.kill()
+            self.conn.close()
+            self.shm.close()
+            self.shm.unlink()
+
+
+class InferencePool:
+    """
+    Fixed set of inference worker processes.
+
+    Frames are handed over through one shared-memory slot per worker (no
+    ndarray pickling), and each student always maps to the same worker so
+    their detector session stays valid.
+    """
+
+    def __init__(self, num_workers, slot_bytes=INFERENCE_SHM_SLOT_BYTES,
+                 timeout=INFERENCE_TIMEOUT_S):
+        # spawn: never fork a process that already holds model threads
+        ctx = multiprocessing.get_context("spawn")
+        self.timeout = timeout
+        self.workers = [
+            _WorkerHandle(ctx, i, slot_bytes) for i in range(num_workers)
+        ]
+
+    def worker_for(self, student_id):
+        key = zlib.crc32(str(student_id).encode("utf-8"))
+        return self.workers[key % len(self.workers)]
+
+    def run(self, student_id, frame):
+        return self.worker_for(student_id).run(student_id, frame, self.timeout)
+
+    def run_landmarks(self, student_id, faces, hands, width, height):
+        return self.worker_for(student_id).run_landmarks(
+            student_id, faces, hands, (width, height), self.timeout
+        )
+
+    def reset_session(self, student_id):
+        return self.worker_for(student_id).reset(student_id, self.timeout)
+
+    def warmup(self, timeout=MODEL_WARMUP_TIMEOUT_S):
+        """
+        Block until every worker has loaded + primed its models.
+        """
+
+        for w in self.workers:
+            w.ping(timeout)
+
+    def stats(self):
+        return [
+            {
+                "worker": w.index,
+                "pid": w.process.pid,
+                "alive": w.process.is_alive(),
+                "frames": w.frames,
+                "inline_frames": w.inline_frames,
+                "landmark_uploads": w.landmark_uploads,
+                "restarts": w.restarts,
+                "models": w.models,
+            }
+            for w in self.workers
+        ]
+
+    def close(self):
+        for w in self.workers:
+            w.close()
+
+
+# ================= SHARED INSTANCE =================
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_inference_pool():
+    """
+    Returns the process pool, or None when PROCTOR_INFERENCE_WORKERS is 0.
+    Created on first use so importing this module never spawns processes.
+    """
+
+    global _pool
+
+    if INFERENCE_WORKERS <= 0:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = InferencePool(INFERENCE_WORKERS)
+            atexit.register(_pool.close)
+        return _pool
+
+
+# In worker mode the web process only needs the pool to be warm
+POOL_MODEL = "inference_workers"
+
+# Only the web process owns the pool (a worker spawning workers would recurse).
+# The process name, unlike parent_process(), is already set while a spawned
+# worker re-imports the parent's __main__.
+_OWNS_POOL = INFERENCE_WORKERS > 0 and multiprocessing.current_process().name == "MainProcess"
+
+if _OWNS_POOL:
+    model_registry.register(POOL_MODEL, get_inference_pool, InferencePool.warmup)
+
+
+def warmup_targets():
+    """
+    Models the web process should warm at startup (None = all of them).
+    Inside an inference worker there is nothing to warm here: the worker
+    warms its own models in _worker_main.
+    """
+
+    if INFERENCE_WORKERS <= 0:
+        return None
+    return [POOL_MODEL] if _OWNS_POOL else []
@@ -0,0 +1,205 @@
+import os
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+# ================= YOLO MICRO-BATCHING =================
+# Frames from concurrent /analyze requests are grouped into one YOLO call.
+# Batch size 1 disables the scheduler (direct call per request).
+YOLO_BATCH_SIZE = _env_int("PROCTOR_YOLO_BATCH_SIZE", 8)
+YOLO_BATCH_WAIT_MS = _env_float("PROCTOR_YOLO_BATCH_WAIT_MS", 15.0)
+# Longest a request waits for its batch; then the phone result is the last
+# stable one for that frame
+YOLO_BATCH_TIMEOUT_S = _env_float("PROCTOR_YOLO_BATCH_TIMEOUT_S", 10.0)
+
+# ================= INFERENCE GRAPHS =================
+# Max MediaPipe graphs of each kind (FaceMesh / Hands) that may run at once.
+GRAPH_POOL_SIZE = _env_int("PROCTOR_GRAPH_POOL_SIZE", os.cpu_count() or 2)
+
+# ================= INFERENCE WORKER PROCESSES =================
+# 0 = run detectors inside the request thread (default).
+# N > 0 = N worker processes, each with its own models; students are pinned
+# to a worker so their tracking state stays in one place.
+INFERENCE_WORKERS = _env_int("PROCTOR_INFERENCE_WORKERS", 0)
+# Shared-memory slot per worker; larger frames fall back to pickling.
+INFERENCE_SHM_SLOT_BYTES = _env_int("PROCTOR_INFERENCE_SHM_SLOT_BYTES", 1920 * 1080 * 3)
+INFERENCE_TIMEOUT_S = _env_float("PROCTOR_INFERENCE_TIMEOUT_S", 30.0)
+
+# ================= ADMISSION CONTROL (/analyze overload) =================
+# Max frames running or waiting at once, all students together; further
+# uploads get 503 + Retry-After right away (0 = unlimited). Each student
+# has at most one frame waiting; a newer upload replaces it.
+ADMISSION_MAX_FRAMES = _env_int("PROCTOR_ADMISSION_MAX_FRAMES", 64)
+# A waiting frame older than this is stale: dropped instead of analysed
+ADMISSION_MAX_WAIT_S = _env_float("PROCTOR_ADMISSION_MAX_WAIT_S", 10.0)
+# Retry-After (seconds) sent with "busy" responses
+ADMISSION_RETRY_AFTER_S = _env_int("PROCTOR_ADMISSION_RETRY_AFTER_S", 2)
+
+# ================= MOTION GATE (frame skipping) =================
+# Reuse the previous detector outputs when the frame barely changed.
+MOTION_GATE_ENABLED = _env_int("PROCTOR_MOTION_GATE", 1) == 1
+# Mean absolute grey-level difference (0-255) on a 64x48 thumbnail
+MOTION_THRESHOLD = _env_float("PROCTOR_MOTION_THRESHOLD", 4.0)
+# Always run the full detector chain at least every N frames
+MOTION_FORCE_EVERY = _env_int("PROCTOR_MOTION_FORCE_EVERY", 5)
+
+# ================= PHONE DETECTOR CASCADE =================
+# "always"  = run YOLO on every analysed frame
+# "cascade" = run YOLO only when a hand is visible, the head is turned or
+#             down, a phone is already being tracked, or the budget expires
+PHONE_CASCADE_MODE = os.environ.get("PROCTOR_PHONE_CASCADE", "cascade")
+# Run YOLO at least once every N analysed frames regardless of triggers
+PHONE_CASCADE_BUDGET = _env_int("PROCTOR_PHONE_CASCADE_BUDGET", 5)
+# When only a hand triggered, search a square region around it (0 = off)
+PHONE_ROI_SIZE = _env_int("PROCTOR_PHONE_ROI_SIZE", 0)
+
+# ================= PHONE DETECTOR BACKEND =================
+# "torch" = ultralytics YOLO (.pt), "onnx" = ONNX Runtime (CPU / OpenVINO EP)
+PHONE_BACKEND = os.environ.get("PROCTOR_PHONE_BACKEND", "torch")
+PHONE_MODEL_PATH = os.environ.get(
+    "PROCTOR_PHONE_MODEL",
+    "yolov8n.onnx" if PHONE_BACKEND == "onnx" else "yolov8n.pt"
+)
+PHONE_INPUT_SIZE = _env_int("PROCTOR_PHONE_INPUT_SIZE", 640)
+# ONNX Runtime intra-op threads (0 = runtime default)
+ONNX_THREADS = _env_int("PROCTOR_ONNX_THREADS", 0)
+# Comma separated, in priority order, e.g. "OpenVINOExecutionProvider,CPUExecutionProvider"
+ONNX_PROVIDERS = os.environ.get("PROCTOR_ONNX_PROVIDERS", "CPUExecutionProvider").split(",")
+
+# ================= FRAME PREPARATION =================
+# Frames are decoded once per request. Large JPEGs are decoded at 1/2, 1/4
+# or 1/8 scale, as long as the longer side stays at or above this (0 = always
+# decode at full size). Detector outputs are still in the client's pixels.
+FRAME_WORK_MAX_SIDE = _env_int("PROCTOR_FRAME_WORK_MAX_SIDE", PHONE_INPUT_SIZE)
+# Longest side of the RGB copies fed to FaceMesh / Hands (0 = working size)
+FACE_INPUT_MAX_SIDE = _env_int("PROCTOR_FACE_INPUT_MAX_SIDE", 640)
+HANDS_INPUT_MAX_SIDE = _env_int("PROCTOR_HANDS_INPUT_MAX_SIDE", 640)
+
+# ================= STORAGE LOCATIONS =================
+# Relative SQLite URIs resolve inside app/instance (Flask-SQLAlchemy)
+DATABASE_URI = os.environ.get("PROCTOR_DATABASE_URI", "sqlite:///proctor.db")
+# Evidence images, thumbnails, clips, archive bundles and the event log
+EVIDENCE_DIR = os.environ.get("PROCTOR_EVIDENCE_DIR", os.path.join(os.getcwd(), "evidence"))
+
+# ================= EVIDENCE WRITER =================
+EVIDENCE_QUEUE_SIZE = _env_int("PROCTOR_EVIDENCE_QUEUE_SIZE", 256)
+# When the queue is full: "drop_oldest" | "drop_new" | "block"
+EVIDENCE_FULL_POLICY = os.environ.get("PROCTOR_EVIDENCE_FULL_POLICY", "drop_oldest")
+EVIDENCE_BLOCK_TIMEOUT_S = _env_float("PROCTOR_EVIDENCE_BLOCK_TIMEOUT_S", 0.5)
+# Log lines / DB rows are flushed every N items or every T seconds
+EVIDENCE_BATCH_SIZE = _env_int("PROCTOR_EVIDENCE_BATCH_SIZE", 50)
+EVIDENCE_FLUSH_INTERVAL_S = _env_float("PROCTOR_EVIDENCE_FLUSH_INTERVAL_S", 2.0)
+EVIDENCE_JPEG_QUALITY = _env_int("PROCTOR_EVIDENCE_JPEG_QUALITY", 90)
+
+# ================= DASHBOARD STREAM (SSE) =================
+# Minimum seconds between two pushed deltas (changes are coalesced)
+DASHBOARD_TICK_S = _env_float("PROCTOR_DASHBOARD_TICK_S", 1.0)
+DASHBOARD_KEEPALIVE_S = _env_float("PROCTOR_DASHBOARD_KEEPALIVE_S", 15.0)
+# Change-log length kept for reconnects; older clients get a full snapshot
+DASHBOARD_HISTORY = _env_int("PROCTOR_DASHBOARD_HISTORY", 10000)
+
+# ================= SESSION LIFECYCLE =================
+# Students silent for this long are closed, archived to the DB and freed
+SESSION_IDLE_TIMEOUT_S = _env_float("PROCTOR_SESSION_IDLE_TIMEOUT_S", 300.0)
+SESSION_SWEEP_INTERVAL_S = _env_float("PROCTOR_SESSION_SWEEP_INTERVAL_S", 30.0)
+
+# ================= SCORER STATE STORE =================
+# "memory" = scorers live in this process (single worker)
+# "columnar" = in-process NumPy ScorerBank (very large classes)
+# "sqlite" = shared SQLite (WAL) file, for several gunicorn workers
+#
+# Only scores (and /dashboard-data, which reads them from the store) are
+# shared. With several gunicorn workers everything else is still per worker:
+# - /dashboard-stream (SSE) only carries students this worker served; use
+#   /dashboard-data, or a single worker, for a complete live view
+# - admission caps (PROCTOR_ADMISSION_MAX_FRAMES) apply per worker, so the
+#   node admits up to workers x the cap
+# - sessions: counts and last results in /pipeline-stats, idle eviction,
+#   detector state (motion gate, phone / head smoothing) and clip buffers
+#   follow the worker a frame lands on; route each student to one worker
+#   (sticky by student_id) to keep temporal filters and clips intact
+# - /metrics, evidence dedup and the evidence writer are per worker
+# - evidence retention runs in every worker: enable it in one place only,
+#   or leave it off and run tools/compact_evidence.py from cron
+SCORER_STORE = os.environ.get("PROCTOR_SCORER_STORE", "memory")
+SCORER_STORE_PATH = os.environ.get(
+    "PROCTOR_SCORER_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "instance", "scorer_state.db")
+)
+
+# ================= METRICS / TRACING =================
+# Latency histogram bucket upper bounds (ms) for /metrics.
+METRICS_BUCKETS_MS = [
+    float(b) for b in os.environ.get(
+        "PROCTOR_METRICS_BUCKETS_MS", "1,2.5,5,10,25,50,100,250,500,1000,2500"
+    ).split(",")
+]
+# Request header that asks /analyze for a Server-Timing stage breakdown.
+TRACE_HEADER = os.environ.get("PROCTOR_TRACE_HEADER", "X-Proctor-Trace")
+
+# ================= MODEL LOADING =================
+# "background" = warm every model in a thread at startup (/ready turns 200)
+# "eager" = block create_app until warm, "lazy" = load on first request
+MODEL_WARMUP = os.environ.get("PROCTOR_MODEL_WARMUP", "background")
+# MediaPipe graphs of each kind created + primed during warmup
+MODEL_WARMUP_GRAPHS = _env_int("PROCTOR_MODEL_WARMUP_GRAPHS", 1)
+# Upper bound for a spawned inference worker to load its models
+MODEL_WARMUP_TIMEOUT_S = _env_float("PROCTOR_MODEL_WARMUP_TIMEOUT_S", 300.0)
+
+# ================= EVIDENCE CLIPS =================
+# Recent JPEG frames kept per student for evidence clips (0 = off). Clips
+# waiting for their post-trigger frames count against the same budget.
+FRAME_BUFFER_MAX_BYTES = _env_int("PROCTOR_FRAME_BUFFER_MAX_BYTES", 64 * 1024 * 1024)
+# Frames before / after the trigger (one frame every ~3 s from CameraBox)
+CLIP_PRE_FRAMES = _env_int("PROCTOR_CLIP_PRE_FRAMES", 10)
+CLIP_POST_FRAMES = _env_int("PROCTOR_CLIP_POST_FRAMES", 5)
+# A clip is written with fewer post frames if the student goes quiet
+CLIP_POST_TIMEOUT_S = _env_float("PROCTOR_CLIP_POST_TIMEOUT_S", 30.0)
+CLIP_MAX_PENDING = _env_int("PROCTOR_CLIP_MAX_PENDING", 64)
+
+# ================= EVIDENCE STORAGE =================
+# A new shot within this many seconds of a near-identical one of the same
+# student reuses that image instead of writing a new file (0 = off)
+EVIDENCE_DEDUP_WINDOW_S = _env_float("PROCTOR_EVIDENCE_DEDUP_WINDOW_S", 600.0)
+# "Near-identical": at most this many of the 64 dHash bits differ
+EVIDENCE_DEDUP_DISTANCE = _env_int("PROCTOR_EVIDENCE_DEDUP_DISTANCE", 6)
+# Thumbnails written next to each image for list views (0 = off)
+EVIDENCE_THUMB_SIZE = _env_int("PROCTOR_EVIDENCE_THUMB_SIZE", 160)
+EVIDENCE_THUMB_QUALITY = _env_int("PROCTOR_EVIDENCE_THUMB_QUALITY", 70)
+# Exams whose newest evidence is older than this are moved into one ZIP
+# bundle per exam (0 = keep everything in evidence/images)
+EVIDENCE_RETENTION_DAYS = _env_float("PROCTOR_EVIDENCE_RETENTION_DAYS", 0)
+EVIDENCE_RETENTION_INTERVAL_S = _env_float("PROCTOR_EVIDENCE_RETENTION_INTERVAL_S", 3600.0)
+# Archived images are re-encoded at this JPEG quality (0 = copy as is)
+EVIDENCE_ARCHIVE_JPEG_QUALITY = _env_int("PROCTOR_EVIDENCE_ARCHIVE_JPEG_QUALITY", 60)
+
+# ================= CLIENT LANDMARK MODE =================
+# Landmark-only uploads between full frames; after this many the server
+# asks for a frame to verify the client (and give YOLO a look).
+LANDMARK_VERIFY_EVERY = _env_int("PROCTOR_LANDMARK_VERIFY_EVERY", 20)
+
+# ================= SCORE TIME SERIES =================
+# Score / status points (events table) are buffered and bulk-inserted.
+SCORE_SERIES_BATCH_SIZE = _env_int("PROCTOR_SCORE_SERIES_BATCH_SIZE", 500)
+SCORE_SERIES_FLUSH_INTERVAL_S = _env_float("PROCTOR_SCORE_SERIES_FLUSH_INTERVAL_S", 2.0)
+SCORE_SERIES_MAX_BUFFER = _env_int("PROCTOR_SCORE_SERIES_MAX_BUFFER", 100000)
+# Unchanged score / status is still written this often
+SCORE_SERIES_HEARTBEAT_S = _env_float("PROCTOR_SCORE_SERIES_HEARTBEAT_S", 30.0)
+# Default number of buckets returned by /score-history
+SCORE_HISTORY_POINTS = _env_int("PROCTOR_SCORE_HISTORY_POINTS", 360)
+
+# ================= BROWSER TELEMETRY =================
+# Max events accepted in one /telemetry batch (or riding on one frame)
+TELEMETRY_MAX_EVENTS = _env_int("PROCTOR_TELEMETRY_MAX_EVENTS", 200)
+# Event times are clamped to [now - this, now] on the server clock
+TELEMETRY_MAX_AGE_S = _env_float("PROCTOR_TELEMETRY_MAX_AGE_S", 120.0)
+# Raw JPEG uploads carry their batch as JSON in this header
+TELEMETRY_HEADER = os.environ.get("PROCTOR_TELEMETRY_HEADER", "X-Proctor-Telemetry")
@@ -0,0 +1,115 @@
+import threading
+from collections import deque
+
+from config import DASHBOARD_HISTORY
+
+
+class DashboardFeed:
+    """
+    Versioned view of every student's score / status for the live dashboard.
+
+    Each real change bumps a global version and is appended to a bounded
+    change log, so a client that knows version V only receives the students
+    changed after V (cost follows the change rate, not the class size).
+    """
+
+    def __init__(self, history=DASHBOARD_HISTORY):
+        self._cond = threading.Condition()
+        self.version = 0
+        self._students = {}                  # student_id -> entry dict
+        self._log = deque(maxlen=history)    # (version, student_id)
+
+    # ================= WRITERS =================
+    def publish(self, student_id, score, status, exam_id=None):
+        with self._cond:
+            entry = self._students.get(student_id)
+            if exam_id is None and entry is not None:
+                exam_id = entry["exam_id"]
+
+            if (
+                entry is not None
+                and entry["score"] == score
+                and entry["status"] == status
+                and entry["exam_id"] == exam_id
+            ):
+                return
+
+            self._bump(student_id, {
+                "student_id": student_id,
+                "exam_id": exam_id,
+                "score": score,
+                "status": status,
+            })
+
+    def remove(self, student_id):
+        with self._cond:
+            entry = self._students.get(student_id)
+            if entry is None:
+                return
+            self._bump(student_id, dict(entry, removed=True))
+
+    def _bump(self, student_id, entry):
+        self.version += 1
+        entry["version"] = self.version
+        self._students[student_id] = entry
+
+        # Forget removed students once their last change leaves the log
+        if len(self._log) == self._log.maxlen:
+            old_version, old_sid = self._log[0]
+            old = self._students.get(old_sid)
+            if old is not None and old.get("removed") and old["version"] == old_version:
+                del self._students[old_sid]
+
+        self._log.append((self.version, student_id))
+        self._cond.notify_all()
+
+    # ================= READERS =================
+    def snapshot(self, exam_id=None):
+        """
+        Returns:
+            (version, [entry, ...]) of live students (optionally one exam)
+        """
+
+        with self._cond:
+            rows = [
+                dict(e) for e in self._students.values()
+                if not e.get("removed")
+                and (exam_id is None or e["exam_id"] == exam_id)
+            ]
+            return self.version, rows
+
+    def changes_since(self, version, exam_id=None):
+        """
+        Returns:
+            (version, [changed entry, ...]), or (version, None) when `version`
+            is older than the change log (client must take a snapshot)
+        """
+
+        with self._cond:
+            oldest = self._log[0][0] if self._log else self.version + 1
+            if version > self.version or version < oldest - 1:
+                return self.version, None
+
+            changed = {}
+            for v, sid in reversed(self._log):
+                if v <= version:
+                    break
+                changed.setdefault(sid, None)
+
+            rows = []
+            for sid in changed:
+                entry = self._students[sid]
+                if exam_id is None or entry["exam_id"] == exam_id:
+                    rows.append(dict(entry))
+            return self.version, rows
+
+    def wait(self, version, timeout):
+        """
+        Block until something changed after `version` (or timeout).
+        """
+
+        with self._cond:
+            return self._cond.wait_for(lambda: self.version > version, timeout)
+
+
+dashboard_feed = DashboardFeed()
@@ -1,3 +1,32 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text
 
 db = SQLAlchemy()
+
+
+def upgrade_schema():
+    """
+    Bring tables created by an older version up to date with the models.
+
+    db.create_all() only creates missing tables; this adds missing
+    (nullable) columns and indexes to tables that already exist.
+    """
+
+    inspector = inspect(db.engine)
+
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                col_type = column.type.compile(dialect=db.engine.dialect)
+                conn.execute(text(
+                    f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {col_type}'
+                ))
+
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
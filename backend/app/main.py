@@ -1,11 +1,22 @@
+import multiprocessing
+
 from flask import Flask, render_template
 from flask_cors import CORS
 
 from routes.proctor import proctor_bp
 from routes.auth import auth_bp
 from routes.exam import exam_bp
+from routes.metrics import metrics_bp
+from routes.stream import init_stream
+from ai.evidence import evidence_writer
+from ai.evidence_retention import evidence_retention
+from ai.model_registry import model_registry
+from ai.workers import warmup_targets
+from config import DATABASE_URI
+from score_series import score_series
+from sessions import session_registry
 
-from db import db          # 🔥 DATABASE
+from db import db, upgrade_schema   # 🔥 DATABASE
 import models              # 🔥 MODELS (table creation ke liye)
 
 def create_app():
@@ -19,7 +30,7 @@ def create_app():
     CORS(app)
 
     # ================= DATABASE CONFIG =================
-    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///proctor.db"
+    app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URI
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
     db.init_app(app)
@@ -27,11 +38,31 @@ def create_app():
     # Create tables once at startup
     with app.app_context():
         db.create_all()
+        upgrade_schema()   # new columns / indexes on an existing proctor.db
+
+    # Evidence is written off the request path (flushed on shutdown)
+    evidence_writer.init_app(app)
+
+    # Old exams' evidence is bundled into evidence/archive (if retention is on)
+    evidence_retention.init_app(app)
+
+    # Score time series is bulk-inserted in the background
+    score_series.init_app(app)
+
+    # Idle sessions are archived and evicted in the background
+    session_registry.init_app(app)
 
     # ================= BLUEPRINTS =================
     app.register_blueprint(proctor_bp, url_prefix="/proctor")
     app.register_blueprint(auth_bp, url_prefix="/auth")
     app.register_blueprint(exam_bp, url_prefix="/exam")
+    app.register_blueprint(metrics_bp)   # /metrics (Prometheus scrape)
+
+    # WebSocket frame stream (optional: needs flask-sock)
+    init_stream(app)
+
+    # Models load + warm in the background; /ready says when to route traffic
+    model_registry.start_warmup(warmup_targets())
 
     # ================= ROUTES =================
     @app.route("/")
@@ -43,8 +74,14 @@ def create_app():
     return app
 
 
-app = create_app()
+# Inference workers are spawned and re-import this module (as __mp_main__)
+# under `python main.py`: only the web process builds the app, so workers
+# never create tables, start the background writers or warm the pool.
+# (parent_process() is not set yet during that import; the name is.)
+if multiprocessing.current_process().name == "MainProcess":
+    app = create_app()
 
 if __name__ == "__main__":
     # 🔥 reloader OFF = stability
-    app.run(debug=True, port=5000, use_reloader=False)
+    # threaded: per-student sessions let /analyze calls run concurrently
+    app.run(debug=True, port=5000, use_reloader=False, threaded=True)
@@ -0,0 +1,121 @@
+import bisect
+import threading
+
+from config import METRICS_BUCKETS_MS
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram per label value (Prometheus layout).
+
+    observe() is a bisect + two adds under a lock; no samples are kept, so
+    memory is constant whatever the request rate.
+    """
+
+    def __init__(self, name, help_text, label, buckets=METRICS_BUCKETS_MS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = sorted(buckets)
+        self._lock = threading.Lock()
+        self._series = {}    # label value -> [bucket counts (+Inf last), sum]
+
+    def observe(self, value, label_value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        with self._lock:
+            series = {k: (list(v[0]), v[1]) for k, v in self._series.items()}
+
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for label_value, (counts, total) in sorted(series.items()):
+            label = f'{self.label}="{label_value}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound:g}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {total:.3f}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    """
+    Monotonic counter per label value.
+    """
+
+    def __init__(self, name, help_text, label):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, label_value, amount=1):
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = dict(self._values)
+
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} counter",
+        ]
+        for label_value, value in sorted(values.items()):
+            lines.append(f'{self.name}{{{self.label}="{label_value}"}} {value}')
+        return lines
+
+
+def render_gauges(name, help_text, values, label=None, kind="gauge"):
+    """
+    Prometheus lines for values read at scrape time.
+
+    values: a number, or {label value: number} when label is given
+    """
+
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    if label is None:
+        lines.append(f"{name} {values}")
+    else:
+        for label_value, value in sorted(values.items()):
+            lines.append(f'{name}{{{label}="{label_value}"}} {value}')
+    return lines
+
+
+# ================= PIPELINE METRICS =================
+stage_latency = Histogram(
+    "proctor_stage_latency_ms",
+    "Wall time of each /analyze stage in milliseconds.",
+    "stage"
+)
+
+frames_total = Counter(
+    "proctor_frames_total",
+    "Frames analysed, by whether detections were reused (motion gate).",
+    "reused"
+)
+
+responses_total = Counter(
+    "proctor_analyze_responses_total",
+    "/analyze responses by HTTP status.",
+    "code"
+)
+
+
+def observe_frame(stages, reused):
+    for stage, ms in stages.items():
+        stage_latency.observe(ms, stage)
+    frames_total.inc("true" if reused else "false")
@@ -9,7 +9,15 @@ class Student(db.Model):
 
 
 class Event(db.Model):
+    """
+    One point of a student's score / status time series (score_series.py).
+    """
+
     __tablename__ = "events"
+    __table_args__ = (
+        # History queries: one student, time range
+        db.Index("ix_events_student_ts", "student_id", "timestamp"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.String, db.ForeignKey("students.student_id"))
@@ -21,8 +29,55 @@ class Event(db.Model):
 
 class Evidence(db.Model):
     __tablename__ = "evidence"
+    __table_args__ = (
+        # Catalogue queries: per student / per exam, newest first
+        db.Index("ix_evidence_student_ts", "student_id", "timestamp", "id"),
+        db.Index("ix_evidence_exam_ts", "exam_id", "timestamp", "id"),
+        db.Index("ix_evidence_ts", "timestamp", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.String)
     image_name = db.Column(db.String)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    exam_id = db.Column(db.String)
+    score = db.Column(db.Integer)
+    reason = db.Column(db.String)
+    clip_name = db.Column(db.String)    # MJPEG around the trigger (may lag)
+    # Retention bundle (evidence/archive/) now holding the image / clip
+    archive_name = db.Column(db.String)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "image": self.image_name,
+            "student_id": self.student_id,
+            "exam_id": self.exam_id,
+            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
+            "score": self.score,
+            "reason": self.reason,
+            "clip": self.clip_name,
+            # Same name under /proctor/evidence/thumbs/
+            "thumb": self.image_name,
+            "archived": self.archive_name is not None,
+        }
+
+
+class SessionSummary(db.Model):
+    """
+    Final state of a closed (idle / evicted) proctoring session.
+    """
+
+    __tablename__ = "session_summaries"
+
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.String, index=True)
+    exam_id = db.Column(db.String, index=True)
+    started_at = db.Column(db.DateTime)
+    ended_at = db.Column(db.DateTime, default=datetime.utcnow)
+    frames = db.Column(db.Integer)
+    score = db.Column(db.Integer)
+    status = db.Column(db.String)
+    risk_level = db.Column(db.String)
+    suspicious_patterns = db.Column(db.Integer)
+    close_reason = db.Column(db.String)
@@ -0,0 +1,122 @@
+from flask import Blueprint, Response, jsonify
+
+from admission import admission
+from ai.evidence import evidence_writer, frame_buffer
+from ai.hand_detect import hands_pool
+from ai.landmarks import face_mesh_pool
+from ai.model_registry import model_registry
+from ai.object_detect import scheduler as yolo_scheduler
+from ai.workers import get_inference_pool
+from metrics import frames_total, render_gauges, responses_total, stage_latency
+from scorer_store import scorer_store
+from sessions import session_registry
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+# ================= PROMETHEUS SCRAPE =================
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Prometheus text format: stage latency histograms, frame / response
+    counters, plus queue depths and pool / session gauges read on scrape.
+    """
+
+    writer = evidence_writer.stats()
+    sessions = session_registry.stats()
+    admitted = admission.stats()
+    pool = get_inference_pool()
+
+    lines = []
+    lines += stage_latency.render()
+    lines += frames_total.render()
+    lines += responses_total.render()
+
+    lines += render_gauges(
+        "proctor_queue_depth",
+        "Items waiting in each background queue.",
+        {
+            "yolo_batch": yolo_scheduler.queue_depth() if yolo_scheduler else 0,
+            "evidence_writer": writer["queue_depth"],
+        },
+        label="queue"
+    )
+    lines += render_gauges(
+        "proctor_admission_outstanding",
+        "Frames running or waiting for their turn in admission control.",
+        admitted["outstanding"]
+    )
+    lines += render_gauges(
+        "proctor_frames_shed_total",
+        "Uploads not analysed: busy (node full), superseded by a newer "
+        "frame of the same student, or expired while waiting.",
+        {
+            "busy": admitted["shed"],
+            "superseded": admitted["superseded"],
+            "expired": admitted["expired"],
+        },
+        label="reason", kind="counter"
+    )
+    lines += render_gauges(
+        "proctor_graph_pool_idle",
+        "Idle MediaPipe graphs per pool.",
+        {p.name: p.stats()["idle"] for p in (face_mesh_pool, hands_pool)},
+        label="pool"
+    )
+    lines += render_gauges(
+        "proctor_active_sessions", "Live student sessions.", sessions["live"]
+    )
+    buffered = frame_buffer.stats()
+    lines += render_gauges(
+        "proctor_frame_buffer_bytes", "JPEG bytes held for evidence clips (ring + pending clips).",
+        buffered["bytes"] + buffered["pending_bytes"]
+    )
+    lines += render_gauges(
+        "proctor_sessions_closed_total", "Sessions closed after idling.",
+        sessions["closed_total"], kind="counter"
+    )
+    lines += render_gauges(
+        "proctor_scored_students", "Students with a live scorer.", len(scorer_store)
+    )
+    lines += render_gauges(
+        "proctor_evidence_total",
+        "Evidence writer outcomes.",
+        {k: writer[k] for k in ("submitted", "written", "deduplicated", "dropped", "errors", "clips_written")},
+        label="outcome", kind="counter"
+    )
+    models = model_registry.stats()["models"]
+    lines += render_gauges(
+        "proctor_model_warm", "1 once a model is loaded and primed.",
+        {name: int(m["warm"]) for name, m in models.items()}, label="model"
+    )
+    lines += render_gauges(
+        "proctor_model_startup_ms", "Model load + warmup time in milliseconds.",
+        {
+            name: round((m["load_ms"] or 0) + (m["warmup_ms"] or 0), 1)
+            for name, m in models.items() if m["warm"]
+        },
+        label="model"
+    )
+    if pool is not None:
+        lines += render_gauges(
+            "proctor_inference_workers_alive",
+            "Inference worker processes alive.",
+            sum(1 for w in pool.stats() if w["alive"])
+        )
+
+    return Response(
+        "\n".join(lines) + "\n",
+        mimetype="text/plain; version=0.0.4"
+    )
+
+
+# ================= READINESS =================
+@metrics_bp.route("/ready", methods=["GET"])
+def ready():
+    """
+    200 once every model is loaded and warm, 503 before (load balancer probe).
+    Body: per-model load / warmup timings.
+    """
+
+    stats = model_registry.stats()
+    return jsonify(stats), 200 if stats["ready"] else 503
@@ -1,98 +1,545 @@
 import base64
-import cv2
+import calendar
+import json
+import math
+import time
+from datetime import datetime, timezone
 import numpy as np
 import os
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import (
+    Blueprint, Response, request, jsonify, send_from_directory, stream_with_context
+)
+from werkzeug.security import safe_join
 
-from ai.evidence import save_evidence
-from ai.face_detect import detect_face
-from ai.eye_detect import detect_eye_behavior
-from ai.head_pose import get_head_direction
-from ai.object_detect import detect_mobile_with_position
-from ai.hand_detect import detect_hand_and_position
-from ai.scoring import SuspicionScorer
+from admission import admission
+from ai.cascade import cascade_stats
+from ai.evidence import (
+    CLIP_DIR, IMG_DIR, THUMB_DIR, save_evidence, evidence_writer, frame_buffer,
+    thumbnail_from_jpeg
+)
+from ai.evidence_retention import evidence_retention, read_archived
+from ai.frame_prep import as_prepared, decode_prepared
+from ai.object_detect import scheduler as yolo_scheduler
+from ai.landmarks import face_mesh_pool
+from ai.model_registry import model_registry
+from ai.motion_gate import skip_stats
+from ai.hand_detect import hands_pool, NUM_HAND_LANDMARKS
+from ai.landmarks import NUM_LANDMARKS
+from ai.pipeline import StageTimer, run_detectors, run_landmark_detectors
+from ai.scoring import INSTANT_PENALTIES
+from ai.workers import get_inference_pool
+from config import (
+    DASHBOARD_TICK_S, DASHBOARD_KEEPALIVE_S, TRACE_HEADER, SCORE_HISTORY_POINTS,
+    ADMISSION_RETRY_AFTER_S, TELEMETRY_MAX_EVENTS, TELEMETRY_MAX_AGE_S, TELEMETRY_HEADER
+)
+from dashboard_feed import dashboard_feed
+from db import db
+from metrics import observe_frame, responses_total
+from models import Event, Evidence
+from score_series import score_series
+from scorer_store import scorer_store
+from sessions import session_registry
 
 proctor_bp = Blueprint("proctor", __name__)
 
 # ================= PER-STUDENT STATE =================
-student_scorers = {}
-student_last_status = {}
+# Live sessions (detector state, idle eviction): sessions.py
+# Scorers (in-process or shared across workers): scorer_store.py
 
-def get_scorer(student_id):
-    if student_id not in student_scorers:
-        student_scorers[student_id] = SuspicionScorer()
-    return student_scorers[student_id]
+# ================= FRAME INGESTION =================
+def read_frame_request():
+    """
+    Accepts three encodings of the same request:
+    - application/json: {"student_id", "image": base64 JPEG} (legacy)
+    - image/jpeg: raw body, student_id in ?student_id= or X-Student-Id
+    - multipart/form-data: file "image", field "student_id"
+
+    Returns:
+        (student_id, jpeg_bytes) or (None, None) when missing
+    """
+
+    content_type = request.mimetype
+
+    if content_type == "image/jpeg":
+        student_id = (
+            request.args.get("student_id")
+            or request.headers.get("X-Student-Id")
+        )
+        return student_id, request.get_data(cache=False)
+
+    if content_type == "multipart/form-data":
+        upload = request.files.get("image")
+        if upload is None:
+            return request.form.get("student_id"), None
+        return request.form.get("student_id"), upload.read()
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or "image" not in data or "student_id" not in data:
+        return None, None
+
+    try:
+        return data["student_id"], base64.b64decode(data["image"])
+    except Exception:
+        return data["student_id"], b""
+
+
+def parse_time(value, utc):
+    """
+    ISO time from a query string, as a naive datetime comparable with the
+    DB column: an offset (...Z, +05:30) is converted to UTC (utc=True,
+    events) or to server local time (utc=False, evidence). Naive input is
+    taken as already in that zone.
+    """
+
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"    # fromisoformat() before 3.11
+    t = datetime.fromisoformat(value)
+    if t.tzinfo is not None:
+        t = t.astimezone(timezone.utc if utc else None).replace(tzinfo=None)
+    return t
+
+
+def request_exam_id():
+    """
+    Optional exam id (?exam_id=, form field or JSON field) for dashboard filters.
+    """
+
+    exam_id = request.values.get("exam_id")
+    if exam_id is None:
+        exam_id = (request.get_json(silent=True) or {}).get("exam_id")
+    return exam_id
+
+
+def _points(rows, allowed_counts, max_items=4):
+    if not rows:
+        return np.empty((0, allowed_counts[0], 2), dtype=np.float32)
+    if len(rows) > max_items:
+        raise ValueError("too many landmark sets")
+
+    points = np.asarray(rows, dtype=np.float32).reshape(len(rows), -1, 2)
+    if points.shape[1] not in allowed_counts or not np.isfinite(points).all():
+        raise ValueError("bad landmark set")
+    return points
+
+
+def read_landmarks(data):
+    """
+    Client landmark mode (MediaPipe runs in the browser):
+        {"student_id", "exam_id"?, "landmarks": {
+            "width", "height",               # capture size in pixels
+            "faces": [[x0, y0, x1, y1, ...]], # normalized, 478 (or 468) points
+            "hands": [[x0, y0, ...]]          # normalized, 21 points
+        }}
+    Points may also be nested [[x, y], ...].
+
+    Returns:
+        (faces in pixels, hands normalized, width, height); ValueError if malformed
+    """
+
+    landmarks = data["landmarks"]
+    width, height = int(landmarks["width"]), int(landmarks["height"])
+    if width <= 0 or height <= 0:
+        raise ValueError("bad frame size")
+
+    faces = _points(landmarks.get("faces"), (NUM_LANDMARKS, 468))
+    hands = _points(landmarks.get("hands"), (NUM_HAND_LANDMARKS,))
+    faces *= (width, height)
+
+    return faces, hands, width, height
+
+
+def read_telemetry(batch, now=None):
+    """
+    Browser events for one student:
+        {"sent_at": ms, "events": [{"type": "copy_paste", "t": ms}, ...]}
+
+    t / sent_at are the client's Date.now(); only their difference is
+    trusted (client clocks drift). It is mapped onto the server clock (the
+    scorer's clock) and clamped to the last TELEMETRY_MAX_AGE_S seconds.
+    Events without t count as "now".
+
+    Returns:
+        (events, ignored): [(type, time)] oldest first, and the number of
+        events of a type the scorer does not know; ValueError if malformed
+    """
+
+    if not isinstance(batch, dict):
+        raise ValueError("telemetry batch must be an object")
+
+    now = time.time() if now is None else now
+    rows = batch.get("events") or []
+    if not isinstance(rows, list) or len(rows) > TELEMETRY_MAX_EVENTS:
+        raise ValueError("bad telemetry batch")
+
+    sent_at = batch.get("sent_at")
+    events = []
+    ignored = 0
+    for row in rows:
+        if not isinstance(row, dict) or not isinstance(row.get("type"), str):
+            raise ValueError("bad telemetry event")
+        kind = row["type"]
+        if kind not in INSTANT_PENALTIES:
+            ignored += 1
+            continue
+
+        at = now
+        if row.get("t") is not None and sent_at is not None:
+            at = now - (float(sent_at) - float(row["t"])) / 1000
+            if not math.isfinite(at):
+                raise ValueError("bad event time")
+        events.append((kind, min(max(at, now - TELEMETRY_MAX_AGE_S), now)))
+
+    events.sort(key=lambda e: e[1])
+    return events, ignored
+
+
+def request_telemetry():
+    """
+    Optional telemetry batch riding on a frame upload: "events" / "sent_at"
+    in a JSON body, or the whole batch as JSON in the "telemetry" form
+    field / TELEMETRY_HEADER header (raw JPEG uploads).
+
+    Returns:
+        (events, ignored) as read_telemetry()
+    """
+
+    if request.mimetype == "application/json":
+        batch = request.get_json(silent=True) or {}
+    else:
+        raw = request.headers.get(TELEMETRY_HEADER) or request.form.get("telemetry")
+        batch = json.loads(raw) if raw else {}
+
+    if not isinstance(batch, dict):
+        raise ValueError("telemetry batch must be an object")
+    if "events" not in batch:
+        return [], 0
+    return read_telemetry(batch)
+
+
+def decode_jpeg(jpeg_bytes):
+    """
+    Decode JPEG bytes once, at reduced size when they are larger than the
+    models need (see ai/frame_prep.py).
+
+    Returns:
+        PreparedFrame, or None if OpenCV cannot decode it
+    """
+
+    if not jpeg_bytes:
+        raise ValueError("empty image payload")
+    return decode_prepared(jpeg_bytes)
+
+
+def server_timing(stages):
+    """
+    Stage breakdown as a Server-Timing header value (shown in browser devtools).
+    """
+
+    return ", ".join(f"{name};dur={ms:.2f}" for name, ms in stages.items())
 
 # ================= ANALYZE FRAME =================
 @proctor_bp.route("/analyze", methods=["POST"])
 def analyze():
-    data = request.json
+    timer = StageTimer()
+
+    # Client landmark mode: JSON with "landmarks" instead of "image"
+    if request.mimetype == "application/json":
+        data = request.get_json(silent=True)
+        if isinstance(data, dict) and "landmarks" in data:
+            return _traced(analyze_landmarks_request(data, timer), timer)
 
-    if not data or "image" not in data or "student_id" not in data:
+    with timer.stage("read"):
+        student_id, jpeg_bytes = read_frame_request()
+
+    if not student_id or jpeg_bytes is None:
+        responses_total.inc("400")
         return jsonify({"error": "image or student_id missing"}), 400
 
-    student_id = data["student_id"]
-    scorer = get_scorer(student_id)
+    try:
+        events, _ = request_telemetry()
+    except (KeyError, TypeError, ValueError):
+        responses_total.inc("400")
+        return jsonify({"error": "Invalid telemetry"}), 400
+
+    return _traced(
+        analyze_upload(student_id, jpeg_bytes, request_exam_id(), timer, events),
+        timer
+    )
+
+
+def _traced(outcome, timer):
+    result, code = outcome
+    responses_total.inc(str(code))
+
+    response = jsonify(result)
+    response.status_code = code
+    if "retry_after" in result:
+        response.headers["Retry-After"] = str(result["retry_after"])
+    if request.headers.get(TRACE_HEADER):
+        response.headers["Server-Timing"] = server_timing(timer.stages)
+        response.headers["Access-Control-Expose-Headers"] = "Server-Timing"
+    return response
+
+
+def analyze_landmarks_request(data, timer):
+    student_id = data.get("student_id")
+    if not student_id:
+        return {"error": "student_id missing"}, 400
+
+    with timer.stage("read"):
+        try:
+            faces, hands, width, height = read_landmarks(data)
+        except (KeyError, TypeError, ValueError):
+            return {"error": "Invalid landmarks"}, 400
+        try:
+            events, _ = read_telemetry(data)
+        except (KeyError, TypeError, ValueError):
+            return {"error": "Invalid telemetry"}, 400
+
+    return analyze_landmarks(
+        student_id, faces, hands, width, height, data.get("exam_id"), timer, events
+    )
+
+
+def analyze_upload(student_id, jpeg_bytes, exam_id=None, timer=None, events=()):
+    """
+    Admission + decode + analyze_frame() for one uploaded JPEG (shared by
+    HTTP and WebSocket). Frames wait for their turn before being decoded,
+    so shed or superseded uploads cost almost nothing.
+    events: telemetry riding on the frame (read_telemetry), scored with it.
+
+    Returns:
+        (response dict, http status)
+    """
+
+    timer = timer or StageTimer()
+
+    ticket = admission.enter(student_id)
+    if ticket is None:
+        return _unanalysed(student_id, events, _busy_response(), 503)
 
-    # -------- Decode image --------
     try:
-        frame = cv2.imdecode(
-            np.frombuffer(base64.b64decode(data["image"]), np.uint8),
-            cv2.IMREAD_COLOR
+        with timer.stage("admission"):
+            admitted = admission.wait(ticket)
+        if not admitted:
+            if ticket.state == "expired":
+                return _unanalysed(student_id, events, _busy_response(), 503)
+            return _unanalysed(student_id, events, _superseded_response(student_id), 200)
+
+        try:
+            with timer.stage("decode"):
+                frame = decode_jpeg(jpeg_bytes)
+        except Exception:
+            return _unanalysed(student_id, events, {"error": "Invalid image"}, 400)
+
+        if frame is None:
+            return _unanalysed(student_id, events, {"error": "Empty frame"}, 400)
+
+        return analyze_frame(
+            student_id, frame, exam_id, timer, jpeg_bytes=jpeg_bytes, events=events
         )
-    except Exception:
-        return jsonify({"error": "Invalid image"}), 400
-
-    if frame is None:
-        return jsonify({"error": "Empty frame"}), 400
-
-    # ================= AI DETECTIONS =================
-    face_present, face_count = detect_face(frame)
-    head_dir = get_head_direction(frame)
-    phone_detected, phone_pos = detect_mobile_with_position(frame)
-    hand_detected, hand_pos = detect_hand_and_position(frame)
-    eye_dir, eyes_closed = detect_eye_behavior(frame)
-
-    # ================= LEARNING =================
-    scorer.learn_baseline()
-
-    # ================= SCORING =================
-    scorer.update_face_status(face_present)
-    scorer.update_head_pose(head_dir)
-    scorer.update_eye_behavior(eye_dir, eyes_closed)
-    scorer.update_hand_phone_head_combo(
-        hand_detected,
-        phone_detected,
-        head_dir
-    )
+    finally:
+        admission.leave(ticket)
+
+
+def _unanalysed(student_id, events, result, code):
+    # The frame is dropped, the telemetry riding on it is not
+    if events:
+        apply_telemetry(student_id, events)
+    return result, code
+
+
+def _busy_response():
+    return {"error": "Server busy, retry later", "retry_after": ADMISSION_RETRY_AFTER_S}
 
-    # ================= EVIDENCE =================
-    current_status = scorer.get_status()
-    previous_status = student_last_status.get(student_id)
 
-    if current_status == "CHEATING" and previous_status != "CHEATING":
-        save_evidence(
-            frame=frame,
-            student_id=student_id,
-            score=scorer.score,
-            reason="Suspicious behavior detected"
+def _superseded_response(student_id):
+    # A newer frame from this student replaced this one in the queue; answer
+    # with the latest result instead of analysing a stale frame
+    session = session_registry.peek(student_id)
+    last = session.last_result if session is not None else None
+    return dict(last or {"student_id": student_id}, superseded=True)
+
+
+def analyze_frame(student_id, frame, exam_id=None, timer=None, jpeg_bytes=None, events=()):
+    """
+    Detect + score one decoded frame (shared by HTTP and WebSocket).
+    frame: PreparedFrame from decode_jpeg() (or a BGR ndarray).
+    Stage timings go to timer (a StageTimer) and the /metrics histograms.
+    jpeg_bytes (the frame as received) feeds the evidence clip buffer.
+    events: browser telemetry scored in the same scorer transaction.
+
+    Returns:
+        (response dict, http status)
+    """
+
+    timer = timer or StageTimer()
+    frame = as_prepared(frame)
+
+    session = session_registry.get(student_id, exam_id)
+    exam_id = session.exam_id
+
+    # One student's frames run in order; other students run in parallel
+    lock_started = time.perf_counter()
+    with session.lock:
+        timer.stages["lock_wait"] = (time.perf_counter() - lock_started) * 1000
+        session.frames += 1
+        frame_buffer.push(student_id, jpeg_bytes)
+
+        # ================= AI DETECTIONS =================
+        started = time.perf_counter()
+        pool = get_inference_pool()
+        if pool is not None:
+            try:
+                with timer.stage("inference_ipc"):
+                    det = pool.run(student_id, frame)
+            except RuntimeError:
+                return _unanalysed(student_id, events, {"error": "Inference unavailable"}, 503)
+            timer.stages.update(det.pop("stages", {}))
+        else:
+            det = run_detectors(frame, session.detectors, timer)
+
+        skip_stats.record(det["reused"], (time.perf_counter() - started) * 1000)
+        if not det["reused"]:
+            cascade_stats.record(det["phone_trigger"])
+
+        previous_status, current_status, score = _score(student_id, det, timer, "frame", events)
+
+        # ================= EVIDENCE =================
+        flipped = current_status == "CHEATING" and previous_status != "CHEATING"
+        if flipped or session.evidence_due is not None:
+            # A flip on a landmark-only upload is saved with the next frame
+            evidence_score = score if flipped else session.evidence_due
+            session.evidence_due = None
+
+            with timer.stage("evidence"):
+                save_evidence(
+                    frame=frame.bgr,
+                    student_id=student_id,
+                    score=evidence_score,
+                    reason="Suspicious behavior detected",
+                    exam_id=exam_id,
+                    clip=True,
+                    jpeg_bytes=jpeg_bytes
+                )
+
+    with timer.stage("publish"):
+        dashboard_feed.publish(student_id, score, current_status, exam_id)
+
+    timer.stages["total"] = timer.elapsed()
+    observe_frame(timer.stages, det["reused"])
+
+    session.last_result = _detections_response(student_id, det, score, current_status)
+    return session.last_result, 200
+
+
+def analyze_landmarks(student_id, faces, hands, width, height, exam_id=None, timer=None,
+                      events=()):
+    """
+    Score one client landmark upload (no frame, no models on the server).
+
+    The response carries need_frame / frame_request when the next upload
+    should be a full JPEG: evidence capture, a phone check or periodic
+    verification.
+
+    Returns:
+        (response dict, http status)
+    """
+
+    timer = timer or StageTimer()
+
+    session = session_registry.get(student_id, exam_id)
+    exam_id = session.exam_id
+
+    with session.lock:
+        session.frames += 1
+
+        # Geometry only, but against the detector session that also sees
+        # this student's frames: in worker mode that lives in the worker
+        pool = get_inference_pool()
+        if pool is not None:
+            try:
+                with timer.stage("inference_ipc"):
+                    det = pool.run_landmarks(student_id, faces, hands, width, height)
+            except RuntimeError:
+                return _unanalysed(student_id, events, {"error": "Inference unavailable"}, 503)
+            timer.stages.update(det.pop("stages", {}))
+        else:
+            det = run_landmark_detectors(faces, hands, width, height, session.detectors, timer)
+
+        previous_status, current_status, score = _score(
+            student_id, det, timer, "landmarks", events
         )
 
-    student_last_status[student_id] = current_status
+        if current_status == "CHEATING" and previous_status != "CHEATING":
+            session.evidence_due = score
+        if session.evidence_due is not None:
+            det["frame_request"] = "evidence"
 
-    # ================= RESPONSE =================
-    return jsonify({
+    with timer.stage("publish"):
+        dashboard_feed.publish(student_id, score, current_status, exam_id)
+
+    timer.stages["total"] = timer.elapsed()
+    observe_frame(timer.stages, False)
+
+    return _detections_response(student_id, det, score, current_status), 200
+
+
+def _score(student_id, det, timer, source, events=()):
+    """
+    Apply one set of detections (and any browser telemetry that came with
+    them) to the student's scorer and record the result in the score time
+    series.
+
+    Returns:
+        (status before, status after, score)
+    """
+
+    head_dir = det["head_direction"]
+
+    # Atomic per-student update (shared across processes if configured)
+    with timer.stage("scoring"), scorer_store.transaction(student_id) as scorer:
+        previous_status = scorer.get_status()
+
+        # ================= TELEMETRY =================
+        for kind, at in events:
+            scorer.add_instant_violation(kind, at)
+
+        # ================= LEARNING =================
+        scorer.learn_baseline()
+
+        # ================= SCORING =================
+        scorer.update_face_status(det["face_present"])
+        scorer.update_head_pose(head_dir)
+        scorer.update_eye_behavior(det["eye_direction"], det["eyes_closed"])
+        scorer.update_hand_phone_head_combo(
+            det["hand_detected"],
+            det["phone_detected"],
+            head_dir
+        )
+
+        current_status, score = scorer.get_status(), scorer.score
+
+    score_series.record(student_id, score, current_status, source)
+    return previous_status, current_status, score
+
+
+def _detections_response(student_id, det, score, status):
+    frame_request = det.get("frame_request")
+    return {
         "student_id": student_id,
-        "face_present": face_present,
-        "face_count": face_count,
-        "head_direction": head_dir,
-        "eye_direction": eye_dir,
-        "eyes_closed": eyes_closed,
-        "phone_detected": phone_detected,
-        "hand_detected": hand_detected,
-        "score": scorer.score,
-        "status": current_status
-    })
+        "face_present": det["face_present"],
+        "face_count": det["face_count"],
+        "head_direction": det["head_direction"],
+        "eye_direction": det["eye_direction"],
+        "eyes_closed": det["eyes_closed"],
+        "phone_detected": det["phone_detected"],
+        "hand_detected": det["hand_detected"],
+        "score": score,
+        "status": status,
+        "need_frame": frame_request is not None,
+        "frame_request": frame_request
+    }
 
 # ================= RESET SCORE =================
 @proctor_bp.route("/reset-score", methods=["POST"])
@@ -100,9 +547,19 @@ def reset_score():
     data = request.json
     student_id = data.get("student_id")
 
-    if student_id in student_scorers:
-        student_scorers[student_id].reset()
-        student_last_status.pop(student_id, None)
+    session = session_registry.peek(student_id)
+    if session is not None:
+        with session.lock:
+            session.reset()
+
+            pool = get_inference_pool()
+            if pool is not None:
+                pool.reset_session(student_id)
+
+    # Dropping the record == fresh scorer on the next update
+    if scorer_store.pop(student_id) is not None:
+        score_series.record(student_id, 0, "NORMAL", "reset")
+        dashboard_feed.publish(student_id, 0, "NORMAL")
 
     return jsonify({
         "message": "Score reset",
@@ -117,57 +574,371 @@ def dashboard_data():
     return jsonify([
         {
             "student_id": sid,
-            "score": scorer.score,
-            "status": scorer.get_status()
+            "score": score,
+            "status": status
         }
-        for sid, scorer in student_scorers.items()
+        for sid, score, status in scorer_store.summaries()
     ])
 
+# ================= DASHBOARD STREAM (SSE) =================
+def _sse(event, version, payload):
+    return f"id: {version}\nevent: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@proctor_bp.route("/dashboard-stream", methods=["GET"])
+def dashboard_stream():
+    """
+    Server-Sent Events:
+    - "snapshot": all live students (first message, or after a long gap)
+    - "delta": only students whose score / status changed since last tick
+    Reconnects resume from Last-Event-ID (or ?since=); ?exam_id= filters.
+    """
+
+    exam_id = request.args.get("exam_id")
+    since = request.headers.get("Last-Event-ID") or request.args.get("since")
+
+    def generate():
+        version, rows = (None, None)
+        if since is not None and since.isdigit():
+            version, rows = dashboard_feed.changes_since(int(since), exam_id)
+
+        if rows is None:
+            version, rows = dashboard_feed.snapshot(exam_id)
+            yield _sse("snapshot", version, {"version": version, "students": rows})
+        elif rows:
+            yield _sse("delta", version, {"version": version, "students": rows})
+
+        while True:
+            if not dashboard_feed.wait(version, DASHBOARD_KEEPALIVE_S):
+                yield ": keepalive\n\n"
+                continue
+
+            # Coalesce bursts of updates into one delta per tick
+            time.sleep(DASHBOARD_TICK_S)
+
+            version, rows = dashboard_feed.changes_since(version, exam_id)
+            if rows is None:
+                version, rows = dashboard_feed.snapshot(exam_id)
+                yield _sse("snapshot", version, {"version": version, "students": rows})
+            elif rows:
+                yield _sse("delta", version, {"version": version, "students": rows})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ================= SCORE HISTORY =================
+SCORE_HISTORY_MAX_POINTS = 5000
+
+
+@proctor_bp.route("/score-history", methods=["GET"])
+def score_history():
+    """
+    Downsampled score timeline of one student (events table), grouped into
+    time buckets in SQL so a whole exam comes back as a few hundred rows.
+
+    Query: student_id (required), start / end (ISO; UTC unless an offset
+    is given), points (number of buckets) or bucket_s (bucket width in
+    seconds).
+    Each bucket: t (bucket start), min / max / last score, last status, count.
+    """
+
+    args = request.args
+    student_id = args.get("student_id")
+    if not student_id:
+        return jsonify({"error": "student_id missing"}), 400
+
+    try:
+        start = parse_time(args["start"], utc=True) if "start" in args else None
+        end = parse_time(args["end"], utc=True) if "end" in args else None
+        points = int(args.get("points", SCORE_HISTORY_POINTS))
+        bucket_s = float(args["bucket_s"]) if "bucket_s" in args else None
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid query parameters"}), 400
+
+    if start is None or end is None:
+        first, last = (
+            db.session.query(db.func.min(Event.timestamp), db.func.max(Event.timestamp))
+            .filter(Event.student_id == student_id)
+            .one()
+        )
+        if first is None:
+            return jsonify({"student_id": student_id, "bucket_s": None, "points": []})
+        start = start or first
+        end = end or last
+
+    span = max((end - start).total_seconds(), 1.0)
+    points = min(max(points, 1), SCORE_HISTORY_MAX_POINTS)
+    if bucket_s is None:
+        bucket_s = span / points
+    bucket_s = max(1, math.ceil(max(bucket_s, span / SCORE_HISTORY_MAX_POINTS)))
+
+    # Timestamps are naive UTC; strftime('%s') reads them as UTC too
+    start_epoch = calendar.timegm(start.timetuple())
+    epoch = db.cast(db.func.strftime("%s", Event.timestamp), db.Integer)
+    bucket = db.cast((epoch - start_epoch) / bucket_s, db.Integer).label("bucket")
+
+    rows = (
+        db.session.query(
+            bucket,
+            db.func.min(Event.score),
+            db.func.max(Event.score),
+            db.func.count(Event.id),
+            db.func.max(Event.id)
+        )
+        .filter(
+            Event.student_id == student_id,
+            Event.timestamp >= start,
+            Event.timestamp <= end
+        )
+        .group_by(bucket)
+        .order_by(bucket)
+        .all()
+    )
+
+    # Ids grow with time: the max id of a bucket is its last point
+    last_points = {}
+    if rows:
+        last_points = {
+            row_id: (score, status)
+            for row_id, score, status in db.session.query(
+                Event.id, Event.score, Event.status
+            ).filter(Event.id.in_([row[4] for row in rows]))
+        }
+
+    series = []
+    for index, low, high, count, last_id in rows:
+        last_score, last_status = last_points.get(last_id, (None, None))
+        series.append({
+            "t": datetime.utcfromtimestamp(start_epoch + index * bucket_s).isoformat(),
+            "min": low,
+            "max": high,
+            "last": last_score,
+            "status": last_status,
+            "count": count,
+        })
+
+    return jsonify({
+        "student_id": student_id,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "bucket_s": bucket_s,
+        "points": series
+    })
+
+# ================= PIPELINE STATS =================
+@proctor_bp.route("/pipeline-stats", methods=["GET"])
+def pipeline_stats():
+    pool = get_inference_pool()
+    return jsonify({
+        "yolo_batching": yolo_scheduler.stats() if yolo_scheduler else None,
+        "graph_pools": [face_mesh_pool.stats(), hands_pool.stats()],
+        "frame_skipping": skip_stats.snapshot(),
+        "phone_cascade": cascade_stats.snapshot(),
+        "evidence_writer": evidence_writer.stats(),
+        "evidence_retention": evidence_retention.stats(),
+        "sessions": session_registry.stats(),
+        "scored_students": len(scorer_store),
+        "inference_workers": pool.stats() if pool else None,
+        "models": model_registry.stats(),
+        "frame_buffer": frame_buffer.stats(),
+        "score_series": score_series.stats(),
+        "admission": admission.stats()
+    })
+
 # ================= TAB EVENTS =================
 @proctor_bp.route("/tab-event", methods=["POST"])
 def tab_event():
-    data = request.json
+    """
+    Legacy single-event form of /telemetry. The event is scored through
+    SuspicionScorer.add_instant_violation like any telemetry event (same
+    penalties, same cooldown). tab_switch_count / total_away_time are still
+    accepted but no longer scored: every switch already arrives as its own
+    event.
+    """
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Invalid tab event"}), 400
     student_id = data.get("student_id")
 
     if not student_id:
         return jsonify({"error": "student_id missing"}), 400
 
-    scorer = get_scorer(student_id)
+    session_registry.get(student_id)
 
     event = data.get("event_type")
-    tab_count = data.get("tab_switch_count", 0)
-    away_time = data.get("total_away_time", 0)
-
-    if event == "fullscreen_exit":
-        scorer.score += 25
-    if tab_count >= 3:
-        scorer.score += 20
-    if away_time >= 5:
-        scorer.score += 20
+    events = [(event, None)] if event in INSTANT_PENALTIES else []
+    score, status = apply_telemetry(student_id, events, f"tab:{event}")
 
     return jsonify({
         "event": event,
-        "score": scorer.score,
-        "status": scorer.get_status()
+        "score": score,
+        "status": status
     })
 
+# ================= BROWSER TELEMETRY =================
+@proctor_bp.route("/telemetry", methods=["POST"])
+def telemetry():
+    """
+    A batch of timestamped browser events for one student (see
+    read_telemetry), scored oldest first through
+    SuspicionScorer.add_instant_violation (cooldown applies). The same
+    batch can instead ride on the next /analyze upload.
+    """
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"error": "Invalid telemetry"}), 400
+    student_id = data.get("student_id")
+
+    if not student_id:
+        return jsonify({"error": "student_id missing"}), 400
+
+    try:
+        events, ignored = read_telemetry(data)
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "Invalid telemetry"}), 400
+
+    session_registry.get(student_id, data.get("exam_id"))
+    score, status = apply_telemetry(student_id, events)
+
+    return jsonify({
+        "student_id": student_id,
+        "accepted": len(events),
+        "ignored": ignored,
+        "score": score,
+        "status": status
+    })
+
+
+def apply_telemetry(student_id, events, reason="telemetry"):
+    """
+    Score browser events (from read_telemetry) on their own, outside a frame.
+    A time of None means "now" on the scorer's clock.
+
+    Returns:
+        (score, status)
+    """
+
+    with scorer_store.transaction(student_id) as scorer:
+        for kind, at in events:
+            scorer.add_instant_violation(kind, at)
+        score, status = scorer.score, scorer.get_status()
+
+    score_series.record(student_id, score, status, reason)
+    dashboard_feed.publish(student_id, score, status)
+    return score, status
+
 # ================= EVIDENCE LIST =================
+EVIDENCE_PAGE_SIZE = 50
+EVIDENCE_MAX_PAGE_SIZE = 200
+
+
+def _encode_cursor(row):
+    raw = f"{row.timestamp.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor):
+    ts, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    return datetime.fromisoformat(ts), int(row_id)
+
+
 @proctor_bp.route("/evidence-list", methods=["GET"])
 def evidence_list():
-    evidence_dir = os.path.join("evidence", "images")
-    if not os.path.exists(evidence_dir):
-        return jsonify([])
+    """
+    Evidence catalogue from the DB, newest first (no filesystem access).
+
+    Query: student_id, exam_id, start / end (ISO time; server local time
+    unless an offset is given), limit, cursor.
+    The body stays a JSON list; the next page cursor is in X-Next-Cursor.
+    """
+
+    args = request.args
+
+    try:
+        limit = min(int(args.get("limit", EVIDENCE_PAGE_SIZE)), EVIDENCE_MAX_PAGE_SIZE)
+        start = parse_time(args["start"], utc=False) if "start" in args else None
+        end = parse_time(args["end"], utc=False) if "end" in args else None
+        cursor = _decode_cursor(args["cursor"]) if "cursor" in args else None
+    except (ValueError, TypeError):
+        return jsonify({"error": "Invalid query parameters"}), 400
 
-    files = []
-    for f in os.listdir(evidence_dir):
-        if f.lower().endswith((".jpg", ".png", ".jpeg")):
-            files.append({"image": f})
+    query = Evidence.query
+    if args.get("student_id"):
+        query = query.filter(Evidence.student_id == args["student_id"])
+    if args.get("exam_id"):
+        query = query.filter(Evidence.exam_id == args["exam_id"])
+    if start is not None:
+        query = query.filter(Evidence.timestamp >= start)
+    if end is not None:
+        query = query.filter(Evidence.timestamp < end)
 
-    return jsonify(files)
+    # Keyset pagination on (timestamp, id): cost does not grow with depth
+    if cursor is not None:
+        ts, row_id = cursor
+        query = query.filter(db.or_(
+            Evidence.timestamp < ts,
+            db.and_(Evidence.timestamp == ts, Evidence.id < row_id)
+        ))
+
+    rows = (
+        query.order_by(Evidence.timestamp.desc(), Evidence.id.desc())
+        .limit(max(limit, 1) + 1)
+        .all()
+    )
+
+    page = rows[:max(limit, 1)]
+    response = jsonify([row.to_dict() for row in page])
+    if len(rows) > len(page):
+        response.headers["X-Next-Cursor"] = _encode_cursor(page[-1])
+        response.headers["Access-Control-Expose-Headers"] = "X-Next-Cursor"
+    return response
+
+def _evidence_file(directory, kind, filename, mimetype):
+    """
+    Serve from disk, or from the retention bundle once archived.
+    """
+
+    path = safe_join(directory, filename)
+    if path is not None and os.path.exists(path):
+        return send_from_directory(directory, filename, mimetype=mimetype)
+
+    data = read_archived(kind, filename)
+    if data is None:
+        return jsonify({"error": "Not found"}), 404
+    return Response(data, mimetype=mimetype)
 
 @proctor_bp.route("/evidence/<filename>")
 def get_evidence_image(filename):
-    return send_from_directory(
-        os.path.join("evidence", "images"),
-        filename
-    )
+    return _evidence_file(IMG_DIR, "images", filename, "image/jpeg")
+
+@proctor_bp.route("/evidence/thumbs/<filename>")
+def get_evidence_thumb(filename):
+    """
+    Thumbnail for list views; built on first request for evidence written
+    before thumbnails existed.
+    """
+
+    path = safe_join(THUMB_DIR, filename)
+    if path is None:
+        return jsonify({"error": "Not found"}), 404
+
+    if not os.path.exists(path):
+        image = safe_join(IMG_DIR, filename)
+        if os.path.exists(image):
+            with open(image, "rb") as f:
+                data = f.read()
+        else:
+            data = read_archived("images", filename)
+        if data is None or not thumbnail_from_jpeg(data, filename):
+            return jsonify({"error": "Not found"}), 404
+
+    return send_from_directory(THUMB_DIR, filename, mimetype="image/jpeg")
+
+@proctor_bp.route("/evidence/clips/<filename>")
+def get_evidence_clip(filename):
+    return _evidence_file(CLIP_DIR, "clips", filename, "video/x-motion-jpeg")
@@ -0,0 +1,98 @@
+import json
+
+from flask import request
+
+from config import TELEMETRY_MAX_EVENTS
+from metrics import responses_total
+from routes.proctor import (
+    analyze_landmarks, analyze_upload, apply_telemetry, read_landmarks, read_telemetry
+)
+
+# flask-sock is optional: without it only the HTTP endpoints are served
+try:
+    from flask_sock import Sock
+except ImportError:
+    Sock = None
+
+sock = Sock() if Sock is not None else None
+
+
+def _reply(ws, result, code):
+    # Same /analyze response counter as the HTTP path (status per message)
+    responses_total.inc(str(code))
+    ws.send(json.dumps(result))
+
+
+def init_stream(app):
+    """
+    Register the WebSocket frame stream (if flask-sock is installed).
+
+    Returns:
+        True when /proctor/stream is available
+    """
+
+    if sock is None:
+        return False
+
+    sock.init_app(app)
+    return True
+
+
+if sock is not None:
+
+    @sock.route("/proctor/stream")
+    def frame_stream(ws):
+        """
+        One persistent connection per student:
+        - text  -> {"student_id": "...", "exam_id": "..."} (or query args)
+        - text with "landmarks" -> client landmark upload (see read_landmarks)
+        - text with "events" -> browser telemetry (see read_telemetry), scored
+          with the landmarks in the same message or the next frame
+        - bytes -> one JPEG frame; answered with the /analyze JSON result
+        """
+
+        student_id = request.args.get("student_id")
+        exam_id = request.args.get("exam_id")
+        events = []
+
+        while True:
+            message = ws.receive()
+            if message is None:
+                break
+
+            if isinstance(message, str):
+                try:
+                    hello = json.loads(message)
+                    student_id = hello.get("student_id", student_id)
+                    exam_id = hello.get("exam_id", exam_id)
+                    if "events" in hello:
+                        events = sorted(
+                            events + read_telemetry(hello)[0], key=lambda e: e[1]
+                        )
+                        if len(events) > TELEMETRY_MAX_EVENTS:
+                            if student_id:
+                                apply_telemetry(student_id, events)
+                            events = []
+                    if "landmarks" in hello and student_id:
+                        faces, hands, width, height = read_landmarks(hello)
+                        result, code = analyze_landmarks(
+                            student_id, faces, hands, width, height, exam_id,
+                            events=events
+                        )
+                        events = []
+                        _reply(ws, result, code)
+                except (ValueError, AttributeError, KeyError, TypeError):
+                    _reply(ws, {"error": "Invalid message"}, 400)
+                continue
+
+            if not student_id:
+                _reply(ws, {"error": "student_id missing"}, 400)
+                continue
+
+            result, code = analyze_upload(student_id, message, exam_id, events=events)
+            events = []
+            _reply(ws, result, code)
+
+        # Connection closed before the next frame: still score the events
+        if events and student_id:
+            apply_telemetry(student_id, events)
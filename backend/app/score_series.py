@@ -0,0 +1,161 @@
+import atexit
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from config import (
+    SCORE_SERIES_BATCH_SIZE,
+    SCORE_SERIES_FLUSH_INTERVAL_S,
+    SCORE_SERIES_MAX_BUFFER,
+    SCORE_SERIES_HEARTBEAT_S,
+)
+from db import db
+from models import Event
+
+
+class ScoreSeriesWriter:
+    """
+    Per-student score / status time series in the events table.
+
+    record() is called on every scoring update but only keeps a point when
+    the score or status changed (or a heartbeat is due, so gaps in the
+    series mean "no data"). Points are buffered in memory and bulk-inserted
+    by a background thread, one commit per batch.
+    """
+
+    def __init__(self, batch_size=SCORE_SERIES_BATCH_SIZE,
+                 flush_interval=SCORE_SERIES_FLUSH_INTERVAL_S,
+                 max_buffer=SCORE_SERIES_MAX_BUFFER, heartbeat=SCORE_SERIES_HEARTBEAT_S):
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.heartbeat = heartbeat
+
+        self.app = None
+        self._cond = threading.Condition()
+        self._buffer = deque(maxlen=max(1, int(max_buffer)))
+        self._last = {}            # student_id -> (score, status, monotonic time)
+        self._thread = None
+        self._stopping = False
+
+        self.recorded = 0
+        self.skipped = 0
+        self.dropped = 0
+        self.written = 0
+        self.errors = 0
+        self.commits = 0
+
+    # ================= LIFECYCLE =================
+    def init_app(self, app):
+        self.app = app
+        if self.running:
+            return
+
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._loop, name="score-series-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def close(self, timeout=10.0):
+        """
+        Flush everything buffered and stop the writer.
+        """
+
+        if not self.running:
+            return
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    # ================= PRODUCER =================
+    def record(self, student_id, score, status, reason=None):
+        now = time.monotonic()
+
+        with self._cond:
+            last = self._last.get(student_id)
+            if (
+                last is not None
+                and last[0] == score
+                and last[1] == status
+                and now - last[2] < self.heartbeat
+            ):
+                self.skipped += 1
+                return
+
+            self._last[student_id] = (score, status, now)
+
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1      # deque drops the oldest point
+            self._buffer.append({
+                "student_id": student_id,
+                "timestamp": datetime.utcnow(),
+                "score": int(score),
+                "status": status,
+                "reason": reason,
+            })
+            self.recorded += 1
+
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+
+    def forget(self, student_id):
+        """
+        Session closed: the next point for this student is always kept.
+        """
+
+        with self._cond:
+            self._last.pop(student_id, None)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "buffered": len(self._buffer),
+                "recorded": self.recorded,
+                "skipped_unchanged": self.skipped,
+                "dropped": self.dropped,
+                "written": self.written,
+                "errors": self.errors,
+                "commits": self.commits,
+            }
+
+    # ================= WRITER =================
+    def _loop(self):
+        while True:
+            with self._cond:
+                if len(self._buffer) < self.batch_size and not self._stopping:
+                    self._cond.wait(self.flush_interval)
+                rows = list(self._buffer)
+                self._buffer.clear()
+                stopping = self._stopping
+
+            for i in range(0, len(rows), self.batch_size):
+                self._flush(rows[i:i + self.batch_size])
+
+            if stopping:
+                break
+
+    def _flush(self, rows):
+        try:
+            with self.app.app_context():
+                # executemany: one statement, one commit per batch
+                db.session.execute(insert(Event), rows)
+                db.session.commit()
+
+            with self._cond:
+                self.written += len(rows)
+                self.commits += 1
+        except Exception:
+            with self._cond:
+                self.errors += 1
+
+
+score_series = ScoreSeriesWriter()
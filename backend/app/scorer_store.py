@@ -0,0 +1,263 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from ai.scoring import SuspicionScorer
+from ai.scoring_bank import ScorerBank, BankScorer
+from config import SCORER_STORE, SCORER_STORE_PATH
+
+
+class InMemoryScorerStore:
+    """
+    Default store: SuspicionScorer objects in a process-local dict
+    (no serialization). Updates for one student are serialised by a
+    per-student lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}   # student_id -> [scorer, lock, updated]
+
+    def _entry(self, student_id):
+        with self._lock:
+            entry = self._entries.get(student_id)
+            if entry is None:
+                entry = [SuspicionScorer(), threading.Lock(), time.time()]
+                self._entries[student_id] = entry
+            return entry
+
+    @contextmanager
+    def transaction(self, student_id):
+        """
+        Atomic read-modify-write of one student's scorer.
+        """
+
+        entry = self._entry(student_id)
+        with entry[1]:
+            yield entry[0]
+            entry[2] = time.time()
+
+    def pop(self, student_id, idle_for=None):
+        """
+        Remove a student's scorer (only if idle for `idle_for` seconds).
+
+        Returns:
+            the removed SuspicionScorer, or None
+        """
+
+        with self._lock:
+            entry = self._entries.get(student_id)
+            if entry is None:
+                return None
+            if idle_for is not None and time.time() - entry[2] < idle_for:
+                return None
+            del self._entries[student_id]
+        return entry[0]
+
+    def summaries(self):
+        """
+        Returns:
+            list of (student_id, score, status)
+        """
+
+        with self._lock:
+            entries = list(self._entries.items())
+        return [(sid, e[0].score, e[0].get_status()) for sid, e in entries]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class SQLiteScorerStore:
+    """
+    Shared store: one compact JSON record per student in a SQLite WAL file.
+
+    Every update is BEGIN IMMEDIATE -> read -> modify -> write -> COMMIT,
+    so /analyze, /tab-event and /reset-score stay atomic per student even
+    when they land on different worker processes.
+    """
+
+    def __init__(self, path=SCORER_STORE_PATH, timeout=5.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS scorers ("
+            " student_id TEXT PRIMARY KEY,"
+            " record TEXT NOT NULL,"
+            " score INTEGER NOT NULL,"
+            " status TEXT NOT NULL,"
+            " updated REAL NOT NULL)"
+        )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode: transactions are explicit (BEGIN IMMEDIATE)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self, student_id):
+        """
+        Atomic read-modify-write of one student's scorer across processes.
+        """
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT record FROM scorers WHERE student_id = ?", (student_id,)
+            ).fetchone()
+            scorer = (
+                SuspicionScorer.from_record(json.loads(row[0]))
+                if row else SuspicionScorer()
+            )
+
+            yield scorer
+
+            conn.execute(
+                "INSERT INTO scorers (student_id, record, score, status, updated)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT(student_id) DO UPDATE SET"
+                " record = excluded.record, score = excluded.score,"
+                " status = excluded.status, updated = excluded.updated",
+                (
+                    student_id,
+                    json.dumps(scorer.to_record(), separators=(",", ":")),
+                    scorer.score,
+                    scorer.get_status(),
+                    time.time(),
+                )
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def pop(self, student_id, idle_for=None):
+        """
+        Remove a student's scorer (only if idle for `idle_for` seconds).
+
+        Returns:
+            the removed SuspicionScorer, or None
+        """
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT record, updated FROM scorers WHERE student_id = ?",
+                (student_id,)
+            ).fetchone()
+            if row is None or (
+                idle_for is not None and time.time() - row[1] < idle_for
+            ):
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute("DELETE FROM scorers WHERE student_id = ?", (student_id,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        return SuspicionScorer.from_record(json.loads(row[0]))
+
+    def summaries(self):
+        """
+        Returns:
+            list of (student_id, score, status)
+        """
+
+        return self._conn().execute(
+            "SELECT student_id, score, status FROM scorers"
+        ).fetchall()
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM scorers").fetchone()[0]
+
+
+class ColumnarScorerStore:
+    """
+    In-process store backed by one ScorerBank: all sessions' timers and
+    scores live in NumPy arrays (tens of thousands of students), and
+    summaries() is a single array pass.
+    """
+
+    def __init__(self, capacity=1024):
+        self.bank = ScorerBank(capacity)
+
+    @contextmanager
+    def transaction(self, student_id):
+        # Row updates take microseconds: one bank-wide lock is enough
+        with self.bank.lock:
+            row = self.bank.row(student_id)
+            yield BankScorer(self.bank, row)
+            self.bank.touched[row] = time.time()
+
+    def pop(self, student_id, idle_for=None):
+        """
+        Remove a student's scorer (only if idle for `idle_for` seconds).
+
+        Returns:
+            a detached SuspicionScorer-like snapshot, or None
+        """
+
+        with self.bank.lock:
+            if not self.bank.has(student_id):
+                return None
+            row = self.bank.row(student_id)
+            if idle_for is not None and time.time() - self.bank.touched[row] < idle_for:
+                return None
+
+            detail = self.bank.get_detailed_status(row)
+            self.bank.remove(student_id)
+
+        return _DetachedScorer(detail)
+
+    def summaries(self):
+        with self.bank.lock:
+            return self.bank.snapshot()
+
+    def __len__(self):
+        return len(self.bank)
+
+
+class _DetachedScorer:
+    """
+    Final state of a removed bank row (what session archiving needs).
+    """
+
+    def __init__(self, detail):
+        self.detail = detail
+        self.score = detail["score"]
+
+    def get_status(self):
+        return self.detail["status"]
+
+    def get_detailed_status(self):
+        return dict(self.detail)
+
+
+def create_scorer_store(kind=SCORER_STORE):
+    if kind == "memory":
+        return InMemoryScorerStore()
+    if kind == "columnar":
+        return ColumnarScorerStore()
+    if kind == "sqlite":
+        return SQLiteScorerStore()
+    raise ValueError(f"Unknown scorer store: {kind}")
+
+
+scorer_store = create_scorer_store()
@@ -0,0 +1,207 @@
+import threading
+import time
+from datetime import datetime
+
+from ai.evidence import dedup_index, frame_buffer
+from ai.session import DetectorSession
+from ai.workers import get_inference_pool
+from config import SESSION_IDLE_TIMEOUT_S, SESSION_SWEEP_INTERVAL_S
+from dashboard_feed import dashboard_feed
+from db import db
+from models import SessionSummary
+from score_series import score_series
+from scorer_store import scorer_store
+
+
+class StudentSession:
+    """
+    Everything this process keeps in memory for one live student.
+    The scorer itself lives in the scorer store (see scorer_store.py).
+    """
+
+    def __init__(self, student_id, exam_id=None):
+        self.student_id = student_id
+        self.exam_id = exam_id
+
+        # One student's frames / events run in order; others run in parallel
+        self.lock = threading.Lock()
+
+        self.detectors = DetectorSession(student_id)
+
+        self.started_at = datetime.utcnow()
+        self.last_seen = time.monotonic()
+        self.frames = 0
+
+        # Landmark mode: score of a CHEATING flip waiting for a full frame
+        self.evidence_due = None
+
+        # Last /analyze result, returned for frames superseded in admission
+        self.last_result = None
+
+    def reset(self):
+        self.detectors.reset()
+        self.evidence_due = None
+        self.last_result = None
+
+
+class SessionRegistry:
+    """
+    Live sessions with idle-timeout eviction.
+
+    A background sweep closes sessions idle for longer than `idle_timeout`:
+    the final SuspicionScorer.get_detailed_status() is written to the
+    session_summaries table, the student leaves the dashboard and the
+    memory is released. Memory is bounded by concurrent students.
+    """
+
+    def __init__(self, idle_timeout=SESSION_IDLE_TIMEOUT_S,
+                 sweep_interval=SESSION_SWEEP_INTERVAL_S):
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = sweep_interval
+
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+        self.app = None
+        self._thread = None
+        self.closed_total = 0
+        self.archive_errors = 0
+        self.frame_buffer_errors = 0
+
+    # ================= ACCESS =================
+    def get(self, student_id, exam_id=None):
+        """
+        Returns the live session (created on first use) and marks it active.
+        """
+
+        with self._lock:
+            session = self._sessions.get(student_id)
+            if session is None:
+                session = StudentSession(student_id, exam_id)
+                self._sessions[student_id] = session
+            elif exam_id is not None:
+                session.exam_id = exam_id
+            session.last_seen = time.monotonic()
+            return session
+
+    def peek(self, student_id):
+        with self._lock:
+            return self._sessions.get(student_id)
+
+    def items(self):
+        with self._lock:
+            return list(self._sessions.items())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    # ================= LIFECYCLE =================
+    def init_app(self, app):
+        self.app = app
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(
+            target=self._reaper, name="session-reaper", daemon=True
+        )
+        self._thread.start()
+
+    def _reaper(self):
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                self.close_idle()
+            except Exception:
+                self.archive_errors += 1
+            # Clip expiry runs even when archiving failed, and is counted apart
+            try:
+                frame_buffer.expire()
+            except Exception:
+                self.frame_buffer_errors += 1
+
+    def close_idle(self, now=None):
+        """
+        Close every session idle for longer than the timeout.
+
+        Returns:
+            list of closed student ids
+        """
+
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            idle = [
+                sid for sid, s in self._sessions.items()
+                if now - s.last_seen >= self.idle_timeout
+            ]
+            closed = [self._sessions.pop(sid) for sid in idle]
+
+        for session in closed:
+            self._finish(session, "idle")
+
+        return idle
+
+    def close(self, student_id, reason="closed"):
+        with self._lock:
+            session = self._sessions.pop(student_id, None)
+        if session is not None:
+            self._finish(session, reason)
+        return session is not None
+
+    def _finish(self, session, reason):
+        # Wait for an in-flight frame of this student before archiving.
+        # With a shared store another process may still be serving this
+        # student: only an idle scorer is removed and archived.
+        with session.lock:
+            scorer = scorer_store.pop(
+                session.student_id,
+                idle_for=self.idle_timeout if reason == "idle" else None
+            )
+
+        self.closed_total += 1
+        dashboard_feed.remove(session.student_id)
+        frame_buffer.drop(session.student_id)
+        score_series.forget(session.student_id)
+        dedup_index.forget(session.student_id)
+
+        pool = get_inference_pool()
+        if pool is not None:
+            try:
+                pool.reset_session(session.student_id)
+            except RuntimeError:
+                pass
+
+        if self.app is None or scorer is None:
+            return
+
+        detail = scorer.get_detailed_status()
+        try:
+            with self.app.app_context():
+                db.session.add(SessionSummary(
+                    student_id=session.student_id,
+                    exam_id=session.exam_id,
+                    started_at=session.started_at,
+                    ended_at=datetime.utcnow(),
+                    frames=session.frames,
+                    score=detail["score"],
+                    status=detail["status"],
+                    risk_level=detail["risk_level"],
+                    suspicious_patterns=detail["suspicious_patterns"],
+                    close_reason=reason
+                ))
+                db.session.commit()
+        except Exception:
+            self.archive_errors += 1
+
+    def stats(self):
+        return {
+            "live": len(self),
+            "closed_total": self.closed_total,
+            "archive_errors": self.archive_errors,
+            "frame_buffer_errors": self.frame_buffer_errors,
+            "idle_timeout_s": self.idle_timeout,
+        }
+
+
+session_registry = SessionRegistry()
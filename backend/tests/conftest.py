@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+
+# Modules import each other as top-level packages (run from backend/app)
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, os.path.abspath(APP_DIR))
+
+# Importing the routes creates the evidence directories: keep them (and any
+# database) out of the working tree
+_DATA_DIR = tempfile.mkdtemp(prefix="proctor_tests_")
+os.environ.setdefault("PROCTOR_EVIDENCE_DIR", os.path.join(_DATA_DIR, "evidence"))
+os.environ.setdefault("PROCTOR_DATABASE_URI", "sqlite:///" + os.path.join(_DATA_DIR, "proctor.db"))
@@ -0,0 +1,138 @@
+"""
+AdmissionControl state machine: latest frame wins, stale frames expire,
+the global cap sheds load.
+"""
+
+import threading
+
+import pytest
+
+from admission import AdmissionControl
+
+
+def test_newer_frame_supersedes_the_waiting_one():
+    control = AdmissionControl(max_frames=8, max_wait=5)
+
+    running = control.enter("a")
+    assert control.wait(running) is True
+
+    waiting = control.enter("a")
+    assert waiting.state == "waiting"
+
+    newest = control.enter("a")
+    assert waiting.state == "superseded"
+    # Answered at once, without waiting for the running frame
+    assert control.wait(waiting) is False
+
+    stats = control.stats()
+    assert stats["superseded"] == 1
+    assert stats["outstanding"] == 2
+    assert stats["waiting"] == 1
+
+    control.leave(running)
+    assert newest.state == "running"
+    assert control.wait(newest) is True
+
+    control.leave(newest)
+    assert control.stats()["outstanding"] == 0
+    assert control._slots == {}
+
+
+def test_waiting_frame_runs_once_the_previous_one_leaves():
+    control = AdmissionControl(max_frames=8, max_wait=5)
+    running = control.enter("a")
+    waiting = control.enter("a")
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(control.wait(waiting)))
+    waiter.start()
+
+    control.leave(running)
+    waiter.join(timeout=5)
+
+    assert results == [True]
+    control.leave(waiting)
+    assert control.stats()["outstanding"] == 0
+
+
+def test_frame_waiting_past_max_wait_is_dropped():
+    control = AdmissionControl(max_frames=8, max_wait=0.05)
+
+    running = control.enter("a")
+    waiting = control.enter("a")
+
+    assert control.wait(waiting) is False
+    assert waiting.state == "expired"
+
+    stats = control.stats()
+    assert stats["expired"] == 1
+    assert stats["outstanding"] == 1
+    assert stats["waiting"] == 0
+
+    # Late leave of an expired frame is a no-op
+    control.leave(waiting)
+    control.leave(running)
+    assert control.stats()["outstanding"] == 0
+
+    # The student is not stuck afterwards
+    again = control.enter("a")
+    assert control.wait(again) is True
+    control.leave(again)
+
+
+def test_global_cap_sheds_new_frames():
+    control = AdmissionControl(max_frames=2, max_wait=5)
+
+    a = control.enter("a")
+    b = control.enter("b")
+    assert control.enter("c") is None
+    # A second frame for a running student is new load too
+    assert control.enter("a") is None
+    assert control.stats()["shed"] == 2
+
+    control.leave(b)
+    c = control.enter("c")
+    assert c is not None and c.state == "running"
+
+    control.leave(a)
+    control.leave(c)
+    assert control.stats()["outstanding"] == 0
+
+
+def test_replacing_a_waiting_frame_is_admitted_at_the_cap():
+    control = AdmissionControl(max_frames=2, max_wait=5)
+
+    running = control.enter("a")
+    control.enter("a")
+    # Swaps the queued frame: no extra load, so not shed
+    newest = control.enter("a")
+    assert newest is not None
+    assert control.stats()["outstanding"] == 2
+
+    control.leave(running)
+    control.leave(newest)
+    assert control.stats()["outstanding"] == 0
+
+
+def test_analyze_answers_503_with_retry_after_at_the_cap(monkeypatch):
+    # Needs the full backend (models, OpenCV, Flask)
+    proctor = pytest.importorskip("routes.proctor")
+    from flask import Flask
+
+    control = AdmissionControl(max_frames=1, max_wait=5)
+    monkeypatch.setattr(proctor, "admission", control)
+    holder = control.enter("someone_else")
+
+    app = Flask(__name__)
+    app.register_blueprint(proctor.proctor_bp, url_prefix="/proctor")
+
+    response = app.test_client().post(
+        "/proctor/analyze?student_id=s1", data=b"\xff\xd8\xff\xd9", content_type="image/jpeg"
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(proctor.ADMISSION_RETRY_AFTER_S)
+    assert response.json["retry_after"] == proctor.ADMISSION_RETRY_AFTER_S
+    assert control.stats()["shed"] == 1
+
+    control.leave(holder)
@@ -0,0 +1,40 @@
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import pytest
+
+from ai.batching import BatchScheduler
+
+
+def test_short_result_list_fails_every_future():
+    scheduler = BatchScheduler(lambda items: items[:-1], max_batch_size=4, max_wait_ms=50)
+
+    futures = [scheduler.submit(i) for i in range(3)]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match="returned"):
+            future.result(timeout=5)
+    assert scheduler.stats()["errors"] >= 1
+
+
+def test_run_times_out_and_skips_the_cancelled_item():
+    release = threading.Event()
+    seen = []
+
+    def run_batch(items):
+        seen.extend(items)
+        release.wait(5)
+        return items
+
+    scheduler = BatchScheduler(run_batch, max_batch_size=1, max_wait_ms=0)
+
+    blocker = scheduler.submit("first")
+    with pytest.raises(FutureTimeout):
+        scheduler.run("late", timeout=0.05)
+    assert scheduler.stats()["timeouts"] == 1
+
+    release.set()
+    assert blocker.result(timeout=5) == "first"
+    assert scheduler.run("next", timeout=5) == "next"
+    # The timed-out item never reached the model
+    assert seen == ["first", "next"]
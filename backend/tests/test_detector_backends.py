@@ -0,0 +1,59 @@
+"""
+OnnxBackend batching against models exported with a fixed batch size.
+"""
+
+import numpy as np
+import pytest
+
+from ai.detector_backends import COCO_PHONE_CLASS_ID, OnnxBackend
+
+
+class FakeSession:
+    """
+    Stands in for onnxruntime: accepts only its fixed batch size and puts a
+    phone at a position that identifies the input frame.
+    """
+
+    def __init__(self, batch):
+        self.batch = batch
+        self.calls = []
+
+    def run(self, outputs, feed):
+        blobs = feed["images"]
+        if blobs.shape[0] != self.batch:
+            raise ValueError(f"expected batch {self.batch}, got {blobs.shape[0]}")
+        self.calls.append(blobs.shape[0])
+
+        preds = np.zeros((self.batch, 84, 8400), np.float32)
+        for i, blob in enumerate(blobs):
+            # Frames are filled with their index: center x = 100 + 10 * index
+            index = round(float(blob.max()) * 255)
+            preds[i, :4, 0] = (100 + 10 * index, 320, 20, 20)
+            preds[i, 4 + COCO_PHONE_CLASS_ID, 0] = 0.9
+        return [preds]
+
+
+def _backend(batch):
+    backend = OnnxBackend.__new__(OnnxBackend)
+    backend.session = FakeSession(batch)
+    backend.input_name = "images"
+    backend.input_size = 640
+    backend.class_id = COCO_PHONE_CLASS_ID
+    backend.fixed_batch = batch
+    return backend
+
+
+@pytest.mark.parametrize("batch", [1, 4])
+def test_fixed_batch_models_get_exact_chunks(batch):
+    backend = _backend(batch)
+    frames = [np.full((640, 640, 3), i, np.uint8) for i in range(1, 7)]
+
+    out = backend.detect(frames, conf_threshold=0.5)
+
+    # One result per frame, in order, padding dropped
+    assert len(out) == len(frames)
+    for i, boxes in enumerate(out, start=1):
+        assert len(boxes) == 1
+        x1, _, x2, _ = boxes[0][1]
+        assert (x1 + x2) // 2 == 100 + 10 * i
+    assert backend.session.calls == [batch] * -(-len(frames) // batch)
@@ -0,0 +1,34 @@
+"""
+Evidence images keep the captured resolution even when the detectors ran
+on a reduced decode.
+"""
+
+import os
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from ai.evidence import IMG_DIR, THUMB_DIR, _store_image
+from ai.frame_prep import decode_prepared
+
+
+def test_evidence_image_is_stored_at_full_size():
+    full = np.random.default_rng(0).integers(0, 255, (1440, 2560, 3), dtype=np.uint8)
+    jpeg_bytes = cv2.imencode(".jpg", full)[1].tobytes()
+
+    frame = decode_prepared(jpeg_bytes, max_side=640)
+    assert frame.bgr.shape[1] < 2560
+
+    job = {
+        "frame": frame.bgr,
+        "jpeg": jpeg_bytes,
+        "student_id": "full_size",
+        "image_name": "full_size.jpg",
+        "timestamp": datetime.now(),
+    }
+    assert _store_image(job) is True
+
+    stored = cv2.imread(os.path.join(IMG_DIR, "full_size.jpg"))
+    assert stored.shape == full.shape
+    assert os.path.exists(os.path.join(THUMB_DIR, "full_size.jpg"))
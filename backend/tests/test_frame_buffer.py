@@ -0,0 +1,53 @@
+from ai.frame_buffer import FrameRingBuffer
+
+FRAME = b"x" * 100
+
+
+def make_buffer(max_bytes, clips, **kwargs):
+    return FrameRingBuffer(
+        max_bytes=max_bytes, pre_frames=4, post_frames=3, post_timeout=30,
+        max_pending=16, on_clip=lambda name, frames: clips.append((name, len(frames))),
+        **kwargs
+    )
+
+
+def test_pending_clips_count_against_the_budget():
+    clips = []
+    buffer = make_buffer(1000, clips)
+
+    for student in ("a", "b"):
+        for _ in range(4):
+            buffer.push(student, FRAME)
+    assert buffer.bytes == 800
+
+    assert buffer.capture("a", "a.mjpeg")
+    stats = buffer.stats()
+    assert stats["pending_bytes"] == 400
+    # Ring gave way so ring + pending stay within max_bytes
+    assert stats["bytes"] + stats["pending_bytes"] <= 1000
+
+    for _ in range(3):
+        buffer.push("a", FRAME)
+    assert clips == [("a.mjpeg", 7)]
+    assert buffer.stats()["pending_bytes"] == 0
+
+
+def test_oldest_pending_clip_is_finished_early_over_budget():
+    clips = []
+    buffer = make_buffer(900, clips)
+
+    for started, student in enumerate(("a", "b", "c")):
+        for _ in range(3):
+            buffer.push(student, FRAME)
+        assert buffer.capture(student, f"{student}.mjpeg", now=started)
+
+    # Three pending clips fill the budget: the ring has given way entirely
+    stats = buffer.stats()
+    assert stats["bytes"] + stats["pending_bytes"] <= 900
+
+    buffer.push("c", FRAME)
+    stats = buffer.stats()
+    assert stats["bytes"] + stats["pending_bytes"] <= 900
+
+    assert stats["clips_truncated"] >= 1
+    assert clips[0][0] == "a.mjpeg"
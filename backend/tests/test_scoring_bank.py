@@ -0,0 +1,94 @@
+"""
+ScorerBank re-implements every SuspicionScorer rule on columns: replay the
+same detection stream through both and require identical status at every
+step.
+"""
+
+import random
+
+import pytest
+
+from ai.scoring import INSTANT_PENALTIES, SuspicionScorer
+from ai.scoring_bank import BankScorer, ScorerBank
+
+HEAD_DIRECTIONS = ["center", "left", "right", "down", "up"]
+EYE_DIRECTIONS = ["center", "left", "right"]
+
+
+class FakeClock:
+    def __init__(self, start=1_000_000.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+def random_detections(rng):
+    face_count = rng.choice([0, 1, 1, 1, 2])
+    return {
+        "face_present": face_count > 0,
+        "face_count": face_count,
+        "head_direction": rng.choice(HEAD_DIRECTIONS),
+        "eye_direction": rng.choice(EYE_DIRECTIONS),
+        "eyes_closed": rng.random() < 0.1,
+        "hand_detected": rng.random() < 0.3,
+        "phone_detected": rng.random() < 0.15,
+    }
+
+
+def apply_frame(scorer, det, events):
+    # Same call order as routes/proctor._score
+    for kind, at in events:
+        scorer.add_instant_violation(kind, at)
+
+    scorer.learn_baseline()
+    scorer.update_face_status(det["face_present"], det["face_count"])
+    scorer.update_head_pose(det["head_direction"])
+    scorer.update_eye_behavior(det["eye_direction"], det["eyes_closed"])
+    scorer.update_hand_phone_head_combo(
+        det["hand_detected"], det["phone_detected"], det["head_direction"]
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_bank_matches_suspicion_scorer(seed):
+    rng = random.Random(seed)
+    clock = FakeClock()
+
+    reference = SuspicionScorer(clock=clock)
+    bank = ScorerBank(capacity=4, clock=clock)
+    scorer = BankScorer(bank, bank.row(f"student_{seed}"))
+
+    for step in range(600):
+        # Mostly webcam cadence, sometimes long gaps (decay, pattern reset)
+        clock.now += rng.choice([0.1, 0.2, 0.3, 0.5, 0.7, 1.0, 1.6, 2.5, 11.0, 31.0])
+
+        events = []
+        if rng.random() < 0.1:
+            kind = rng.choice(list(INSTANT_PENALTIES) + ["unknown"])
+            at = rng.choice([None, clock.now - rng.uniform(0, 5)])
+            events.append((kind, at))
+
+        det = random_detections(rng)
+        apply_frame(reference, det, events)
+        apply_frame(scorer, det, events)
+
+        assert scorer.get_detailed_status() == reference.get_detailed_status(), (
+            f"seed {seed}, step {step}"
+        )
+        assert scorer.get_status() == reference.get_status()
+
+
+def test_rows_are_independent():
+    clock = FakeClock()
+    bank = ScorerBank(capacity=1, clock=clock)
+    first = BankScorer(bank, bank.row("a"))
+    second = BankScorer(bank, bank.row("b"))
+
+    clock.now += 5
+    first.learn_baseline()
+    first.add_instant_violation("copy_paste")
+
+    assert first.score == INSTANT_PENALTIES["copy_paste"]
+    assert second.score == 0
+    assert second.get_detailed_status()["learning_phase"] is True
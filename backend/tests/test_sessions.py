@@ -0,0 +1,42 @@
+"""
+SessionRegistry sweep and StudentSession reset.
+"""
+
+import threading
+import time
+
+import sessions
+from sessions import SessionRegistry, StudentSession
+
+
+def test_clip_expiry_runs_and_is_counted_apart_from_archiving(monkeypatch):
+    registry = SessionRegistry(idle_timeout=60, sweep_interval=0.01)
+
+    def close_idle(now=None):
+        raise RuntimeError("database down")
+
+    def expire():
+        registry.sweep_interval = 3600    # one sweep is enough
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(registry, "close_idle", close_idle)
+    monkeypatch.setattr(sessions.frame_buffer, "expire", expire)
+    threading.Thread(target=registry._reaper, daemon=True).start()
+
+    # Archiving failed, clip expiry still ran
+    deadline = time.monotonic() + 5
+    while registry.frame_buffer_errors == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert registry.stats()["archive_errors"] == 1
+    assert registry.stats()["frame_buffer_errors"] == 1
+
+
+def test_reset_drops_pending_evidence():
+    session = StudentSession("s1")
+    session.evidence_due = 42.0
+    session.last_result = {"score": 42.0}
+
+    session.reset()
+
+    assert session.evidence_due is None
+    assert session.last_result is None
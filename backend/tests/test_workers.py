@@ -0,0 +1,69 @@
+"""
+Worker mode: a student's frames and landmark uploads go through the same
+detector session, the one in the worker the student is pinned to.
+"""
+
+import numpy as np
+import pytest
+
+# Workers import the whole detector stack (MediaPipe, YOLO)
+pytest.importorskip("ai.pipeline")
+
+from ai.workers import InferencePool  # noqa: E402
+from config import PHONE_CASCADE_BUDGET  # noqa: E402
+
+NO_FACES = np.zeros((0, 478, 2), np.float32)
+NO_HANDS = np.zeros((0, 21, 2), np.float32)
+FRAME = np.full((240, 320, 3), 127, np.uint8)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    env = pytest.MonkeyPatch()
+    # Read by the spawned worker when it imports config
+    env.setenv("PROCTOR_MODEL_WARMUP", "lazy")
+    env.setenv("PROCTOR_MOTION_GATE", "1")
+    env.setenv("PROCTOR_PHONE_CASCADE", "cascade")
+
+    pool = InferencePool(1, timeout=120)
+    yield pool
+
+    pool.close()
+    env.undo()
+
+
+def test_frame_after_landmarks_bypasses_the_worker_motion_gate(pool):
+    assert pool.run("gate", FRAME)["reused"] is False
+    assert pool.run("gate", FRAME)["reused"] is True
+
+    # The landmark upload is counted in the worker's session, so the frame
+    # the client sends next is treated as requested
+    pool.run_landmarks("gate", NO_FACES, NO_HANDS, 320, 240)
+    assert pool.run("gate", FRAME)["reused"] is False
+
+
+def test_landmark_route_uses_the_worker_session(pool, monkeypatch):
+    proctor = pytest.importorskip("routes.proctor")
+    from flask import Flask
+
+    monkeypatch.setattr(proctor, "get_inference_pool", lambda: pool)
+    app = Flask(__name__)
+    app.register_blueprint(proctor.proctor_bp, url_prefix="/proctor")
+    client = app.test_client()
+
+    body = {"student_id": "lm", "landmarks": {"width": 320, "height": 240, "faces": [], "hands": []}}
+    uploads = pool.workers[0].landmark_uploads
+
+    # Landmark uploads spend the worker's phone budget until a phone check
+    # is asked for
+    for _ in range(PHONE_CASCADE_BUDGET - 1):
+        response = client.post("/proctor/analyze", json=body)
+        assert response.status_code == 200
+        assert response.json["frame_request"] is None
+    assert client.post("/proctor/analyze", json=body).json["frame_request"] == "phone_check"
+
+    assert pool.workers[0].landmark_uploads == uploads + PHONE_CASCADE_BUDGET
+    # Nothing ran against the web-process copy of the session
+    detectors = proctor.session_registry.peek("lm").detectors
+    assert detectors.frames_since_phone == 0
+    assert detectors.frames_since_image == 0
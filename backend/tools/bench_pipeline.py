@@ -0,0 +1,252 @@
+"""
+Offline replay benchmark for the full proctoring pipeline.
+
+Replays JPEG frame sequences through the same chain as /proctor/analyze
+(decode -> face mesh / face / head pose / hands / eyes -> phone -> scorer)
+for N simulated students and reports per-stage p50/p95/p99 latency,
+frames/sec and peak RSS. CPU only, no network.
+
+Seed frames come from evidence/images; every student gets its own jittered
+copy of the sequence (shift + brightness + noise) so the motion gate sees
+realistic webcam movement. --static replays identical frames instead.
+
+Usage (from backend/app):
+    python ../tools/bench_pipeline.py --students 8 --frames 60 --threads 8
+    python ../tools/bench_pipeline.py --json baseline.json
+    python ../tools/bench_pipeline.py --compare baseline.json --tolerance 0.15
+"""
+
+import argparse
+import glob
+import json
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+from ai.frame_prep import decode_prepared  # noqa: E402
+from ai.pipeline import StageTimer, run_detectors  # noqa: E402
+from ai.scoring import SuspicionScorer  # noqa: E402
+from ai.session import DetectorSession  # noqa: E402
+
+STAGES = [
+    "decode", "motion_gate", "face_mesh", "face", "head_pose",
+    "hands", "eyes", "phone", "scoring", "total"
+]
+
+# Stages compared by --compare (p95); fps is compared separately
+GATED_STAGES = ["decode", "face_mesh", "hands", "phone", "scoring", "total"]
+
+
+def load_seeds(image_dir, size):
+    paths = sorted(glob.glob(os.path.join(image_dir, "*.jpg")))
+    frames = [cv2.imread(p) for p in paths]
+    frames = [cv2.resize(f, size) for f in frames if f is not None]
+    if not frames:
+        # Synthetic fallback: mid-grey frame with a face-sized blob
+        frame = np.full((size[1], size[0], 3), 128, np.uint8)
+        cv2.circle(frame, (size[0] // 2, size[1] // 2), size[1] // 5, (90, 120, 170), -1)
+        frames = [frame]
+    return frames
+
+
+def build_sequence(seeds, count, rng, static, quality):
+    """
+    Returns:
+        list of JPEG bytes (one student's camera feed)
+    """
+
+    params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+    sequence = []
+    for i in range(count):
+        frame = seeds[(i // 10) % len(seeds)]
+        if not static:
+            dx, dy = rng.integers(-6, 7, size=2)
+            shift = np.float32([[1, 0, dx], [0, 1, dy]])
+            frame = cv2.warpAffine(frame, shift, (frame.shape[1], frame.shape[0]),
+                                   borderMode=cv2.BORDER_REPLICATE)
+            noise = rng.normal(rng.uniform(-8, 8), 3, frame.shape)
+            frame = np.clip(frame + noise, 0, 255).astype(np.uint8)
+        sequence.append(cv2.imencode(".jpg", frame, params)[1].tobytes())
+    return sequence
+
+
+def replay_student(student_id, sequence, warmup):
+    """
+    Runs one student's frames in order, like analyze_frame() under the
+    session lock.
+
+    Returns:
+        list of {stage: ms} dicts (warmup frames excluded)
+    """
+
+    session = DetectorSession(student_id)
+    scorer = SuspicionScorer()
+    samples = []
+
+    for i, jpeg_bytes in enumerate(sequence):
+        timer = StageTimer()
+        started = time.perf_counter()
+
+        with timer.stage("decode"):
+            frame = decode_prepared(jpeg_bytes)
+
+        det = run_detectors(frame, session, timer)
+
+        with timer.stage("scoring"):
+            scorer.learn_baseline()
+            scorer.update_face_status(det["face_present"])
+            scorer.update_head_pose(det["head_direction"])
+            scorer.update_eye_behavior(det["eye_direction"], det["eyes_closed"])
+            scorer.update_hand_phone_head_combo(
+                det["hand_detected"], det["phone_detected"], det["head_direction"]
+            )
+            scorer.get_status()
+
+        timer.stages["total"] = (time.perf_counter() - started) * 1000
+        timer.stages["reused"] = det["reused"]
+        if i >= warmup:
+            samples.append(timer.stages)
+
+    return samples
+
+
+def summarize(samples, wall_s, replayed):
+    stages = {}
+    for stage in STAGES:
+        values = [s[stage] for s in samples if stage in s]
+        if not values:
+            continue
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        stages[stage] = {
+            "count": len(values),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3)
+        }
+
+    reused = sum(1 for s in samples if s.get("reused"))
+    return {
+        "frames": len(samples),
+        "reused_frames": reused,
+        "wall_s": round(wall_s, 3),
+        # Wall time covers warmup frames too, so throughput counts them
+        "fps": round(replayed / wall_s, 2) if wall_s > 0 else 0.0,
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "stages": stages
+    }
+
+
+def compare(result, baseline, tolerance):
+    """
+    Returns:
+        list of regression messages (empty = pass)
+    """
+
+    regressions = []
+    for stage in GATED_STAGES:
+        new = result["stages"].get(stage)
+        old = baseline["stages"].get(stage)
+        if not new or not old or old["p95_ms"] <= 0:
+            continue
+        if new["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{stage}: p95 {old['p95_ms']:.2f} -> {new['p95_ms']:.2f} ms"
+            )
+
+    if baseline.get("fps") and result["fps"] < baseline["fps"] * (1 - tolerance):
+        regressions.append(f"fps: {baseline['fps']:.1f} -> {result['fps']:.1f}")
+
+    return regressions
+
+
+def print_report(result, config):
+    print(
+        f"{config['students']} students x {config['frames']} frames, "
+        f"{config['threads']} threads, {'static' if config['static'] else 'jittered'}\n"
+    )
+    print(f"{'stage':<12} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for stage, row in result["stages"].items():
+        print(
+            f"{stage:<12} {row['count']:>6} {row['p50_ms']:>8.2f} "
+            f"{row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f}"
+        )
+    print(
+        f"\nframes {result['frames']} (reused {result['reused_frames']}), "
+        f"{result['fps']:.1f} fps, peak RSS {result['peak_rss_mb']:.1f} MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", default=os.path.join(APP_DIR, "evidence", "images"))
+    parser.add_argument("--students", type=int, default=4)
+    parser.add_argument("--frames", type=int, default=50, help="frames per student")
+    parser.add_argument("--warmup", type=int, default=3, help="per student, not measured")
+    parser.add_argument("--threads", type=int, default=0, help="0 = one per student")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--quality", type=int, default=80, help="JPEG quality of replayed frames")
+    parser.add_argument("--static", action="store_true", help="replay identical frames")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the result to this file")
+    parser.add_argument("--compare", help="baseline JSON from a previous --json run")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed relative slowdown before --compare fails")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    seeds = load_seeds(args.images, (args.width, args.height))
+    sequences = [
+        build_sequence(seeds, args.frames + args.warmup, rng, args.static, args.quality)
+        for _ in range(args.students)
+    ]
+    threads = args.threads or args.students
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [
+            executor.submit(replay_student, f"bench_{i}", sequence, args.warmup)
+            for i, sequence in enumerate(sequences)
+        ]
+        samples = [s for future in futures for s in future.result()]
+    wall_s = time.perf_counter() - started
+
+    config = {
+        "students": args.students,
+        "frames": args.frames,
+        "threads": threads,
+        "static": args.static,
+        "size": [args.width, args.height],
+        "seed_images": len(seeds)
+    }
+    result = summarize(samples, wall_s, sum(len(s) for s in sequences))
+    result["config"] = config
+    print_report(result, config)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance)
+        if regressions:
+            print(f"\nREGRESSION (tolerance {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regression against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
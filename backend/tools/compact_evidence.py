@@ -0,0 +1,52 @@
+"""
+Run one evidence retention pass now (the same job the server runs every
+PROCTOR_EVIDENCE_RETENTION_INTERVAL_S when PROCTOR_EVIDENCE_RETENTION_DAYS
+is set).
+
+Exams whose newest evidence is older than --days are bundled into
+evidence/archive/<exam>.zip and their loose images / clips are removed;
+the evidence routes keep serving them from the bundle.
+
+Usage (from backend/app, server stopped or running):
+    python ../tools/compact_evidence.py --days 30
+    python ../tools/compact_evidence.py --days 30 --quality 0   # no re-encode
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from flask import Flask
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+from ai.evidence_retention import EvidenceRetention  # noqa: E402
+from config import DATABASE_URI, EVIDENCE_ARCHIVE_JPEG_QUALITY  # noqa: E402
+from db import db, upgrade_schema  # noqa: E402
+import models  # noqa: E402,F401
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=float, required=True,
+                        help="archive exams with no evidence newer than this")
+    parser.add_argument("--quality", type=int, default=EVIDENCE_ARCHIVE_JPEG_QUALITY,
+                        help="JPEG quality for archived images (0 = keep as is)")
+    args = parser.parse_args()
+
+    # Same database as main.py (PROCTOR_DATABASE_URI, default instance/proctor.db)
+    app = Flask("main", instance_path=os.path.abspath(os.path.join(APP_DIR, "instance")))
+    app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URI
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+
+    retention = EvidenceRetention(days=args.days, quality=args.quality)
+    with app.app_context():
+        upgrade_schema()
+        print(json.dumps(retention.run_once(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
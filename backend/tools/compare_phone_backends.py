@@ -0,0 +1,121 @@
+"""
+Latency / agreement comparison of phone detector backends.
+
+The PyTorch backend is the reference; every other backend is scored by how
+many of its phone boxes match the reference (IoU >= 0.5) on the same frames.
+
+Usage (from backend/app):
+    python ../tools/compare_phone_backends.py \
+        --backend torch:yolov8n.pt:640 \
+        --backend onnx:yolov8n.onnx:640 \
+        --backend onnx:yolov8n_int8.onnx:416 \
+        --threads 4 --repeat 5
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+from ai.detector_backends import create_backend  # noqa: E402
+
+CONF_THRESHOLD = 0.5
+
+
+def iou(a, b):
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0, ix2 - ix1) * max(0, iy2 - iy1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def agreement(reference, candidate, threshold=0.5):
+    """
+    Returns:
+        (precision, recall) of candidate boxes against reference boxes
+    """
+
+    tp = fp = fn = 0
+    for ref_boxes, cand_boxes in zip(reference, candidate):
+        unmatched = [b for _, b in ref_boxes]
+        for _, box in cand_boxes:
+            match = next((r for r in unmatched if iou(r, box) >= threshold), None)
+            if match is None:
+                fp += 1
+            else:
+                tp += 1
+                unmatched.remove(match)
+        fn += len(unmatched)
+
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    return precision, recall
+
+
+def load_frames(image_dir):
+    paths = sorted(glob.glob(os.path.join(image_dir, "*.jpg")))
+    frames = [cv2.imread(p) for p in paths]
+    return [f for f in frames if f is not None]
+
+
+def benchmark(backend, frames, repeat, batch_size):
+    # Warmup (first call builds kernels / allocates arenas)
+    backend.detect(frames[:1], CONF_THRESHOLD)
+
+    latencies = []
+    outputs = None
+    for _ in range(repeat):
+        outputs = []
+        for i in range(0, len(frames), batch_size):
+            batch = frames[i:i + batch_size]
+            start = time.perf_counter()
+            outputs.extend(backend.detect(batch, CONF_THRESHOLD))
+            latencies.append((time.perf_counter() - start) * 1000 / len(batch))
+
+    return outputs, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", action="append", required=True,
+                        help="kind:model_path:input_size (first = reference)")
+    parser.add_argument("--images", default=os.path.join(APP_DIR, "evidence", "images"))
+    parser.add_argument("--threads", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=1)
+    args = parser.parse_args()
+
+    frames = load_frames(args.images)
+    if not frames:
+        sys.exit(f"No JPEG frames found in {args.images}")
+
+    print(f"{len(frames)} frames x {args.repeat} repeats, batch {args.batch_size}\n")
+    print(f"{'backend':<40} {'p50 ms':>8} {'p95 ms':>8} {'fps':>8} {'prec':>6} {'recall':>6}")
+
+    reference = None
+    for spec in args.backend:
+        kind, model_path, size = spec.split(":")
+        backend = create_backend(kind, model_path, int(size), threads=args.threads)
+
+        outputs, latencies = benchmark(backend, frames, args.repeat, args.batch_size)
+        if reference is None:
+            reference = outputs
+
+        precision, recall = agreement(reference, outputs)
+        p50, p95 = np.percentile(latencies, [50, 95])
+        print(
+            f"{spec:<40} {p50:>8.1f} {p95:>8.1f} {1000 / p50:>8.1f} "
+            f"{precision:>6.2f} {recall:>6.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
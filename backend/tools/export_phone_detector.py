@@ -0,0 +1,91 @@
+"""
+Export the phone detector to ONNX (optionally INT8) for the onnx backend.
+
+Usage (from backend/app):
+    python ../tools/export_phone_detector.py --imgsz 416
+    python ../tools/export_phone_detector.py --imgsz 416 --int8
+
+Then run the server with:
+    PROCTOR_PHONE_BACKEND=onnx PROCTOR_PHONE_MODEL=yolov8n.onnx \
+    PROCTOR_PHONE_INPUT_SIZE=416 python main.py
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+import cv2
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+sys.path.insert(0, APP_DIR)
+
+from ai.detector_backends import OnnxBackend  # noqa: E402
+
+DEFAULT_CALIBRATION = os.path.join(APP_DIR, "evidence", "images")
+
+
+def export_onnx(weights, imgsz):
+    from ultralytics import YOLO
+
+    # dynamic batch so the micro-batcher can send several frames at once
+    return YOLO(weights).export(
+        format="onnx", imgsz=imgsz, dynamic=True, simplify=True
+    )
+
+
+class _CalibrationReader:
+    """
+    Feeds letterboxed evidence frames to the static INT8 quantizer.
+    """
+
+    def __init__(self, onnx_path, image_dir, imgsz):
+        backend = OnnxBackend(onnx_path, imgsz)
+        self.input_name = backend.input_name
+
+        paths = sorted(glob.glob(os.path.join(image_dir, "*.jpg")))
+        frames = [cv2.imread(p) for p in paths]
+        self._blobs = iter([
+            {self.input_name: backend._letterbox(f)[0][None]}
+            for f in frames if f is not None
+        ])
+
+    def get_next(self):
+        return next(self._blobs, None)
+
+
+def quantize_int8(onnx_path, image_dir, imgsz):
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+
+    out_path = onnx_path.replace(".onnx", "_int8.onnx")
+    quantize_static(
+        onnx_path,
+        out_path,
+        _CalibrationReader(onnx_path, image_dir, imgsz),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+    )
+    return out_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--weights", default="yolov8n.pt")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--int8", action="store_true",
+                        help="also write a statically quantized INT8 model")
+    parser.add_argument("--calibration", default=DEFAULT_CALIBRATION,
+                        help="directory of JPEGs used for INT8 calibration")
+    args = parser.parse_args()
+
+    onnx_path = export_onnx(args.weights, args.imgsz)
+    print(f"ONNX model: {onnx_path}")
+
+    if args.int8:
+        print(f"INT8 model: {quantize_int8(onnx_path, args.calibration, args.imgsz)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+Load generator that simulates a full exam hall against /proctor.
+
+Every virtual student behaves like CameraBox.jsx: one 420x300 JPEG to
+/proctor/analyze every --interval seconds. Like setInterval + an async
+fetch, this is open loop: each frame is sent from a pool thread at its
+scheduled slot, whether or not the previous one has been answered, and
+latency is measured from that slot. A slow server therefore builds a
+backlog and shows it in the latency, instead of slowing the students down
+and hiding the wait (coordinated omission). Now and then the student also
+sends a /proctor/tab-event. Admin dashboards poll
+/proctor/dashboard-data. The tool reports sustained throughput, tail
+latency and error rate per step. With --ramp it also reports the first
+step where the node saturates.
+
+Targets:
+    in-process (default): the Flask app via its test client, no sockets,
+        on a temporary database / evidence directory
+    --url http://localhost:5000: a running server over HTTP
+
+Usage (from backend/app):
+    python ../tools/load_exam_hall.py --students 30 --duration 60
+    python ../tools/load_exam_hall.py --ramp 10,20,40,80 --duration 30 --slo-ms 1000
+    python ../tools/load_exam_hall.py --url http://localhost:5000 --ramp 20,40
+"""
+
+import argparse
+import atexit
+import base64
+import glob
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import cv2
+import numpy as np
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app")
+
+# CameraBox.jsx capture size / canvas.toBlob default quality
+FRAME_SIZE = (420, 300)
+JPEG_QUALITY = 92
+
+ENDPOINTS = ["analyze", "tab-event", "dashboard-data"]
+
+
+# ================= TARGETS =================
+class InProcessTarget:
+    """
+    Calls the app through Flask test clients (one per thread).
+
+    The app runs on a throwaway SQLite DB and evidence directory (removed
+    on exit) with retention off, so a load run never writes to
+    instance/proctor.db or evidence/.
+    """
+
+    def __init__(self):
+        self.data_dir = tempfile.mkdtemp(prefix="proctor_load_")
+        # Registered before the app's own hooks: runs after the background
+        # writers have flushed into it
+        atexit.register(shutil.rmtree, self.data_dir, True)
+
+        # Read by config.py, so set before the app is imported
+        os.environ.update({
+            "PROCTOR_DATABASE_URI": "sqlite:///" + os.path.join(self.data_dir, "proctor.db"),
+            "PROCTOR_EVIDENCE_DIR": os.path.join(self.data_dir, "evidence"),
+            "PROCTOR_SCORER_STORE_PATH": os.path.join(self.data_dir, "scorer_state.db"),
+            "PROCTOR_EVIDENCE_RETENTION_DAYS": "0",
+        })
+
+        sys.path.insert(0, APP_DIR)
+        from main import app
+
+        self.app = app
+        self._local = threading.local()
+
+    def request(self, method, path, body=None, content_type=None):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+
+        response = client.open(path, method=method, data=body, content_type=content_type)
+        return response.status_code
+
+
+class HttpTarget:
+    """
+    Calls a running server over HTTP (stdlib only).
+    """
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method, path, body=None, content_type=None):
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        if content_type:
+            req.add_header("Content-Type", content_type)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+        except (urllib.error.URLError, OSError):
+            return 0
+
+
+# ================= PAYLOADS =================
+def load_frames(image_dir, count, seed):
+    """
+    Returns:
+        list of JPEG bytes at the CameraBox size (synthetic if no seeds)
+    """
+
+    rng = np.random.default_rng(seed)
+    seeds = [cv2.imread(p) for p in sorted(glob.glob(os.path.join(image_dir, "*.jpg")))]
+    seeds = [cv2.resize(f, FRAME_SIZE) for f in seeds if f is not None]
+    if not seeds:
+        seeds = [np.full((FRAME_SIZE[1], FRAME_SIZE[0], 3), 128, np.uint8)]
+
+    params = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY]
+    frames = []
+    for i in range(count):
+        noise = rng.normal(0, 3, seeds[i % len(seeds)].shape)
+        frame = np.clip(seeds[i % len(seeds)] + noise, 0, 255).astype(np.uint8)
+        frames.append(cv2.imencode(".jpg", frame, params)[1].tobytes())
+    return frames
+
+
+def frame_request(student_id, jpeg_bytes, payload):
+    if payload == "json":
+        body = json.dumps({
+            "student_id": student_id,
+            "exam_id": "load_test",
+            "image": base64.b64encode(jpeg_bytes).decode()
+        }).encode()
+        return "/proctor/analyze", body, "application/json"
+
+    query = urllib.parse.urlencode({"student_id": student_id, "exam_id": "load_test"})
+    return f"/proctor/analyze?{query}", jpeg_bytes, "image/jpeg"
+
+
+# ================= RECORDING =================
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {name: [] for name in ENDPOINTS}
+        self.errors = {name: 0 for name in ENDPOINTS}
+        self.late = 0      # frames that left more than an interval after their slot
+
+    def record(self, endpoint, started, status):
+        elapsed = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.latencies[endpoint].append(elapsed)
+            if not 200 <= status < 300:
+                self.errors[endpoint] += 1
+
+    def mark_late(self):
+        with self._lock:
+            self.late += 1
+
+
+# ================= VIRTUAL CLIENTS =================
+def send(target, recorder, endpoint, slot, late_after, method, path, body=None, content_type=None):
+    # Latency counts from the scheduled slot: time spent waiting for a free
+    # sender is part of what the student sees
+    if late_after is not None and time.perf_counter() - slot > late_after:
+        recorder.mark_late()
+    recorder.record(endpoint, slot, target.request(method, path, body, content_type))
+
+
+def run_student(index, target, frames, args, recorder, stop, senders):
+    """
+    Schedules one student's requests; the senders pool sends them, so a
+    slow response never delays the next frame.
+    """
+
+    rng = random.Random(args.seed * 100003 + index)
+    student_id = f"load_{index}"
+    tab_count = 0
+    away_time = 0
+
+    # Spread students over the first interval, like real logins
+    next_slot = time.perf_counter() + rng.uniform(0, args.interval)
+
+    while not stop.is_set():
+        delay = next_slot - time.perf_counter()
+        if delay > 0 and stop.wait(delay):
+            break
+        slot = next_slot
+        next_slot += args.interval
+
+        path, body, content_type = frame_request(
+            student_id, frames[rng.randrange(len(frames))], args.payload
+        )
+        senders.submit(
+            send, target, recorder, "analyze", slot, args.interval,
+            "POST", path, body, content_type
+        )
+
+        if rng.random() < args.tab_rate:
+            tab_count += 1
+            away_time += rng.randint(1, 4)
+            body = json.dumps({
+                "student_id": student_id,
+                "event_type": rng.choice(["tab_switch", "fullscreen_exit"]),
+                "tab_switch_count": tab_count,
+                "total_away_time": away_time
+            }).encode()
+            senders.submit(
+                send, target, recorder, "tab-event", slot, None,
+                "POST", "/proctor/tab-event", body, "application/json"
+            )
+
+
+def run_admin(target, args, recorder, stop):
+    while not stop.wait(args.dashboard_interval):
+        started = time.perf_counter()
+        recorder.record("dashboard-data", started, target.request("GET", "/proctor/dashboard-data"))
+
+
+def run_step(students, target, frames, args):
+    recorder = Recorder()
+    stop = threading.Event()
+    # Shared senders, sized like a browser connection limit for each student
+    senders = ThreadPoolExecutor(max_workers=max(1, students * args.max_inflight))
+    threads = [
+        threading.Thread(
+            target=run_student, args=(i, target, frames, args, recorder, stop, senders)
+        )
+        for i in range(students)
+    ] + [
+        threading.Thread(target=run_admin, args=(target, args, recorder, stop))
+        for _ in range(args.admins)
+    ]
+
+    started = time.perf_counter()
+    for t in threads:
+        t.daemon = True
+        t.start()
+    stop.wait(args.duration)
+    stop.set()
+    for t in threads:
+        t.join(timeout=args.timeout)
+    # Requests already scheduled are still sent and measured
+    senders.shutdown(wait=True)
+    wall_s = time.perf_counter() - started
+
+    return summarize(students, recorder, wall_s, args)
+
+
+def summarize(students, recorder, wall_s, args):
+    endpoints = {}
+    for name in ENDPOINTS:
+        values = recorder.latencies[name]
+        if not values:
+            continue
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        endpoints[name] = {
+            "requests": len(values),
+            "rps": round(len(values) / wall_s, 2),
+            "error_rate": round(recorder.errors[name] / len(values), 4),
+            "p50_ms": round(float(p50), 1),
+            "p95_ms": round(float(p95), 1),
+            "p99_ms": round(float(p99), 1)
+        }
+
+    analyze = endpoints.get("analyze", {"rps": 0.0, "error_rate": 1.0, "p95_ms": float("inf")})
+    offered = students / args.interval
+    saturated = (
+        analyze["rps"] < offered * 0.9
+        or analyze["p95_ms"] > args.slo_ms
+        or analyze["error_rate"] > args.max_error_rate
+    )
+
+    return {
+        "students": students,
+        "offered_fps": round(offered, 2),
+        "wall_s": round(wall_s, 1),
+        "late_frames": recorder.late,
+        "saturated": saturated,
+        "endpoints": endpoints
+    }
+
+
+def print_step(step):
+    a = step["endpoints"].get("analyze", {})
+    print(
+        f"{step['students']:>8} {step['offered_fps']:>9.1f} {a.get('rps', 0):>9.1f} "
+        f"{a.get('p50_ms', 0):>8.0f} {a.get('p95_ms', 0):>8.0f} {a.get('p99_ms', 0):>8.0f} "
+        f"{a.get('error_rate', 0):>6.1%} {step['late_frames']:>6} "
+        f"{'SATURATED' if step['saturated'] else 'ok':>10}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="server base URL (default: in-process app)")
+    parser.add_argument("--students", type=int, default=20)
+    parser.add_argument("--ramp", help="comma-separated student counts, one step each")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per step")
+    parser.add_argument("--interval", type=float, default=3.0, help="seconds between frames")
+    parser.add_argument("--payload", choices=["jpeg", "json"], default="jpeg")
+    parser.add_argument("--tab-rate", type=float, default=0.02, help="tab events per frame")
+    parser.add_argument("--max-inflight", type=int, default=6,
+                        help="requests in flight per student (browser connection limit)")
+    parser.add_argument("--admins", type=int, default=1, help="dashboards polling")
+    parser.add_argument("--dashboard-interval", type=float, default=3.0)
+    parser.add_argument("--slo-ms", type=float, default=1000.0, help="analyze p95 target")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--images", default=os.path.join(APP_DIR, "evidence", "images"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the step results to this file")
+    args = parser.parse_args()
+
+    steps = [int(n) for n in args.ramp.split(",")] if args.ramp else [args.students]
+    frames = load_frames(args.images, 32, args.seed)
+    target = HttpTarget(args.url, args.timeout) if args.url else InProcessTarget()
+
+    print(
+        f"target {args.url or 'in-process'}, frame every {args.interval:g}s, "
+        f"{args.duration:g}s per step, SLO p95 {args.slo_ms:g} ms\n"
+    )
+    print(
+        f"{'students':>8} {'offered/s':>9} {'done/s':>9} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'errors':>6} {'late':>6} {'state':>10}"
+    )
+
+    results = []
+    for students in steps:
+        step = run_step(students, target, frames, args)
+        results.append(step)
+        print_step(step)
+
+    saturation = next((s["students"] for s in results if s["saturated"]), None)
+    healthy = [s["students"] for s in results if not s["saturated"]]
+    print()
+    if saturation is None:
+        print(f"No saturation up to {steps[-1]} students")
+    else:
+        print(
+            f"Saturated at {saturation} students "
+            f"(last healthy step: {max(healthy) if healthy else 'none'})"
+        )
+
+    for name in ENDPOINTS[1:]:
+        rows = [s["endpoints"][name] for s in results if name in s["endpoints"]]
+        if rows:
+            last = rows[-1]
+            print(
+                f"{name}: {last['requests']} requests, p95 {last['p95_ms']:.0f} ms, "
+                f"errors {last['error_rate']:.1%} (last step)"
+            )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"saturation_students": saturation, "steps": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
 import { useEffect, useRef, useState } from "react";
-import { sendFrame, resetScore } from "../services/api";
+import { sendFrameBinary, openFrameStream, resetScore } from "../services/api";
 
 export default function CameraBox() {
   const videoRef = useRef(null);
   const intervalRef = useRef(null);
   const streamRef = useRef(null);
+  const wsRef = useRef(null);
 
   const [status, setStatus] = useState("connecting");
   const [proctorData, setProctorData] = useState({
@@ -44,6 +45,11 @@ export default function CameraBox() {
     if (streamRef.current) {
       streamRef.current.getTracks().forEach((t) => t.stop());
     }
+
+    if (wsRef.current) {
+      wsRef.current.onclose = null;
+      wsRef.current.close();
+    }
   };
 
   const startProctoring = () => {
@@ -53,18 +59,37 @@ export default function CameraBox() {
     canvas.width = 420;
     canvas.height = 300;
 
-    const sendFrameToBackend = async () => {
+    // Prefer one persistent WebSocket; fall back to binary POST if it drops
+    // Busy responses (retry_after) keep the last result on screen
+    wsRef.current = openFrameStream(
+      studentIdRef.current,
+      (data) => !data.retry_after && setProctorData(data),
+      () => {
+        wsRef.current = null;
+      }
+    );
+
+    const sendFrameToBackend = () => {
       if (!videoRef.current || videoRef.current.readyState !== 4) return;
 
       ctx.drawImage(videoRef.current, 0, 0, canvas.width, canvas.height);
-      const image = canvas.toDataURL("image/jpeg").split(",")[1];
 
-      try {
-        const data = await sendFrame(image, studentIdRef.current);
-        setProctorData(data);
-      } catch (err) {
-        console.error("Proctoring error:", err);
-      }
+      canvas.toBlob(async (blob) => {
+        if (!blob) return;
+
+        const ws = wsRef.current;
+        if (ws && ws.readyState === WebSocket.OPEN) {
+          ws.send(blob);
+          return;
+        }
+
+        try {
+          const data = await sendFrameBinary(blob, studentIdRef.current);
+          if (!data.retry_after) setProctorData(data);
+        } catch (err) {
+          console.error("Proctoring error:", err);
+        }
+      }, "image/jpeg");
     };
 
     intervalRef.current = setInterval(sendFrameToBackend, 3000);
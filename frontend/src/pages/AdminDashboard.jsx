@@ -1,15 +1,37 @@
 import { useEffect, useState } from "react";
 import Navbar from "../components/Navbar";
-import { getDashboardData } from "../services/api";
+import { getDashboardData, openDashboardStream } from "../services/api";
 
 export default function AdminDashboard({ user, onLogout }) {
   const [students, setStudents] = useState([]);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
-    fetchDashboard();
-    const interval = setInterval(fetchDashboard, 3000); // auto refresh
-    return () => clearInterval(interval);
+    // Fallback: old browsers without EventSource keep polling
+    if (typeof EventSource === "undefined") {
+      fetchDashboard();
+      const interval = setInterval(fetchDashboard, 3000); // auto refresh
+      return () => clearInterval(interval);
+    }
+
+    // Push updates: snapshot once, then only changed students
+    const source = openDashboardStream(
+      ({ students }) => {
+        setStudents(students);
+        setLoading(false);
+      },
+      ({ students: changed }) => {
+        setStudents((prev) => {
+          const byId = new Map(prev.map((s) => [s.student_id, s]));
+          changed.forEach((s) => {
+            if (s.removed) byId.delete(s.student_id);
+            else byId.set(s.student_id, s);
+          });
+          return Array.from(byId.values());
+        });
+      }
+    );
+    return () => source.close();
   }, []);
 
   const fetchDashboard = async () => {
@@ -29,6 +29,123 @@ export async function sendFrame(image, studentId) {
   }
 }
 
+// Client landmark mode: MediaPipe ran in the browser, only the points are
+// sent. faces / hands: arrays of normalized [x0, y0, x1, y1, ...] per face
+// (478 points) / hand (21 points). The response has need_frame = true when
+// the next upload should be a full JPEG (sendFrameBinary).
+export async function sendLandmarks(studentId, { width, height, faces, hands }) {
+  try {
+    const res = await fetch(`${BASE_URL}/proctor/analyze`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        student_id: studentId,
+        landmarks: { width, height, faces, hands },
+      }),
+    });
+
+    if (!res.ok) {
+      throw new Error("Proctor analyze failed");
+    }
+
+    return await res.json();
+  } catch (err) {
+    console.error("sendLandmarks error:", err);
+    return {
+      status: "ERROR",
+      score: 0,
+      head_direction: "unknown",
+      phone_detected: false,
+      need_frame: true,
+    };
+  }
+}
+
+// Browser telemetry batch: events = [{ type, t: Date.now() at the event }].
+// type: tab_switch | fullscreen_exit | copy_paste | right_click | multiple_monitors
+export function telemetryBatch(events) {
+  return { sent_at: Date.now(), events };
+}
+
+export async function sendTelemetry(studentId, events) {
+  try {
+    const res = await fetch(`${BASE_URL}/proctor/telemetry`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ student_id: studentId, ...telemetryBatch(events) }),
+    });
+
+    if (!res.ok) {
+      throw new Error("Telemetry upload failed");
+    }
+
+    return await res.json();
+  } catch (err) {
+    console.error("sendTelemetry error:", err);
+    return null;
+  }
+}
+
+// Raw JPEG body: no base64 / JSON wrapping (~33% smaller).
+// Server overloaded: resolves to { error, retry_after } (503), not an error.
+// events: optional telemetry scored with this frame (no extra request).
+export async function sendFrameBinary(blob, studentId, events) {
+  try {
+    const headers = { "Content-Type": "image/jpeg" };
+    if (events && events.length) {
+      headers["X-Proctor-Telemetry"] = JSON.stringify(telemetryBatch(events));
+    }
+
+    const res = await fetch(
+      `${BASE_URL}/proctor/analyze?student_id=${encodeURIComponent(studentId)}`,
+      {
+        method: "POST",
+        headers,
+        body: blob,
+      }
+    );
+
+    if (res.status === 503) {
+      const busy = await res.json().catch(() => ({}));
+      if (busy.retry_after) return busy;
+    }
+
+    if (!res.ok) {
+      throw new Error("Proctor analyze failed");
+    }
+
+    return await res.json();
+  } catch (err) {
+    console.error("sendFrameBinary error:", err);
+    return {
+      status: "ERROR",
+      score: 0,
+      head_direction: "unknown",
+      phone_detected: false,
+    };
+  }
+}
+
+// Persistent WebSocket: send JPEG blobs, receive analyze results
+export function openFrameStream(studentId, onResult, onClose) {
+  const wsUrl = BASE_URL.replace(/^http/, "ws");
+  const ws = new WebSocket(
+    `${wsUrl}/proctor/stream?student_id=${encodeURIComponent(studentId)}`
+  );
+  ws.binaryType = "arraybuffer";
+
+  ws.onmessage = (event) => {
+    try {
+      onResult(JSON.parse(event.data));
+    } catch (err) {
+      console.error("frame stream parse error:", err);
+    }
+  };
+  ws.onclose = () => onClose && onClose();
+
+  return ws;
+}
+
 // ================= ADMIN DASHBOARD =================
 export async function getDashboardData() {
   try {
@@ -41,6 +158,18 @@ export async function getDashboardData() {
   }
 }
 
+// Server-Sent Events: full "snapshot" first, then "delta" (changed students only)
+export function openDashboardStream(onSnapshot, onDelta, examId) {
+  const query = examId ? `?exam_id=${encodeURIComponent(examId)}` : "";
+  const source = new EventSource(`${BASE_URL}/proctor/dashboard-stream${query}`);
+
+  source.addEventListener("snapshot", (e) => onSnapshot(JSON.parse(e.data)));
+  source.addEventListener("delta", (e) => onDelta(JSON.parse(e.data)));
+  source.onerror = (err) => console.error("dashboard stream error:", err);
+
+  return source;
+}
+
 // ================= EVIDENCE =================
 export async function getEvidenceList() {
   try {